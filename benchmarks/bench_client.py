@@ -0,0 +1,127 @@
+"""Offline client benchmarks against the fake Mode API served on localhost.
+
+Reports throughput and p50/p99 latency for sync vs async and pooled vs
+unpooled clients, and listing time and memory per 1k reports for validated
+vs lazy models.
+
+Run with: poetry run python benchmarks/bench_client.py [--requests N] [--latency S]
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tests"))
+
+from emulator import FakeModeServer  # noqa: E402
+
+from mode_client import AsyncModeClient, ModeClient  # noqa: E402
+
+
+def summarize(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    throughput = len(latencies) / elapsed
+    print(f"{name:<24}{throughput:>12.0f}{p50:>10.2f}{p99:>10.2f}")
+
+
+def timed(call):
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def bench_sync_pooled(base_url, report, requests):
+    with ModeClient("workspace", "t", "p", base_url=base_url) as client:
+        start = time.perf_counter()
+        latencies = [timed(lambda: client.report.get(report)) for _ in range(requests)]
+        summarize("sync pooled", latencies, time.perf_counter() - start)
+
+
+def bench_sync_unpooled(base_url, report, requests):
+    def call():
+        with ModeClient("workspace", "t", "p", base_url=base_url) as client:
+            client.report.get(report)
+
+    start = time.perf_counter()
+    latencies = [timed(call) for _ in range(requests)]
+    summarize("sync unpooled", latencies, time.perf_counter() - start)
+
+
+def bench_async_pooled(base_url, report, requests, concurrency):
+    async def worker(client, latencies, count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await client.report.get(report)
+            latencies.append(time.perf_counter() - start)
+
+    async def main():
+        latencies = []
+        async with AsyncModeClient(
+            "workspace", "t", "p", base_url=base_url, max_concurrency=concurrency
+        ) as client:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    worker(client, latencies, requests // concurrency)
+                    for _ in range(concurrency)
+                )
+            )
+            summarize(
+                f"async pooled (x{concurrency})",
+                latencies,
+                time.perf_counter() - start,
+            )
+
+    asyncio.run(main())
+
+
+def bench_listing(base_url, space, count):
+    print(f"\n{'listing ' + str(count) + ' reports':<24}{'seconds':>12}{'MiB/1k':>10}")
+    for validation in ("full", "lazy", "none"):
+        with ModeClient(
+            "workspace", "t", "p", base_url=base_url, validation=validation
+        ) as client:
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            reports = client.report.list(space)
+            elapsed = time.perf_counter() - start
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        assert len(reports) == count
+        del reports
+        per_1k = retained / 2**20 / (count / 1000)
+        print(f"{validation:<24}{elapsed:>12.3f}{per_1k:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--reports", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = FakeModeServer(latency=args.latency)
+    server.populate(spaces=1, reports_per_space=args.reports, runs_per_report=0)
+    space = next(iter(server.spaces))
+    report = next(iter(server.reports))
+
+    with server.serve() as base_url:
+        print(f"{'client':<24}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+        bench_sync_pooled(base_url, report, args.requests)
+        bench_sync_unpooled(base_url, report, args.requests)
+        bench_async_pooled(base_url, report, args.requests, args.concurrency)
+        bench_listing(base_url, space, args.reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Decode and parse time of a multi-MB /spaces/{space}/reports response.
+
+Compares the stdlib json path with orjson and msgspec (when installed),
+each followed by model parsing, and raw passthrough.
+
+Run with: poetry run python benchmarks/bench_decode.py [count]
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tests"))
+
+from payloads import embedded, report_payload  # noqa: E402
+
+from mode_client.clients import parse_response  # noqa: E402
+from mode_client.decoders import get_decoder  # noqa: E402
+from mode_client.models import Report, parse_models  # noqa: E402
+
+
+def best_of(call, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(count=5_000):
+    items = [report_payload(f"report{i}") for i in range(count)]
+    content = json.dumps(embedded("reports", items)).encode()
+    request = httpx.Request(
+        "GET", "https://app.mode.com/api/workspace/spaces/s/reports"
+    )
+    response = httpx.Response(200, content=content, request=request)
+
+    print(f"{count} reports, {len(content) / 2**20:.1f} MiB\n")
+    print(f"{'decoder':<10}{'decode s':>10}{'+ full s':>10}{'+ lazy s':>10}")
+
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            decode = get_decoder(name)
+        except ImportError:
+            print(f"{name:<10}{'not installed':>30}")
+            continue
+
+        def decoded():
+            return parse_response(response, decode)["_embedded"]["reports"]
+
+        decode_time = best_of(decoded)
+        full_time = best_of(lambda: parse_models(Report, decoded(), "full"), 3)
+        lazy_time = best_of(lambda: parse_models(Report, decoded(), "lazy"), 3)
+        print(f"{name:<10}{decode_time:>10.3f}{full_time:>10.3f}{lazy_time:>10.3f}")
+
+    raw_time = best_of(lambda: response.content)
+    print(f"{'raw':<10}{raw_time:>10.6f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
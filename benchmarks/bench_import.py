@@ -0,0 +1,50 @@
+"""Import time of mode_client in fresh interpreters.
+
+Reports the median wall time of each statement over a number of runs, minus
+the cost of starting an empty interpreter, and the modules it pulled in.
+
+Run with: poetry run python benchmarks/bench_import.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "import mode_client",
+    "from mode_client import ModeClient",
+    "from mode_client import AsyncModeClient",
+    "import httpx",
+    "import pydantic",
+]
+
+
+def run(statement, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def loaded_modules(statement):
+    code = f"import sys; before = len(sys.modules); {statement}; "
+    code += "print(len(sys.modules) - before)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return int(output.stdout)
+
+
+def main(runs=20):
+    baseline = run("pass", runs)
+    print(f"interpreter startup: {baseline * 1000:.1f} ms (median of {runs})\n")
+    print(f"{'statement':<42}{'ms':>8}{'modules':>9}")
+    for statement in STATEMENTS:
+        elapsed = (run(statement, runs) - baseline) * 1000
+        print(f"{statement:<42}{elapsed:>8.1f}{loaded_modules(statement):>9}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
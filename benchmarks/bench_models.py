@@ -0,0 +1,48 @@
+"""Parse time and retained memory of 10k reports per validation mode.
+
+Each mode is measured on whole models and on a projection of four fields.
+
+Run with: poetry run python benchmarks/bench_models.py [count]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tests"))
+
+from payloads import report_payload  # noqa: E402
+
+from mode_client.models import Report, parse_models  # noqa: E402
+
+FIELDS = ("token", "name", "archived", "updated_at")
+
+
+def measure(validation, items, fields=None):
+    parse_models(Report, items[:1], validation, fields)  # build the model class
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    reports = parse_models(Report, items, validation, fields)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(reports), elapsed, retained
+
+
+def main(count=10_000):
+    items = [report_payload(f"report{i}") for i in range(count)]
+
+    print(f"{'validation':<12}{'fields':<10}{'seconds':>10}{'MiB':>10}")
+    for validation in ("full", "lazy", "none"):
+        for label, fields in (("all", None), ("4", FIELDS)):
+            _, elapsed, retained = measure(validation, items, fields)
+            print(
+                f"{validation:<12}{label:<10}{elapsed:>10.3f}{retained / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
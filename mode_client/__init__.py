@@ -1 +1,30 @@
-from .clients import ModeClient  # noqa: F401
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .async_clients import AsyncModeClient
+    from .clients import ModeClient
+
+__all__ = ["AsyncModeClient", "ModeClient"]
+
+# The clients pull in httpx and the pydantic model graph, so they are only
+# imported on first access to keep `import mode_client` cheap.
+LAZY_ATTRIBUTES = {
+    "AsyncModeClient": "mode_client.async_clients",
+    "ModeClient": "mode_client.clients",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
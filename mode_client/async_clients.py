@@ -0,0 +1,1127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from functools import cached_property, partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import httpx
+from pydantic import BaseModel
+
+from mode_client.bulk import DEFAULT_BULK_WORKERS, BulkResult, arun_bulk
+from mode_client.cache import ResponseCache
+from mode_client.clients import (
+    DEFAULT_BASE_URL,
+    DEFAULT_LIMITS,
+    DEFAULT_PER_PAGE,
+    LINK_TARGETS,
+    cache_key,
+    clean_params,
+    has_next_page,
+    is_not_found,
+    link_resource,
+    links_by_href,
+    parent_paths,
+    parse_response,
+    update_index,
+)
+from mode_client.decoders import Decoder, DecoderName, get_decoder
+from mode_client.dedup import FAILED_STATES, RunDedup, created_at, parameter_hash
+from mode_client.hooks import Hooks, RequestInfo, emit
+from mode_client.identity import IdentityMap
+from mode_client.matrix import MatrixRun, ParamGrid, RunMatrix, param_combinations
+from mode_client.models import (
+    Account,
+    Link,
+    ModelT,
+    Pagination,
+    Query,
+    QueryRun,
+    Report,
+    ReportRun,
+    ReportRuns,
+    Space,
+    Validation,
+    parse_model,
+    parse_models,
+)
+from mode_client.resilience import CircuitBreaker, HedgePolicy, Timeouts
+from mode_client.resources import resource_template
+from mode_client.retry import RetryPolicy, TokenBucket
+from mode_client.singleflight import AsyncSingleFlight
+from mode_client.waiters import TERMINAL_STATES, PollSchedule
+
+if TYPE_CHECKING:
+    from mode_client.search import QueryIndex
+    from mode_client.tables import QueryRunTable, ReportTable
+
+AsyncModeClientT = TypeVar("AsyncModeClientT", bound="AsyncModeBaseClient")
+
+
+class ConcurrencyLimiter:
+    """Bounds the number of in-flight requests shared by all async sub-clients.
+
+    The semaphore is created lazily so that it binds to the running event loop
+    rather than whichever loop was current when the client was constructed.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+
+async def limit_items(
+    items: AsyncGenerator[Dict[str, Any], None],
+    max_items: Optional[int] = None,
+    since: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    try:
+        if max_items is not None and max_items <= 0:
+            return
+
+        count = 0
+        async for item in items:
+            if since is not None and item["updated_at"] < since:
+                return
+
+            yield item
+
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+    finally:
+        await items.aclose()
+
+
+async def list_query_runs(
+    client: AsyncModeBaseClient,
+    report: str,
+    run: str,
+    fields: Optional[Sequence[str]] = None,
+) -> List[QueryRun]:
+    response = await client.request("GET", f"/reports/{report}/runs/{run}/query_runs")
+
+    return client.parse_list(QueryRun, response["_embedded"]["query_runs"], fields)
+
+
+class AsyncModeBaseClient:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        workspace: str,
+        limiter: ConcurrencyLimiter,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        validation: Validation = "full",
+        hooks: Sequence[Hooks] = (),
+        singleflight: Optional[AsyncSingleFlight[httpx.Response]] = None,
+        identity_map: Optional[IdentityMap] = None,
+        decode: Decoder = json.loads,
+        run_dedup: Optional[RunDedup] = None,
+        hedging: Optional[HedgePolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[Timeouts] = None,
+    ):
+        self.client = client
+        self.prefix = f"/{workspace}" if workspace else ""
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy(max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.validation = validation
+        self.hooks = hooks
+        self.singleflight = singleflight
+        self.identity_map = identity_map
+        self.decode = decode
+        self.run_dedup = run_dedup
+        self.hedging = hedging
+        self.breaker = breaker
+        self.timeouts = timeouts or {}
+
+    def parse(
+        self,
+        model: Type[ModelT],
+        data: Dict[str, Any],
+        fields: Optional[Sequence[str]] = None,
+    ) -> ModelT:
+        """Parses data into model, or only the given fields of it.
+
+        Projections are partial views, so they bypass the identity map.
+        """
+        start = time.perf_counter()
+        parsed = parse_model(model, data, self.validation, fields)
+        if self.hooks:
+            emit(self.hooks, "parse", model, 1, time.perf_counter() - start)
+        if self.identity_map is not None and fields is None:
+            parsed = self.identity_map.resolve(model, parsed)
+
+        return parsed
+
+    def parse_list(
+        self,
+        model: Type[ModelT],
+        items: List[Dict[str, Any]],
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ModelT]:
+        start = time.perf_counter()
+        parsed = parse_models(model, items, self.validation, fields)
+        if self.hooks:
+            emit(self.hooks, "parse", model, len(items), time.perf_counter() - start)
+        if self.identity_map is not None and fields is None:
+            parsed = [self.identity_map.resolve(model, item) for item in parsed]
+
+        return parsed
+
+    async def send(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Sends a request, sharing one response between concurrent identical GETs."""
+        if method != "GET" or self.singleflight is None:
+            return await self.observe(method, resource, json, params)
+
+        key = cache_key(f"{self.prefix}{resource}", params)
+
+        return await self.singleflight.do(
+            key, lambda: self.observe(method, resource, None, params)
+        )
+
+    async def observe(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        info = RequestInfo(method, resource)
+        emit(self.hooks, "request_start", info)
+        try:
+            response = await self.send_cached(info, json, params)
+            info.status_code = response.status_code
+            info.size = len(response.content)
+        except Exception as e:
+            info.error = e
+            raise
+        finally:
+            info.elapsed = time.perf_counter() - info.started_at
+            emit(self.hooks, "request_end", info)
+
+        return response
+
+    async def send_cached(
+        self,
+        info: RequestInfo,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        method, resource = info.method, info.resource
+        if self.cache is None:
+            return await self.dispatch(
+                method, resource, json=json, params=params, info=info
+            )
+
+        url = f"{self.prefix}{resource}"
+        if method != "GET":
+            for path in parent_paths(url):
+                self.cache.invalidate(path)
+            return await self.dispatch(
+                method, resource, json=json, params=params, info=info
+            )
+
+        key = cache_key(url, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            info.cached = True
+            emit(self.hooks, "cache_hit", info)
+            return self.cache.hit(entry, self.client.build_request(method, url))
+
+        headers = self.cache.validators(entry)
+        response = await self.dispatch(
+            method, resource, params=params, headers=headers, info=info
+        )
+
+        return self.cache.store(key, resource, response, entry)
+
+    async def dispatch(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        info: Optional[RequestInfo] = None,
+    ) -> httpx.Response:
+        attempt = 0
+        template = info.template if info is not None else resource_template(resource)
+        timeout = self.timeouts.get(template, httpx.USE_CLIENT_DEFAULT)
+
+        async def send() -> httpx.Response:
+            async with self.limiter.semaphore:
+                return await self.client.request(
+                    method=method,
+                    url=f"{self.prefix}{resource}",
+                    json=json,
+                    params=clean_params(params),
+                    headers=headers,
+                    timeout=timeout,
+                )
+
+        while True:
+            if self.breaker is not None:
+                self.breaker.check(template)
+
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+
+            if info is not None:
+                info.attempts = attempt + 1
+
+            try:
+                if self.hedging is not None and method == "GET":
+                    response = await self.hedging.asend(template, send)
+                else:
+                    response = await send()
+            except httpx.TransportError as e:
+                if self.breaker is not None:
+                    self.breaker.record(template, False)
+                if not self.retry.should_retry_error(method, e, attempt):
+                    raise
+                reason = type(e).__name__
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.breaker is not None:
+                    self.breaker.record_response(template, response)
+                if not self.retry.should_retry(method, response, attempt):
+                    if self.rate_limiter is not None and response.status_code != 429:
+                        self.rate_limiter.reward()
+                    return response
+                reason = str(response.status_code)
+                delay = self.retry.delay(response, attempt)
+                if self.rate_limiter is not None and response.status_code == 429:
+                    self.rate_limiter.penalize(self.retry.retry_after(response))
+
+            self.retry.record(reason)
+            if info is not None:
+                emit(self.hooks, "retry", info, reason, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def request(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+    ) -> Any:
+        """Sends a request and decodes its JSON body, or returns the bytes if raw."""
+        response = await self.send(method, resource, json=json, params=params)
+        if raw:
+            response.raise_for_status()
+            return response.content
+
+        return parse_response(response, self.decode)
+
+    async def paginate(
+        self,
+        resource: str,
+        name: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        query = {**(params or {}), "per_page": per_page}
+
+        async def fetch(page: int) -> Any:
+            return await self.request("GET", resource, params={**query, "page": page})
+
+        task: Optional[asyncio.Task[Any]] = None
+        try:
+            page = 1
+            response = await fetch(page)
+            previous = None
+
+            while True:
+                items = response["_embedded"][name]
+                if not items or items[0] == previous:
+                    return
+
+                more = has_next_page(response, items, page, per_page)
+                if more and prefetch:
+                    task = asyncio.ensure_future(fetch(page + 1))
+
+                for item in items:
+                    yield item
+
+                if not more:
+                    return
+
+                previous = items[0]
+                page += 1
+                response = await task if task is not None else await fetch(page)
+                task = None
+        finally:
+            if task is not None:
+                task.cancel()
+
+
+class AsyncModeLinkClient(AsyncModeBaseClient):
+    def __init__(self, client: httpx.AsyncClient, _: str, *args: Any, **kwargs: Any):
+        super().__init__(client, "", *args, **kwargs)
+
+    @overload
+    async def follow(self, link: Union[Link, str], model: Type[ModelT]) -> ModelT:
+        ...
+
+    @overload
+    async def follow(self, link: Union[Link, str]) -> Any:
+        ...
+
+    async def follow(
+        self, link: Union[Link, str], model: Optional[Type[BaseModel]] = None
+    ) -> Any:
+        resource = link_resource(self.client.base_url, link)
+        target = LINK_TARGETS.get(resource_template(resource))
+        if target is not None and target[1] is not None:
+            if model is not None:
+                raise TypeError(f"{resource} is a collection; use follow_all")
+            return await self.follow_all(link)
+        if target is None and model is None:
+            return await self.request("GET", resource)
+
+        model = model or target[0]  # type: ignore[index]
+        return self.parse(model, await self.request("GET", resource))
+
+    @overload
+    async def follow_all(
+        self, link: Union[Link, str], model: Type[ModelT]
+    ) -> List[ModelT]:
+        ...
+
+    @overload
+    async def follow_all(self, link: Union[Link, str]) -> List[Any]:
+        ...
+
+    async def follow_all(
+        self, link: Union[Link, str], model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
+        resource = link_resource(self.client.base_url, link)
+        target = LINK_TARGETS.get(resource_template(resource))
+        if target is None or target[1] is None:
+            raise TypeError(f"{resource} is not a known collection")
+
+        items = [item async for item in self.paginate(resource, target[1])]
+        return self.parse_list(model or target[0], items)
+
+    async def resolve(
+        self,
+        items: Iterable[BaseModel],
+        name: str,
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+    ) -> Dict[str, Any]:
+        items = list(items)
+        tokens = links_by_href(items, name)
+        resolved: Dict[str, Any] = {getattr(item, "token"): None for item in items}
+        async for result in arun_bulk(self.follow, tokens, max_concurrency):
+            if result.error is not None and not is_not_found(result.error):
+                raise result.error
+            for token in tokens[result.operation]:
+                resolved[token] = result.value
+
+        return resolved
+
+
+class AsyncModeAccountClient(AsyncModeBaseClient):
+    def __init__(self, client: httpx.AsyncClient, _: str, *args: Any, **kwargs: Any):
+        super().__init__(client, "", *args, **kwargs)
+
+    async def get(self, account: str) -> Account:
+        response = await self.request("GET", f"/{account}")
+
+        return self.parse(Account, response)
+
+
+class AsyncModeQueryClient(AsyncModeBaseClient):
+    async def get(
+        self, report: str, query: str, fields: Optional[Sequence[str]] = None
+    ) -> Query:
+        response = await self.request("GET", f"/reports/{report}/queries/{query}")
+
+        return self.parse(Query, response, fields)
+
+    async def list(
+        self, report: str, fields: Optional[Sequence[str]] = None
+    ) -> List[Query]:
+        response = await self.request("GET", f"/reports/{report}/queries")
+
+        return self.parse_list(Query, response["_embedded"]["queries"], fields)
+
+    async def index(
+        self,
+        reports: Iterable[str],
+        index: Optional[QueryIndex] = None,
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+    ) -> QueryIndex:
+        from mode_client.search import QueryIndex
+
+        index = index if index is not None else QueryIndex()
+        async for result in arun_bulk(self.list, reports, max_concurrency):
+            update_index(index, result)
+
+        return index
+
+    async def iter_queries(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Query]:
+        items = self.paginate(
+            f"/reports/{report}/queries", "queries", None, per_page, prefetch
+        )
+        async for item in limit_items(items, max_items):
+            yield self.parse(Query, item, fields)
+
+    async def create(
+        self, report: str, raw_query: str, data_source_id: int, name: str
+    ) -> None:
+        json = {
+            "query": {
+                "raw_query": raw_query,
+                "data_source_id": data_source_id,
+                "name": name,
+            }
+        }
+        await self.request("POST", f"/reports/{report}/queries", json=json)
+
+    async def update(
+        self,
+        report: str,
+        query: str,
+        raw_query: Optional[str] = None,
+        data_source_id: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> Query:
+        raw_json = {
+            "raw_query": raw_query,
+            "data_source_id": data_source_id,
+            "name": name,
+        }
+        json = {k: v for k, v in raw_json.items() if v is not None}
+
+        response = await self.request(
+            "PATCH", f"/reports/{report}/queries/{query}", json={"query": json}
+        )
+
+        return self.parse(Query, response)
+
+    async def delete(self, report: str, query: str) -> None:
+        await self.request("DELETE", f"/reports/{report}/queries/{query}")
+
+    def bulk_update(
+        self,
+        updates: Iterable[Tuple[str, str, str]],
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> AsyncIterator[BulkResult[Tuple[str, str, str], Query]]:
+        """Rewrites the SQL of (report, query, raw_query) triples concurrently."""
+        return arun_bulk(
+            lambda update: self.update(*update),
+            updates,
+            max_concurrency,
+            dry_run,
+            max_error_rate,
+        )
+
+
+class AsyncModeQueryRunClient(AsyncModeBaseClient):
+    async def get(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> QueryRun:
+        response = await self.request(
+            "GET", f"/reports/{report}/runs/{run}/query_runs/{query_run}"
+        )
+
+        return self.parse(QueryRun, response, fields)
+
+    async def list(
+        self, report: str, run: str, fields: Optional[Sequence[str]] = None
+    ) -> List[QueryRun]:
+        return await list_query_runs(self, report, run, fields)
+
+    async def iter_query_runs(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[QueryRun]:
+        items = self.paginate(
+            f"/reports/{report}/runs/{run}/query_runs",
+            "query_runs",
+            None,
+            per_page,
+            prefetch,
+        )
+        async for item in limit_items(items, max_items):
+            yield self.parse(QueryRun, item, fields)
+
+    async def table(
+        self,
+        report: str,
+        run: str,
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+    ) -> QueryRunTable:
+        items = self.paginate(
+            f"/reports/{report}/runs/{run}/query_runs", "query_runs", None, per_page
+        )
+        from mode_client.tables import QueryRunTable
+
+        table = QueryRunTable(fields)
+        async for item in limit_items(items, max_items):
+            table.append(item)
+
+        return table
+
+
+class AsyncModeReportClient(AsyncModeBaseClient):
+    async def get(self, report: str, fields: Optional[Sequence[str]] = None) -> Report:
+        response = await self.request("GET", f"/reports/{report}")
+
+        return self.parse(Report, response, fields)
+
+    async def list(
+        self, space: str, fields: Optional[Sequence[str]] = None
+    ) -> List[Report]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        response = await self.request("GET", f"/spaces/{space}/reports", params=params)
+
+        return self.parse_list(Report, response["_embedded"]["reports"], fields)
+
+    async def iter_reports(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Report]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/spaces/{space}/reports", "reports", params, per_page, prefetch
+        )
+        async for item in limit_items(items, max_items, since):
+            yield self.parse(Report, item, fields)
+
+    async def table(
+        self,
+        space: str,
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+    ) -> ReportTable:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/spaces/{space}/reports", "reports", params, per_page, prefetch
+        )
+        from mode_client.tables import ReportTable
+
+        table = ReportTable(fields)
+        async for item in limit_items(items, max_items, since):
+            table.append(item)
+
+        return table
+
+    async def update(
+        self,
+        report: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        space_token: Optional[str] = None,
+    ) -> Report:
+        raw_json = {
+            "name": name,
+            "description": description,
+            "space_token": space_token,
+        }
+        json = {k: v for k, v in raw_json.items() if v is not None}
+        response = await self.request(
+            "PATCH", f"/reports/{report}", json={"report": json}
+        )
+
+        return self.parse(Report, response)
+
+    async def delete(self, report: str) -> None:
+        await self.request("DELETE", f"/reports/{report}")
+
+    async def archive(self, report: str) -> Report:
+        response = await self.request("PATCH", f"/reports/{report}/archive")
+        return self.parse(Report, response)
+
+    async def unarchive(self, report: str) -> Report:
+        response = await self.request("PATCH", f"/reports/{report}/unarchive")
+
+        return self.parse(Report, response)
+
+    async def sync(self, report: str, commit_message: Optional[str] = None) -> Report:
+        json = {"commit_message": commit_message}
+        response = await self.request(
+            "PATCH", f"/reports/{report}/sync_to_github", json=json
+        )
+
+        return self.parse(Report, response)
+
+    def bulk_archive(
+        self,
+        reports: Iterable[str],
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> AsyncIterator[BulkResult[str, Report]]:
+        return arun_bulk(
+            self.archive, reports, max_concurrency, dry_run, max_error_rate
+        )
+
+    def bulk_move(
+        self,
+        moves: Iterable[Tuple[str, str]],
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> AsyncIterator[BulkResult[Tuple[str, str], Report]]:
+        """Moves (report, space_token) pairs concurrently."""
+        return arun_bulk(
+            lambda move: self.update(move[0], space_token=move[1]),
+            moves,
+            max_concurrency,
+            dry_run,
+            max_error_rate,
+        )
+
+
+class AsyncModeReportRunClient(AsyncModeBaseClient):
+    async def get(
+        self, report: str, run: str, fields: Optional[Sequence[str]] = None
+    ) -> ReportRun:
+        response = await self.request("GET", f"/reports/{report}/runs/{run}")
+
+        return self.parse(ReportRun, response, fields)
+
+    async def list(
+        self, report: str, fields: Optional[Sequence[str]] = None
+    ) -> ReportRuns:
+        params = {"order": "desc", "order_by": "updated_at"}
+        raw_response = await self.request(
+            "GET", f"/reports/{report}/runs", params=params
+        )
+        runs = raw_response["_embedded"]["report_runs"]
+
+        return ReportRuns.construct(
+            pagination=Pagination.parse_obj(raw_response["pagination"]),
+            report_runs=self.parse_list(ReportRun, runs, fields),
+        )
+
+    async def iter_runs(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[ReportRun]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/reports/{report}/runs", "report_runs", params, per_page, prefetch
+        )
+        async for item in limit_items(items, max_items, since):
+            yield self.parse(ReportRun, item, fields)
+
+    async def wait(
+        self,
+        report: str,
+        run: str,
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> ReportRun:
+        results = await self.wait_many(
+            [(report, run)], timeout, expected_runtime, None, min_interval, max_interval
+        )
+        result = results[run]
+        if result.state not in TERMINAL_STATES:
+            raise TimeoutError(f"Report run {run} did not finish within {timeout}s")
+
+        return result
+
+    async def wait_many(
+        self,
+        runs: Iterable[Tuple[str, str]],
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        callback: Optional[Callable[[str, ReportRun], Any]] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> Dict[str, ReportRun]:
+        schedule = PollSchedule(min_interval, max_interval, timeout=timeout)
+        runtimes: Dict[str, float] = {}
+        for report, run in runs:
+            if expected_runtime is not None:
+                runtimes[report] = expected_runtime
+            elif report not in runtimes:
+                response = await self.request("GET", f"/reports/{report}")
+                runtimes[report] = float(response["expected_runtime"])
+            schedule.add(report, run, runtimes[report])
+
+        results: Dict[str, ReportRun] = {}
+        while schedule:
+            await asyncio.sleep(schedule.delay())
+            expired = schedule.expired()
+            due = schedule.due()
+            polled = await asyncio.gather(*(self.get(r, run) for r, run in due))
+            for (report, run), result in zip(due, polled):
+                results[run] = result
+                if result.state in TERMINAL_STATES:
+                    if callback is not None:
+                        outcome = callback(report, result)
+                        if asyncio.iscoroutine(outcome):
+                            await outcome
+                elif not expired:
+                    schedule.reschedule(report, run)
+
+        return results
+
+    async def clone(self, report: str, run: str) -> ReportRun:
+        response = await self.request("POST", f"/reports/{report}/runs/{run}/clone")
+        return self.parse(ReportRun, response)
+
+    async def create(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
+        dedup = self.run_dedup
+        if dedup is None:
+            return await self.submit(report, parameters)
+
+        key = dedup.key(report, parameters)
+
+        return await dedup.async_flight.do(
+            key, partial(self.create_once, dedup, key, report, parameters)
+        )
+
+    async def submit(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
+        response = await self.request(
+            "POST", f"/reports/{report}/runs", json={"parameters": parameters}
+        )
+        return self.parse(ReportRun, response)
+
+    async def create_once(
+        self, dedup: RunDedup, key: str, report: str, parameters: Dict[str, Any]
+    ) -> ReportRun:
+        created = None
+        run = dedup.get(key)
+        if run is not None and run.state not in TERMINAL_STATES:
+            run = await self.get(report, run.token)
+        if (run is None or run.state in FAILED_STATES) and dedup.scan:
+            run = await self.find_run(dedup, report, parameters)
+            created = created_at(run) if run is not None else None
+        if run is None or run.state in FAILED_STATES:
+            run = await self.submit(report, parameters)
+        else:
+            dedup.reused += 1
+        dedup.put(key, run, created)
+
+        return run
+
+    async def find_run(
+        self, dedup: RunDedup, report: str, parameters: Dict[str, Any]
+    ) -> Optional[ReportRun]:
+        expected = parameter_hash(parameters)
+        runs = self.iter_runs(report, max_items=dedup.scan, since=dedup.cutoff())
+        async for run in runs:
+            if run.state in FAILED_STATES or not dedup.is_fresh(created_at(run)):
+                continue
+            query_runs = await list_query_runs(self, report, run.token)
+            if query_runs and parameter_hash(query_runs[0].parameters) == expected:
+                return run
+
+        return None
+
+    async def run_matrix(
+        self,
+        report: str,
+        param_grid: ParamGrid,
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        timeout: Optional[float] = None,
+        collect: bool = True,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> RunMatrix:
+        matrix = RunMatrix(
+            report, [MatrixRun(p) for p in param_combinations(param_grid)]
+        )
+
+        start = time.perf_counter()
+        created = arun_bulk(
+            lambda entry: self.create(report, entry.parameters),
+            matrix.runs,
+            max_concurrency,
+        )
+        async for result in created:
+            entry = result.operation
+            entry.run, entry.error = result.value, result.error
+            entry.submitted_at = time.perf_counter()
+        matrix.submit_time = time.perf_counter() - start
+
+        pending = {entry.run.token: entry for entry in matrix.runs if entry.run}
+
+        def finished(_: str, run: ReportRun) -> None:
+            pending[run.token].finished_at = time.perf_counter()
+
+        start = time.perf_counter()
+        runs = await self.wait_many(
+            [(report, token) for token in pending],
+            timeout,
+            None,
+            finished,
+            min_interval,
+            max_interval,
+        )
+        for token, run in runs.items():
+            pending[token].run = run
+        matrix.wait_time = time.perf_counter() - start
+
+        if collect:
+            start = time.perf_counter()
+            succeeded = [token for token, entry in pending.items() if entry.succeeded]
+            collected = arun_bulk(
+                lambda token: list_query_runs(self, report, token),
+                succeeded,
+                max_concurrency,
+            )
+            async for fetched in collected:
+                entry = pending[fetched.operation]
+                entry.query_runs = fetched.value or []
+                entry.error = fetched.error
+            matrix.collect_time = time.perf_counter() - start
+
+        return matrix
+
+
+class AsyncModeSpaceClient(AsyncModeBaseClient):
+    async def get(self, space: str, fields: Optional[Sequence[str]] = None) -> Space:
+        response = await self.request("GET", f"/spaces/{space}")
+        return self.parse(Space, response, fields)
+
+    async def list(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Space]:
+        params = {"filter": filter_}
+        response = await self.request("GET", "/spaces", params=params)
+        spaces = response["_embedded"]["spaces"]
+
+        return self.parse_list(Space, spaces, fields)
+
+    async def iter_spaces(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Space]:
+        params = {"filter": filter_}
+        items = self.paginate("/spaces", "spaces", params, per_page, prefetch)
+        async for item in limit_items(items, max_items):
+            yield self.parse(Space, item, fields)
+
+    async def create(self, name: str, description: str) -> Space:
+        json = {"space": {"name": name, "description": description}}
+        response = await self.request("POST", "/spaces", json=json)
+
+        return self.parse(Space, response)
+
+    async def update(
+        self, space: str, name: Optional[str] = None, description: Optional[str] = None
+    ) -> Space:
+        raw_json = {"name": name, "description": description}
+        json = {k: v for k, v in raw_json.items() if v is not None}
+        response = await self.request("POST", f"/spaces/{space}", json={"space": json})
+
+        return self.parse(Space, response)
+
+    async def delete(self, space: str) -> None:
+        await self.request("DELETE", f"/spaces/{space}")
+
+    def bulk_delete(
+        self,
+        spaces: Iterable[str],
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> AsyncIterator[BulkResult[str, None]]:
+        return arun_bulk(self.delete, spaces, max_concurrency, dry_run, max_error_rate)
+
+
+class AsyncModeClient:
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        timeout: float = 10.0,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_concurrency: int = 10,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        validation: Validation = "full",
+        base_url: str = DEFAULT_BASE_URL,
+        hooks: Sequence[Hooks] = (),
+        coalesce: bool = True,
+        identity_map: Optional[IdentityMap] = None,
+        decoder: Union[DecoderName, Decoder] = "auto",
+        run_dedup: Optional[RunDedup] = None,
+        hedging: Optional[HedgePolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[Timeouts] = None,
+    ):
+        self.workspace = workspace
+        self.token = token
+        self.password = password
+        self.limiter = ConcurrencyLimiter(max_concurrency)
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.validation = validation
+        self.hooks = hooks
+        self.singleflight: Optional[AsyncSingleFlight[httpx.Response]] = (
+            AsyncSingleFlight() if coalesce else None
+        )
+        self.identity_map = identity_map
+        self.decode = get_decoder(decoder)
+        self.run_dedup = run_dedup
+        self.hedging = hedging
+        self.breaker = breaker
+        self.timeouts = timeouts or {}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=httpx.BasicAuth(token, password),
+            timeout=timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> AsyncModeClient:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def sub_client(self, cls: Type[AsyncModeClientT]) -> AsyncModeClientT:
+        return cls(
+            self.client,
+            self.workspace,
+            self.limiter,
+            self.retry,
+            self.rate_limiter,
+            self.cache,
+            self.validation,
+            self.hooks,
+            self.singleflight,
+            self.identity_map,
+            self.decode,
+            self.run_dedup,
+            self.hedging,
+            self.breaker,
+            self.timeouts,
+        )
+
+    @cached_property
+    def account(self) -> AsyncModeAccountClient:
+        return self.sub_client(AsyncModeAccountClient)
+
+    @cached_property
+    def links(self) -> AsyncModeLinkClient:
+        return self.sub_client(AsyncModeLinkClient)
+
+    @cached_property
+    def query(self) -> AsyncModeQueryClient:
+        return self.sub_client(AsyncModeQueryClient)
+
+    @cached_property
+    def query_run(self) -> AsyncModeQueryRunClient:
+        return self.sub_client(AsyncModeQueryRunClient)
+
+    @cached_property
+    def report(self) -> AsyncModeReportClient:
+        return self.sub_client(AsyncModeReportClient)
+
+    @cached_property
+    def report_run(self) -> AsyncModeReportRunClient:
+        return self.sub_client(AsyncModeReportRunClient)
+
+    @cached_property
+    def space(self) -> AsyncModeSpaceClient:
+        return self.sub_client(AsyncModeSpaceClient)
+
+    async def gather_reports(self, reports: Iterable[str]) -> List[Report]:
+        return list(await asyncio.gather(*(self.report.get(r) for r in reports)))
+
+    async def gather_spaces(self, spaces: Iterable[str]) -> List[Space]:
+        return list(await asyncio.gather(*(self.space.get(s) for s in spaces)))
+
+    async def gather_queries(self, reports: Iterable[str]) -> Dict[str, List[Query]]:
+        tokens = list(reports)
+        queries = await asyncio.gather(*(self.query.list(r) for r in tokens))
+
+        return dict(zip(tokens, queries))
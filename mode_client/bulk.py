@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+DEFAULT_BULK_WORKERS = 8
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class BulkResult(Generic[K, V]):
+    operation: K
+    value: Optional[V] = None
+    error: Optional[BaseException] = None
+    executed: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkAbortedError(Exception):
+    """Raised once in-flight operations finish after the error rate is exceeded."""
+
+    def __init__(self, errors: int, completed: int):
+        super().__init__(
+            f"Aborted after {errors} errors in {completed} operations; "
+            "remaining operations were not started"
+        )
+        self.errors = errors
+        self.completed = completed
+
+
+class ErrorRate:
+    def __init__(self, max_error_rate: Optional[float], min_operations: int):
+        self.max_error_rate = max_error_rate
+        self.min_operations = min_operations
+        self.errors = 0
+        self.completed = 0
+
+    def record(self, result: BulkResult[Any, Any]) -> None:
+        self.completed += 1
+        self.errors += not result.ok
+
+    @property
+    def exceeded(self) -> bool:
+        return (
+            self.max_error_rate is not None
+            and self.completed >= self.min_operations
+            and self.errors / self.completed > self.max_error_rate
+        )
+
+
+def run_bulk(
+    call: Callable[[K], V],
+    operations: Iterable[K],
+    max_workers: int = DEFAULT_BULK_WORKERS,
+    dry_run: bool = False,
+    max_error_rate: Optional[float] = None,
+    min_operations: int = 20,
+) -> Iterator[BulkResult[K, V]]:
+    """Runs call on each operation in a thread pool, yielding results as they finish.
+
+    At most 2 * max_workers operations are in flight, so operations may be a
+    lazy iterable of any size. Once more than max_error_rate of at least
+    min_operations results have failed, no new operations are started and
+    BulkAbortedError is raised after the in-flight ones are yielded.
+    """
+    if dry_run:
+        for operation in operations:
+            yield BulkResult(operation, executed=False)
+        return
+
+    remaining = iter(operations)
+    rate = ErrorRate(max_error_rate, min_operations)
+    pending: Dict[Future[V], K] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for operation in islice(remaining, 2 * max_workers):
+                pending[executor.submit(call, operation)] = operation
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    operation = pending.pop(future)
+                    error = future.exception()
+                    result: BulkResult[K, V] = BulkResult(
+                        operation, None if error else future.result(), error
+                    )
+                    rate.record(result)
+                    yield result
+
+                if rate.exceeded:
+                    continue
+                for operation in islice(remaining, 2 * max_workers - len(pending)):
+                    pending[executor.submit(call, operation)] = operation
+        finally:
+            for future in pending:
+                future.cancel()
+
+    if rate.exceeded:
+        raise BulkAbortedError(rate.errors, rate.completed)
+
+
+async def arun_bulk(
+    call: Callable[[K], Awaitable[V]],
+    operations: Iterable[K],
+    max_concurrency: int = DEFAULT_BULK_WORKERS,
+    dry_run: bool = False,
+    max_error_rate: Optional[float] = None,
+    min_operations: int = 20,
+) -> AsyncIterator[BulkResult[K, V]]:
+    """Async counterpart of run_bulk, running at most max_concurrency tasks."""
+    if dry_run:
+        for operation in operations:
+            yield BulkResult(operation, executed=False)
+        return
+
+    remaining = iter(operations)
+    rate = ErrorRate(max_error_rate, min_operations)
+    pending: Dict[asyncio.Future[V], K] = {}
+
+    try:
+        for operation in islice(remaining, max_concurrency):
+            pending[asyncio.ensure_future(call(operation))] = operation
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                operation = pending.pop(task)
+                error = task.exception()
+                result: BulkResult[K, V] = BulkResult(
+                    operation, None if error else task.result(), error
+                )
+                rate.record(result)
+                yield result
+
+            if rate.exceeded:
+                continue
+            for operation in islice(remaining, max_concurrency - len(pending)):
+                pending[asyncio.ensure_future(call(operation))] = operation
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if rate.exceeded:
+        raise BulkAbortedError(rate.errors, rate.completed)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import PathLike
+from typing import Dict, Optional, Union
+
+import httpx
+
+from mode_client.resources import resource_template
+
+
+@dataclass
+class CacheEntry:
+    content: bytes
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses; subclasses must be thread-safe."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryCache(CacheBackend):
+    """In-memory LRU cache bounded by the total size of cached bodies."""
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+
+            self.entries[key] = entry
+            self.size += entry.size
+
+            while self.size > self.max_size and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache evicting least recently used responses beyond max_size.
+
+    Cached bodies are stored unencrypted; use one database per set of
+    credentials.
+    """
+
+    def __init__(
+        self, path: Union[str, PathLike[str]], max_size: int = 512 * 1024 * 1024
+    ):
+        import sqlite3
+
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    content BLOB NOT NULL,
+                    content_type TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT content, content_type, etag, last_modified, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        return CacheEntry(*row)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.content,
+                    entry.content_type,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.expires_at,
+                    entry.size,
+                    time.time(),
+                ),
+            )
+            self.evict()
+
+    def evict(self) -> None:
+        (size,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        while size > self.max_size:
+            rows = self.connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                return
+
+            for key, entry_size in rows:
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                size -= entry_size
+                if size <= self.max_size:
+                    return
+
+    def delete(self, key: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ResponseCache:
+    """Conditional-request cache for GET responses.
+
+    Responses younger than their TTL are served without a request; older ones
+    are revalidated with If-None-Match/If-Modified-Since and served from the
+    cache on 304. TTLs are keyed by resource template, e.g. "/reports/{report}".
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0.0,
+    ):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+        }
+
+    def count(self, stat: str) -> None:
+        with self.lock:
+            setattr(self, stat, getattr(self, stat) + 1)
+
+    def ttl(self, resource: str) -> float:
+        return self.ttls.get(resource_template(resource), self.default_ttl)
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        return self.backend.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() < entry.expires_at
+
+    def validators(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def hit(self, entry: CacheEntry, request: httpx.Request) -> httpx.Response:
+        self.count("hits")
+
+        return self.response(entry, request)
+
+    def response(self, entry: CacheEntry, request: httpx.Request) -> httpx.Response:
+        headers = {"Content-Type": entry.content_type} if entry.content_type else {}
+
+        return httpx.Response(
+            200, content=entry.content, headers=headers, request=request
+        )
+
+    def store(
+        self,
+        key: str,
+        resource: str,
+        response: httpx.Response,
+        entry: Optional[CacheEntry],
+    ) -> httpx.Response:
+        """Records a network response, resolving 304s against the cached entry."""
+        ttl = self.ttl(resource)
+
+        if response.status_code == 304 and entry is not None:
+            self.count("revalidations")
+            entry.expires_at = time.time() + ttl
+            self.backend.set(key, entry)
+            return self.response(entry, response.request)
+
+        self.count("misses")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified or ttl > 0):
+            entry = CacheEntry(
+                content=response.content,
+                content_type=response.headers.get("Content-Type"),
+                etag=etag,
+                last_modified=last_modified,
+                expires_at=time.time() + ttl,
+            )
+            self.backend.set(key, entry)
+
+        return response
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
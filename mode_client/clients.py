@@ -1,71 +1,654 @@
 from __future__ import annotations
 
-from json import JSONDecodeError
-from typing import Any, Dict, List, Literal, Optional
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property, partial
+from os import PathLike
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import httpx
-from pydantic import parse_obj_as
-
+from pydantic import BaseModel
+
+from mode_client import results
+from mode_client.bulk import DEFAULT_BULK_WORKERS, BulkResult, run_bulk
+from mode_client.cache import ResponseCache
+from mode_client.decoders import Decoder, DecoderName, get_decoder
+from mode_client.dedup import FAILED_STATES, RunDedup, created_at, parameter_hash
+from mode_client.hooks import Hooks, RequestInfo, emit
+from mode_client.identity import IdentityMap
+from mode_client.matrix import MatrixRun, ParamGrid, RunMatrix, param_combinations
 from mode_client.models import (
     Account,
+    Link,
+    ModelT,
+    Pagination,
     Query,
     QueryRun,
     Report,
     ReportRun,
     ReportRuns,
     Space,
+    Validation,
+    parse_model,
+    parse_models,
+)
+from mode_client.resilience import CircuitBreaker, HedgePolicy, Timeouts
+from mode_client.resources import resource_template
+from mode_client.retry import RetryPolicy, TokenBucket
+from mode_client.singleflight import SingleFlight
+from mode_client.waiters import TERMINAL_STATES, PollSchedule
+
+if TYPE_CHECKING:
+    from mode_client.search import QueryIndex
+    from mode_client.tables import QueryRunTable, ReportTable
+
+DEFAULT_BASE_URL = "https://app.mode.com/api"
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0
 )
+DEFAULT_PER_PAGE = 30
+
+ModeClientT = TypeVar("ModeClientT", bound="ModeBaseClient")
+
+LINK_TARGETS: Dict[str, Tuple[Type[BaseModel], Optional[str]]] = {
+    "/{account}": (Account, None),
+    "/spaces/{space}": (Space, None),
+    "/spaces/{space}/reports": (Report, "reports"),
+    "/reports/{report}": (Report, None),
+    "/reports/{report}/queries": (Query, "queries"),
+    "/reports/{report}/queries/{query}": (Query, None),
+    "/reports/{report}/runs": (ReportRun, "report_runs"),
+    "/reports/{report}/runs/{run}": (ReportRun, None),
+    "/reports/{report}/runs/{run}/query_runs": (QueryRun, "query_runs"),
+    "/reports/{report}/runs/{run}/query_runs/{query_run}": (QueryRun, None),
+}
+
+
+def clean_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if params:
+        params = {k: v for k, v in params.items() if v}
+
+    return params
+
+
+def parse_response(response: httpx.Response, decode: Decoder = json.loads) -> Any:
+    response.raise_for_status()
+
+    try:
+        return decode(response.content)
+    except ValueError:
+        return response.text
+
+
+def has_next_page(
+    response: Dict[str, Any], items: List[Dict[str, Any]], page: int, per_page: int
+) -> bool:
+    pagination = response.get("pagination")
+    if pagination:
+        return page < int(pagination["total_pages"])
+
+    return len(items) >= per_page
+
+
+def limit_items(
+    items: Generator[Dict[str, Any], None, None],
+    max_items: Optional[int] = None,
+    since: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stops after max_items, or at the first item last updated before since.
+
+    Only valid for listings ordered by updated_at descending.
+    """
+    try:
+        if max_items is not None and max_items <= 0:
+            return
+
+        for count, item in enumerate(items, start=1):
+            if since is not None and item["updated_at"] < since:
+                return
+
+            yield item
+
+            if max_items is not None and count >= max_items:
+                return
+    finally:
+        items.close()
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    params = clean_params(params)
+    if not params:
+        return url
+
+    return f"{url}?{httpx.QueryParams(sorted(params.items()))}"
+
+
+def parent_paths(url: str) -> List[str]:
+    parts = url.strip("/").split("/")
+
+    return ["/" + "/".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def is_not_found(error: Optional[BaseException]) -> bool:
+    return (
+        isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 404
+    )
+
+
+def update_index(index: QueryIndex, result: BulkResult[str, List[Query]]) -> None:
+    if result.value is not None:
+        index.update(result.operation, result.value)
+    elif is_not_found(result.error):
+        index.remove(result.operation)
+    elif result.error is not None:
+        raise result.error
+
+
+def link_resource(base_url: httpx.URL, link: Union[Link, str]) -> str:
+    """Converts an API link href to a resource path relative to base_url."""
+    href = link if isinstance(link, str) else link.href
+    if "{" in href:
+        raise ValueError(f"Cannot follow templated link {href}")
+
+    url = httpx.URL(href)
+    base_path = base_url.path.rstrip("/")
+    if (url.is_absolute_url and url.host != base_url.host) or not url.path.startswith(
+        f"{base_path}/"
+    ):
+        raise ValueError(f"{href} is not a Mode API link")
+
+    return url.path[len(base_path) :]
+
+
+def links_by_href(items: Iterable[BaseModel], name: str) -> Dict[str, List[str]]:
+    """Groups the tokens of items by the href of their link called name."""
+    tokens: Dict[str, List[str]] = {}
+    for item in items:
+        links = getattr(item, "links", None)
+        link = getattr(links, name, None) if links is not None else None
+        if link is not None:
+            tokens.setdefault(link.href, []).append(getattr(item, "token"))
+
+    return tokens
+
+
+def result_resource(report: str, run: str, query_run: str, format_: str) -> str:
+    return (
+        f"/reports/{report}/runs/{run}/query_runs/{query_run}"
+        f"/results/content.{format_}"
+    )
+
+
+def list_query_runs(
+    client: ModeBaseClient,
+    report: str,
+    run: str,
+    fields: Optional[Sequence[str]] = None,
+) -> List[QueryRun]:
+    response = client.request("GET", f"/reports/{report}/runs/{run}/query_runs")
+
+    return client.parse_list(QueryRun, response["_embedded"]["query_runs"], fields)
 
 
 class ModeBaseClient:
-    def __init__(self, workspace: str, token: str, password: str):
-        self.client = httpx.Client(
-            base_url=f"https://app.mode.com/api/{workspace}",
-            auth=httpx.BasicAuth(token, password),
-            timeout=10.0,
+    def __init__(
+        self,
+        client: httpx.Client,
+        workspace: str,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        validation: Validation = "full",
+        hooks: Sequence[Hooks] = (),
+        singleflight: Optional[SingleFlight[httpx.Response]] = None,
+        identity_map: Optional[IdentityMap] = None,
+        decode: Decoder = json.loads,
+        run_dedup: Optional[RunDedup] = None,
+        hedging: Optional[HedgePolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[Timeouts] = None,
+    ):
+        self.client = client
+        self.prefix = f"/{workspace}" if workspace else ""
+        self.retry = retry or RetryPolicy(max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.validation = validation
+        self.hooks = hooks
+        self.singleflight = singleflight
+        self.identity_map = identity_map
+        self.decode = decode
+        self.run_dedup = run_dedup
+        self.hedging = hedging
+        self.breaker = breaker
+        self.timeouts = timeouts or {}
+
+    def parse(
+        self,
+        model: Type[ModelT],
+        data: Dict[str, Any],
+        fields: Optional[Sequence[str]] = None,
+    ) -> ModelT:
+        """Parses data into model, or only the given fields of it.
+
+        Projections are partial views, so they bypass the identity map.
+        """
+        start = time.perf_counter()
+        parsed = parse_model(model, data, self.validation, fields)
+        if self.hooks:
+            emit(self.hooks, "parse", model, 1, time.perf_counter() - start)
+        if self.identity_map is not None and fields is None:
+            parsed = self.identity_map.resolve(model, parsed)
+
+        return parsed
+
+    def parse_list(
+        self,
+        model: Type[ModelT],
+        items: List[Dict[str, Any]],
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ModelT]:
+        start = time.perf_counter()
+        parsed = parse_models(model, items, self.validation, fields)
+        if self.hooks:
+            emit(self.hooks, "parse", model, len(items), time.perf_counter() - start)
+        if self.identity_map is not None and fields is None:
+            parsed = [self.identity_map.resolve(model, item) for item in parsed]
+
+        return parsed
+
+    def send(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Sends a request, sharing one response between concurrent identical GETs."""
+        if method != "GET" or self.singleflight is None:
+            return self.observe(method, resource, json, params)
+
+        key = cache_key(f"{self.prefix}{resource}", params)
+
+        return self.singleflight.do(
+            key, lambda: self.observe(method, resource, None, params)
         )
 
+    def observe(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        info = RequestInfo(method, resource)
+        emit(self.hooks, "request_start", info)
+        try:
+            response = self.send_cached(info, json, params)
+            info.status_code = response.status_code
+            info.size = len(response.content)
+        except Exception as e:
+            info.error = e
+            raise
+        finally:
+            info.elapsed = time.perf_counter() - info.started_at
+            emit(self.hooks, "request_end", info)
+
+        return response
+
+    def send_cached(
+        self,
+        info: RequestInfo,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        method, resource = info.method, info.resource
+        if self.cache is None:
+            return self.dispatch(method, resource, json=json, params=params, info=info)
+
+        url = f"{self.prefix}{resource}"
+        if method != "GET":
+            for path in parent_paths(url):
+                self.cache.invalidate(path)
+            return self.dispatch(method, resource, json=json, params=params, info=info)
+
+        key = cache_key(url, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            info.cached = True
+            emit(self.hooks, "cache_hit", info)
+            return self.cache.hit(entry, self.client.build_request(method, url))
+
+        headers = self.cache.validators(entry)
+        response = self.dispatch(
+            method, resource, params=params, headers=headers, info=info
+        )
+
+        return self.cache.store(key, resource, response, entry)
+
+    def dispatch(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        info: Optional[RequestInfo] = None,
+    ) -> httpx.Response:
+        attempt = 0
+        template = info.template if info is not None else resource_template(resource)
+        timeout = self.timeouts.get(template, httpx.USE_CLIENT_DEFAULT)
+
+        def send() -> httpx.Response:
+            return self.client.request(
+                method=method,
+                url=f"{self.prefix}{resource}",
+                json=json,
+                params=clean_params(params),
+                headers=headers,
+                timeout=timeout,
+            )
+
+        while True:
+            if self.breaker is not None:
+                self.breaker.check(template)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            if info is not None:
+                info.attempts = attempt + 1
+
+            try:
+                if self.hedging is not None and method == "GET":
+                    response = self.hedging.send(template, send)
+                else:
+                    response = send()
+            except httpx.TransportError as e:
+                if self.breaker is not None:
+                    self.breaker.record(template, False)
+                if not self.retry.should_retry_error(method, e, attempt):
+                    raise
+                reason = type(e).__name__
+                delay = self.retry.backoff(attempt)
+            else:
+                if self.breaker is not None:
+                    self.breaker.record_response(template, response)
+                if not self.retry.should_retry(method, response, attempt):
+                    if self.rate_limiter is not None and response.status_code != 429:
+                        self.rate_limiter.reward()
+                    return response
+                reason = str(response.status_code)
+                delay = self.retry.delay(response, attempt)
+                if self.rate_limiter is not None and response.status_code == 429:
+                    self.rate_limiter.penalize(self.retry.retry_after(response))
+
+            self.retry.record(reason)
+            if info is not None:
+                emit(self.hooks, "retry", info, reason, delay)
+            attempt += 1
+            time.sleep(delay)
+
     def request(
         self,
         method: str,
         resource: str,
         json: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
     ) -> Any:
-        if params:
-            params = {k: v for k, v in params.items() if v}
+        """Sends a request and decodes its JSON body, or returns the bytes if raw."""
+        response = self.send(method, resource, json=json, params=params)
+        if raw:
+            response.raise_for_status()
+            return response.content
 
-        response = self.client.request(
-            method=method, url=resource, json=json, params=params
-        )
-        response.raise_for_status()
+        return parse_response(response, self.decode)
 
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        resource: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[httpx.Response]:
+        info = RequestInfo(method, resource, attempts=1)
+        template = info.template
+        emit(self.hooks, "request_start", info)
         try:
-            return response.json()
-        except JSONDecodeError:
-            return response.text
+            if self.breaker is not None:
+                self.breaker.check(template)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            request = self.client.build_request(
+                method=method,
+                url=f"{self.prefix}{resource}",
+                params=clean_params(params),
+                timeout=self.timeouts.get(template, httpx.USE_CLIENT_DEFAULT),
+            )
+            try:
+                response = self.client.send(request, stream=True)
+            except httpx.TransportError:
+                if self.breaker is not None:
+                    self.breaker.record(template, False)
+                raise
+
+            try:
+                if self.breaker is not None:
+                    self.breaker.record_response(template, response)
+                info.status_code = response.status_code
+                response.raise_for_status()
+                yield response
+                info.size = response.num_bytes_downloaded
+            finally:
+                response.close()
+        except Exception as e:
+            info.error = e
+            raise
+        finally:
+            info.elapsed = time.perf_counter() - info.started_at
+            emit(self.hooks, "request_end", info)
+
+    def paginate(
+        self,
+        resource: str,
+        name: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = False,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Lazily yields the embedded items of every page of a listing.
+
+        With prefetch, page N+1 is fetched in a background thread while the
+        items of page N are consumed.
+        """
+        query = {**(params or {}), "per_page": per_page}
+
+        def fetch(page: int) -> Any:
+            return self.request("GET", resource, params={**query, "page": page})
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 1
+            response = fetch(page)
+            previous = None
+
+            while True:
+                items = response["_embedded"][name]
+                # Guard against endpoints that ignore the page parameter
+                if not items or items[0] == previous:
+                    return
+
+                more = has_next_page(response, items, page, per_page)
+                future: Optional[Future[Any]] = None
+                if more and executor is not None:
+                    future = executor.submit(fetch, page + 1)
+
+                yield from items
+
+                if not more:
+                    return
+
+                previous = items[0]
+                page += 1
+                response = future.result() if future is not None else fetch(page)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+
+class ModeLinkClient(ModeBaseClient):
+    """Follows HAL links found in the _links of every model."""
+
+    def __init__(self, client: httpx.Client, _: str, *args: Any, **kwargs: Any):
+        super().__init__(client, "", *args, **kwargs)
+
+    @overload
+    def follow(self, link: Union[Link, str], model: Type[ModelT]) -> ModelT:
+        ...
+
+    @overload
+    def follow(self, link: Union[Link, str]) -> Any:
+        ...
+
+    def follow(
+        self, link: Union[Link, str], model: Optional[Type[BaseModel]] = None
+    ) -> Any:
+        """Fetches the target of a link, inferring its model from the link.
+
+        Collection links return a list of every page's items; links to unknown
+        targets return decoded JSON unless a model is given.
+        """
+        resource = link_resource(self.client.base_url, link)
+        target = LINK_TARGETS.get(resource_template(resource))
+        if target is not None and target[1] is not None:
+            if model is not None:
+                raise TypeError(f"{resource} is a collection; use follow_all")
+            return self.follow_all(link)
+        if target is None and model is None:
+            return self.request("GET", resource)
+
+        model = model or target[0]  # type: ignore[index]
+        return self.parse(model, self.request("GET", resource))
+
+    @overload
+    def follow_all(self, link: Union[Link, str], model: Type[ModelT]) -> List[ModelT]:
+        ...
+
+    @overload
+    def follow_all(self, link: Union[Link, str]) -> List[Any]:
+        ...
+
+    def follow_all(
+        self, link: Union[Link, str], model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
+        resource = link_resource(self.client.base_url, link)
+        target = LINK_TARGETS.get(resource_template(resource))
+        if target is None or target[1] is None:
+            raise TypeError(f"{resource} is not a known collection")
+
+        items = list(self.paginate(resource, target[1]))
+        return self.parse_list(model or target[0], items)
+
+    def resolve(
+        self,
+        items: Iterable[BaseModel],
+        name: str,
+        max_workers: int = DEFAULT_BULK_WORKERS,
+    ) -> Dict[str, Any]:
+        """Follows the link called name of many models, keyed by their token.
+
+        Each distinct href is fetched once, concurrently. Missing links and
+        targets that no longer exist resolve to None.
+        """
+        items = list(items)
+        tokens = links_by_href(items, name)
+        resolved: Dict[str, Any] = {getattr(item, "token"): None for item in items}
+        for result in run_bulk(self.follow, tokens, max_workers):
+            if result.error is not None and not is_not_found(result.error):
+                raise result.error
+            for token in tokens[result.operation]:
+                resolved[token] = result.value
+
+        return resolved
 
 
 class ModeAccountClient(ModeBaseClient):
-    def __init__(self, _: str, token: str, password: str):
-        super().__init__("", token, password)
+    def __init__(self, client: httpx.Client, _: str, *args: Any, **kwargs: Any):
+        super().__init__(client, "", *args, **kwargs)
 
     def get(self, account: str) -> Account:
         response = self.request("GET", f"/{account}")
 
-        return Account.parse_obj(response)
+        return self.parse(Account, response)
 
 
 class ModeQueryClient(ModeBaseClient):
-    def get(self, report: str, query: str) -> Query:
+    def get(
+        self, report: str, query: str, fields: Optional[Sequence[str]] = None
+    ) -> Query:
         response = self.request("GET", f"/reports/{report}/queries/{query}")
 
-        return Query.parse_obj(response)
+        return self.parse(Query, response, fields)
 
-    def list(self, report: str) -> List[Query]:
+    def list(self, report: str, fields: Optional[Sequence[str]] = None) -> List[Query]:
         response = self.request("GET", f"/reports/{report}/queries")
 
-        return parse_obj_as(List[Query], response["_embedded"]["queries"])
+        return self.parse_list(Query, response["_embedded"]["queries"], fields)
+
+    def index(
+        self,
+        reports: Iterable[str],
+        index: Optional[QueryIndex] = None,
+        max_workers: int = DEFAULT_BULK_WORKERS,
+    ) -> QueryIndex:
+        """Adds the queries of reports to a search index, creating one if needed.
+
+        Only queries whose updated_at changed are rewritten; reports that no
+        longer exist are removed from the index.
+        """
+        from mode_client.search import QueryIndex
+
+        index = index if index is not None else QueryIndex()
+        for result in run_bulk(self.list, reports, max_workers):
+            update_index(index, result)
+
+        return index
+
+    def iter_queries(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Query]:
+        items = self.paginate(
+            f"/reports/{report}/queries", "queries", None, per_page, prefetch
+        )
+        for item in limit_items(items, max_items):
+            yield self.parse(Query, item, fields)
 
     def create(
         self, report: str, raw_query: str, data_source_id: int, name: str
@@ -98,37 +681,174 @@ class ModeQueryClient(ModeBaseClient):
             "PATCH", f"/reports/{report}/queries/{query}", json={"query": json}
         )
 
-        return Query.parse_obj(response)
+        return self.parse(Query, response)
 
     def delete(self, report: str, query: str) -> None:
         self.request("DELETE", f"/reports/{report}/queries/{query}")
 
+    def bulk_update(
+        self,
+        updates: Iterable[Tuple[str, str, str]],
+        max_workers: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> Iterator[BulkResult[Tuple[str, str, str], Query]]:
+        """Rewrites the SQL of (report, query, raw_query) triples concurrently."""
+        return run_bulk(
+            lambda update: self.update(*update),
+            updates,
+            max_workers,
+            dry_run,
+            max_error_rate,
+        )
+
 
 class ModeQueryRunClient(ModeBaseClient):
-    def get(self, report: str, run: str, query_run: str) -> QueryRun:
+    def get(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> QueryRun:
         response = self.request(
             "GET", f"/reports/{report}/runs/{run}/query_runs/{query_run}"
         )
 
-        return QueryRun.parse_obj(response)
+        return self.parse(QueryRun, response, fields)
+
+    def list(
+        self, report: str, run: str, fields: Optional[Sequence[str]] = None
+    ) -> List[QueryRun]:
+        return list_query_runs(self, report, run, fields)
+
+    def iter_query_runs(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[QueryRun]:
+        items = self.paginate(
+            f"/reports/{report}/runs/{run}/query_runs",
+            "query_runs",
+            None,
+            per_page,
+            prefetch,
+        )
+        for item in limit_items(items, max_items):
+            yield self.parse(QueryRun, item, fields)
+
+    def table(
+        self,
+        report: str,
+        run: str,
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+    ) -> QueryRunTable:
+        items = self.paginate(
+            f"/reports/{report}/runs/{run}/query_runs", "query_runs", None, per_page
+        )
+
+        from mode_client.tables import QueryRunTable
 
-    def list(self, report: str, run: str) -> List[QueryRun]:
-        response = self.request("GET", f"/reports/{report}/runs/{run}/query_runs")
+        return QueryRunTable.from_items(limit_items(items, max_items), fields)
 
-        return parse_obj_as(List[QueryRun], response["_embedded"]["query_runs"])
+    def iter_result(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        format_: Literal["csv", "json"] = "csv",
+        chunk_size: int = results.DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        resource = result_resource(report, run, query_run, format_)
+        with self.stream("GET", resource) as response:
+            yield from response.iter_bytes(chunk_size)
+
+    def iter_result_rows(
+        self, report: str, run: str, query_run: str
+    ) -> Iterator[Dict[str, str]]:
+        return results.iter_csv_rows(self.iter_result(report, run, query_run))
+
+    def iter_result_batches(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        block_size: int = results.DEFAULT_BLOCK_SIZE,
+    ) -> Iterator[Any]:
+        chunks = self.iter_result(report, run, query_run)
+
+        return results.iter_arrow_batches(chunks, block_size)
+
+    def download_result(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        path: Union[str, PathLike[str]],
+        format_: Literal["csv", "json", "parquet"] = "csv",
+    ) -> None:
+        if format_ == "parquet":
+            chunks = self.iter_result(report, run, query_run)
+            results.write_parquet(chunks, path)
+            return
+
+        resource = result_resource(report, run, query_run, format_)
+        with self.stream("GET", resource) as response, open(path, "wb") as f:
+            for chunk in response.iter_bytes(results.DEFAULT_CHUNK_SIZE):
+                f.write(chunk)
 
 
 class ModeReportClient(ModeBaseClient):
-    def get(self, report: str) -> Report:
+    def get(self, report: str, fields: Optional[Sequence[str]] = None) -> Report:
         response = self.request("GET", f"/reports/{report}")
 
-        return Report.parse_obj(response)
+        return self.parse(Report, response, fields)
 
-    def list(self, space: str) -> List[Report]:
+    def list(self, space: str, fields: Optional[Sequence[str]] = None) -> List[Report]:
         params = {"order": "desc", "order_by": "updated_at"}
         response = self.request("GET", f"/spaces/{space}/reports", params=params)
 
-        return parse_obj_as(List[Report], response["_embedded"]["reports"])
+        return self.parse_list(Report, response["_embedded"]["reports"], fields)
+
+    def iter_reports(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Report]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/spaces/{space}/reports", "reports", params, per_page, prefetch
+        )
+        for item in limit_items(items, max_items, since):
+            yield self.parse(Report, item, fields)
+
+    def table(
+        self,
+        space: str,
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+    ) -> ReportTable:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/spaces/{space}/reports", "reports", params, per_page, prefetch
+        )
+
+        from mode_client.tables import ReportTable
+
+        return ReportTable.from_items(limit_items(items, max_items, since), fields)
 
     def update(
         self,
@@ -145,71 +865,303 @@ class ModeReportClient(ModeBaseClient):
         json = {k: v for k, v in raw_json.items() if v is not None}
         response = self.request("PATCH", f"/reports/{report}", json={"report": json})
 
-        return Report.parse_obj(response)
+        return self.parse(Report, response)
 
     def delete(self, report: str) -> None:
         self.request("DELETE", f"/reports/{report}")
 
     def archive(self, report: str) -> Report:
         response = self.request("PATCH", f"/reports/{report}/archive")
-        return Report.parse_obj(response)
+        return self.parse(Report, response)
 
     def unarchive(self, report: str) -> Report:
         response = self.request("PATCH", f"/reports/{report}/unarchive")
 
-        return Report.parse_obj(response)
+        return self.parse(Report, response)
 
     def sync(self, report: str, commit_message: Optional[str] = None) -> Report:
         json = {"commit_message": commit_message}
         response = self.request("PATCH", f"/reports/{report}/sync_to_github", json=json)
 
-        return Report.parse_obj(response)
+        return self.parse(Report, response)
+
+    def bulk_archive(
+        self,
+        reports: Iterable[str],
+        max_workers: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> Iterator[BulkResult[str, Report]]:
+        return run_bulk(self.archive, reports, max_workers, dry_run, max_error_rate)
+
+    def bulk_move(
+        self,
+        moves: Iterable[Tuple[str, str]],
+        max_workers: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> Iterator[BulkResult[Tuple[str, str], Report]]:
+        """Moves (report, space_token) pairs concurrently."""
+        return run_bulk(
+            lambda move: self.update(move[0], space_token=move[1]),
+            moves,
+            max_workers,
+            dry_run,
+            max_error_rate,
+        )
 
 
 class ModeReportRunClient(ModeBaseClient):
-    def get(self, report: str, run: str) -> ReportRun:
+    def get(
+        self, report: str, run: str, fields: Optional[Sequence[str]] = None
+    ) -> ReportRun:
         response = self.request("GET", f"/reports/{report}/runs/{run}")
 
-        return ReportRun.parse_obj(response)
+        return self.parse(ReportRun, response, fields)
 
-    def list(self, report: str) -> ReportRuns:
+    def list(self, report: str, fields: Optional[Sequence[str]] = None) -> ReportRuns:
         params = {"order": "desc", "order_by": "updated_at"}
         raw_response = self.request("GET", f"/reports/{report}/runs", params=params)
-        response = {
-            "pagination": raw_response["pagination"],
-            "report_runs": raw_response["_embedded"]["report_runs"],
-        }
+        runs = raw_response["_embedded"]["report_runs"]
 
-        return ReportRuns.parse_obj(response)
+        return ReportRuns.construct(
+            pagination=Pagination.parse_obj(raw_response["pagination"]),
+            report_runs=self.parse_list(ReportRun, runs, fields),
+        )
+
+    def iter_runs(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        since: Optional[str] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[ReportRun]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        items = self.paginate(
+            f"/reports/{report}/runs", "report_runs", params, per_page, prefetch
+        )
+        for item in limit_items(items, max_items, since):
+            yield self.parse(ReportRun, item, fields)
+
+    def wait(
+        self,
+        report: str,
+        run: str,
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> ReportRun:
+        results = self.wait_many(
+            [(report, run)], timeout, expected_runtime, None, min_interval, max_interval
+        )
+        result = results[run]
+        if result.state not in TERMINAL_STATES:
+            raise TimeoutError(f"Report run {run} did not finish within {timeout}s")
+
+        return result
+
+    def wait_many(
+        self,
+        runs: Iterable[Tuple[str, str]],
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        callback: Optional[Callable[[str, ReportRun], None]] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> Dict[str, ReportRun]:
+        """Polls many (report, run) pairs until they finish or timeout passes.
+
+        Returns the last observed ReportRun keyed by run token; runs that did not
+        finish in time keep their last non-terminal state. callback is invoked
+        with (report, run) as soon as each run finishes.
+        """
+        schedule = PollSchedule(min_interval, max_interval, timeout=timeout)
+        runtimes: Dict[str, float] = {}
+        for report, run in runs:
+            if expected_runtime is not None:
+                runtimes[report] = expected_runtime
+            elif report not in runtimes:
+                response = self.request("GET", f"/reports/{report}")
+                runtimes[report] = float(response["expected_runtime"])
+            schedule.add(report, run, runtimes[report])
+
+        results: Dict[str, ReportRun] = {}
+        while schedule:
+            time.sleep(schedule.delay())
+            expired = schedule.expired()
+            for report, run in schedule.due():
+                result = results[run] = self.get(report, run)
+                if result.state in TERMINAL_STATES:
+                    if callback is not None:
+                        callback(report, result)
+                elif not expired:
+                    schedule.reschedule(report, run)
+
+        return results
 
     def clone(self, report: str, run: str) -> ReportRun:
         response = self.request("POST", f"/reports/{report}/runs/{run}/clone")
-        return ReportRun.parse_obj(response)
+        return self.parse(ReportRun, response)
 
     def create(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
+        """Creates a report run.
+
+        With the client's run_dedup set, a fresh run created with the same
+        parameters is returned instead, and concurrent identical calls share
+        one run.
+        """
+        dedup = self.run_dedup
+        if dedup is None:
+            return self.submit(report, parameters)
+
+        key = dedup.key(report, parameters)
+
+        return dedup.flight.do(
+            key, partial(self.create_once, dedup, key, report, parameters)
+        )
+
+    def submit(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
         response = self.request(
             "POST", f"/reports/{report}/runs", json={"parameters": parameters}
         )
-        return ReportRun.parse_obj(response)
+        return self.parse(ReportRun, response)
+
+    def create_once(
+        self, dedup: RunDedup, key: str, report: str, parameters: Dict[str, Any]
+    ) -> ReportRun:
+        created = None
+        run = dedup.get(key)
+        if run is not None and run.state not in TERMINAL_STATES:
+            run = self.get(report, run.token)
+        if (run is None or run.state in FAILED_STATES) and dedup.scan:
+            run = self.find_run(dedup, report, parameters)
+            created = created_at(run) if run is not None else None
+        if run is None or run.state in FAILED_STATES:
+            run = self.submit(report, parameters)
+        else:
+            dedup.reused += 1
+        dedup.put(key, run, created)
+
+        return run
+
+    def find_run(
+        self, dedup: RunDedup, report: str, parameters: Dict[str, Any]
+    ) -> Optional[ReportRun]:
+        """Finds a fresh run of report whose query runs used parameters."""
+        expected = parameter_hash(parameters)
+        for run in self.iter_runs(report, max_items=dedup.scan, since=dedup.cutoff()):
+            if run.state in FAILED_STATES or not dedup.is_fresh(created_at(run)):
+                continue
+            query_runs = list_query_runs(self, report, run.token)
+            if query_runs and parameter_hash(query_runs[0].parameters) == expected:
+                return run
+
+        return None
+
+    def run_matrix(
+        self,
+        report: str,
+        param_grid: ParamGrid,
+        max_concurrency: int = DEFAULT_BULK_WORKERS,
+        timeout: Optional[float] = None,
+        collect: bool = True,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> RunMatrix:
+        """Runs a report once per parameter combination and waits for every run.
+
+        Runs are created max_concurrency at a time, subject to the client's
+        rate limiter, then polled together. With collect, the query runs of
+        succeeded runs are fetched for their result links.
+        """
+        matrix = RunMatrix(
+            report, [MatrixRun(p) for p in param_combinations(param_grid)]
+        )
+
+        start = time.perf_counter()
+        created = run_bulk(
+            lambda entry: self.create(report, entry.parameters),
+            matrix.runs,
+            max_concurrency,
+        )
+        for result in created:
+            entry = result.operation
+            entry.run, entry.error = result.value, result.error
+            entry.submitted_at = time.perf_counter()
+        matrix.submit_time = time.perf_counter() - start
+
+        pending = {entry.run.token: entry for entry in matrix.runs if entry.run}
+
+        def finished(_: str, run: ReportRun) -> None:
+            pending[run.token].finished_at = time.perf_counter()
+
+        start = time.perf_counter()
+        runs = self.wait_many(
+            [(report, token) for token in pending],
+            timeout,
+            None,
+            finished,
+            min_interval,
+            max_interval,
+        )
+        for token, run in runs.items():
+            pending[token].run = run
+        matrix.wait_time = time.perf_counter() - start
+
+        if collect:
+            start = time.perf_counter()
+            succeeded = [token for token, entry in pending.items() if entry.succeeded]
+            collected = run_bulk(
+                lambda token: list_query_runs(self, report, token),
+                succeeded,
+                max_concurrency,
+            )
+            for fetched in collected:
+                entry = pending[fetched.operation]
+                entry.query_runs = fetched.value or []
+                entry.error = fetched.error
+            matrix.collect_time = time.perf_counter() - start
+
+        return matrix
 
 
 class ModeSpaceClient(ModeBaseClient):
-    def get(self, space: str) -> Space:
+    def get(self, space: str, fields: Optional[Sequence[str]] = None) -> Space:
         response = self.request("GET", f"/spaces/{space}")
-        return Space.parse_obj(response)
+        return self.parse(Space, response, fields)
 
-    def list(self, filter_: Literal["all", "custom"] = "custom") -> List[Space]:
+    def list(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Space]:
         params = {"filter": filter_}
         response = self.request("GET", "/spaces", params=params)
         spaces = response["_embedded"]["spaces"]
 
-        return parse_obj_as(List[Space], spaces)
+        return self.parse_list(Space, spaces, fields)
+
+    def iter_spaces(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Space]:
+        params = {"filter": filter_}
+        items = self.paginate("/spaces", "spaces", params, per_page, prefetch)
+        for item in limit_items(items, max_items):
+            yield self.parse(Space, item, fields)
 
     def create(self, name: str, description: str) -> Space:
         json = {"space": {"name": name, "description": description}}
         response = self.request("POST", "/spaces", json=json)
 
-        return Space.parse_obj(response)
+        return self.parse(Space, response)
 
     def update(
         self, space: str, name: Optional[str] = None, description: Optional[str] = None
@@ -218,38 +1170,124 @@ class ModeSpaceClient(ModeBaseClient):
         json = {k: v for k, v in raw_json.items() if v is not None}
         response = self.request("POST", f"/spaces/{space}", json={"space": json})
 
-        return Space.parse_obj(response)
+        return self.parse(Space, response)
 
     def delete(self, space: str) -> None:
         self.request("DELETE", f"/spaces/{space}")
 
+    def bulk_delete(
+        self,
+        spaces: Iterable[str],
+        max_workers: int = DEFAULT_BULK_WORKERS,
+        dry_run: bool = False,
+        max_error_rate: Optional[float] = None,
+    ) -> Iterator[BulkResult[str, None]]:
+        return run_bulk(self.delete, spaces, max_workers, dry_run, max_error_rate)
+
 
 class ModeClient:
-    def __init__(self, workspace: str, token: str, password: str):
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        timeout: float = 10.0,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        validation: Validation = "full",
+        base_url: str = DEFAULT_BASE_URL,
+        hooks: Sequence[Hooks] = (),
+        coalesce: bool = True,
+        identity_map: Optional[IdentityMap] = None,
+        decoder: Union[DecoderName, Decoder] = "auto",
+        run_dedup: Optional[RunDedup] = None,
+        hedging: Optional[HedgePolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[Timeouts] = None,
+    ):
         self.workspace = workspace
         self.token = token
         self.password = password
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.validation = validation
+        self.hooks = hooks
+        self.singleflight: Optional[SingleFlight[httpx.Response]] = (
+            SingleFlight() if coalesce else None
+        )
+        self.identity_map = identity_map
+        self.decode = get_decoder(decoder)
+        self.run_dedup = run_dedup
+        self.hedging = hedging
+        self.breaker = breaker
+        self.timeouts = timeouts or {}
+        self.client = httpx.Client(
+            base_url=base_url,
+            auth=httpx.BasicAuth(token, password),
+            timeout=timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        )
 
-    @property
+    def __enter__(self) -> ModeClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.client.close()
+        if self.hedging is not None:
+            self.hedging.close()
+
+    def sub_client(self, cls: Type[ModeClientT]) -> ModeClientT:
+        return cls(
+            self.client,
+            self.workspace,
+            self.retry,
+            self.rate_limiter,
+            self.cache,
+            self.validation,
+            self.hooks,
+            self.singleflight,
+            self.identity_map,
+            self.decode,
+            self.run_dedup,
+            self.hedging,
+            self.breaker,
+            self.timeouts,
+        )
+
+    @cached_property
     def account(self) -> ModeAccountClient:
-        return ModeAccountClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeAccountClient)
+
+    @cached_property
+    def links(self) -> ModeLinkClient:
+        return self.sub_client(ModeLinkClient)
 
-    @property
+    @cached_property
     def query(self) -> ModeQueryClient:
-        return ModeQueryClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeQueryClient)
 
-    @property
+    @cached_property
     def query_run(self) -> ModeQueryRunClient:
-        return ModeQueryRunClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeQueryRunClient)
 
-    @property
+    @cached_property
     def report(self) -> ModeReportClient:
-        return ModeReportClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeReportClient)
 
-    @property
+    @cached_property
     def report_run(self) -> ModeReportRunClient:
-        return ModeReportRunClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeReportRunClient)
 
-    @property
+    @cached_property
     def space(self) -> ModeSpaceClient:
-        return ModeSpaceClient(self.workspace, self.token, self.password)
+        return self.sub_client(ModeSpaceClient)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib
+import json
+from typing import Any, Callable, Literal, Union
+
+Decoder = Callable[[bytes], Any]
+DecoderName = Literal["auto", "json", "orjson", "msgspec"]
+
+
+def orjson_decoder() -> Decoder:
+    try:
+        orjson = importlib.import_module("orjson")
+    except ImportError as e:
+        raise ImportError(
+            "The orjson decoder requires orjson: pip install orjson"
+        ) from e
+
+    return orjson.loads  # type: ignore[no-any-return]
+
+
+def msgspec_decoder() -> Decoder:
+    try:
+        msgspec = importlib.import_module("msgspec")
+    except ImportError as e:
+        raise ImportError(
+            "The msgspec decoder requires msgspec: pip install msgspec"
+        ) from e
+
+    return msgspec.json.Decoder().decode  # type: ignore[no-any-return]
+
+
+def get_decoder(decoder: Union[DecoderName, Decoder] = "auto") -> Decoder:
+    """Resolves a decoder name; "auto" prefers orjson, then msgspec, then json.
+
+    Every decoder raises a ValueError subclass on invalid JSON.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "json":
+        return json.loads
+    if decoder == "orjson":
+        return orjson_decoder()
+    if decoder == "msgspec":
+        return msgspec_decoder()
+
+    for factory in (orjson_decoder, msgspec_decoder):
+        try:
+            return factory()
+        except ImportError:
+            pass
+
+    return json.loads
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from mode_client.models import ReportRun
+from mode_client.singleflight import AsyncSingleFlight, SingleFlight
+
+FAILED_STATES = frozenset({"failed", "cancelled"})
+
+
+def parameter_hash(parameters: Optional[Dict[str, Any]]) -> str:
+    """Hashes run parameters independently of key order and whitespace."""
+    canonical = json.dumps(
+        parameters or {}, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def created_at(run: ReportRun) -> float:
+    parsed = datetime.fromisoformat(run.created_at.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.timestamp()
+
+
+class RunDedup:
+    """Reuses report runs recently created with the same parameters.
+
+    Runs are indexed by report and parameter hash for ttl seconds after their
+    creation; failed and cancelled runs are never reused. On a local miss, up
+    to scan of the report's most recent runs are checked for query runs with
+    the same parameters, which also finds runs created by other processes.
+    """
+
+    def __init__(self, ttl: float = 300.0, scan: int = 0, max_size: int = 10_000):
+        self.ttl = ttl
+        self.scan = scan
+        self.max_size = max_size
+        self.runs: OrderedDict[str, Tuple[float, ReportRun]] = OrderedDict()
+        self.reused = 0
+        self.lock = threading.Lock()
+        self.flight: SingleFlight[ReportRun] = SingleFlight()
+        self.async_flight: AsyncSingleFlight[ReportRun] = AsyncSingleFlight()
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    @staticmethod
+    def key(report: str, parameters: Optional[Dict[str, Any]]) -> str:
+        return f"{report}:{parameter_hash(parameters)}"
+
+    def is_fresh(self, created: float) -> bool:
+        return time.time() - created < self.ttl
+
+    def cutoff(self) -> str:
+        """The oldest updated_at a run can have and still be reused."""
+        cutoff = datetime.fromtimestamp(time.time() - self.ttl, timezone.utc)
+
+        return cutoff.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def get(self, key: str) -> Optional[ReportRun]:
+        with self.lock:
+            entry = self.runs.get(key)
+            if entry is None:
+                return None
+            created, run = entry
+            if not self.is_fresh(created) or run.state in FAILED_STATES:
+                del self.runs[key]
+                return None
+
+            return run
+
+    def put(self, key: str, run: ReportRun, created: Optional[float] = None) -> None:
+        """Indexes a run, keeping the creation time of a run already indexed."""
+        with self.lock:
+            entry = self.runs.get(key)
+            if entry is not None and entry[1].token == run.token:
+                created = entry[0]
+            self.runs[key] = (time.time() if created is None else created, run)
+            self.runs.move_to_end(key)
+            while len(self.runs) > self.max_size:
+                self.runs.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.runs.clear()
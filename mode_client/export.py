@@ -0,0 +1,267 @@
+"""Exports workspace SQL and metadata to a directory tree for backup and diffing.
+
+Run with: python -m mode_client.export DIRECTORY [--space TOKEN] [--full]
+using the MODE_WORKSPACE, MODE_TOKEN and MODE_PASSWORD environment variables.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from mode_client.bulk import DEFAULT_BULK_WORKERS, run_bulk
+from mode_client.clients import ModeClient, is_not_found
+from mode_client.models import Report, Space
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 2
+
+# Fields that change without the object being edited, e.g. on every run or view
+SPACE_VOLATILE = frozenset({"links", "viewed_"})
+REPORT_VOLATILE = frozenset(
+    {
+        "links",
+        "last_run_at",
+        "last_successfully_run_at",
+        "last_successful_run_token",
+        "last_successful_sync_at",
+        "runs_count",
+        "view_count",
+        "web_preview_image",
+    }
+)
+QUERY_VOLATILE = frozenset({"links", "raw_query", "last_run_id"})
+
+
+def dump(model: BaseModel, volatile: AbstractSet[str]) -> bytes:
+    data = model.json(by_alias=True, exclude=set(volatile), indent=2, sort_keys=True)
+
+    return (data + "\n").encode()
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class ExportSummary:
+    written: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    reports_fetched: int = 0
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class Manifest:
+    """Content hash of every exported file."""
+
+    def __init__(self, files: Optional[Dict[str, str]] = None):
+        self.files = files if files is not None else {}
+
+    @classmethod
+    def load(cls, path: Path) -> Manifest:
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return cls()
+        if data.get("version") != MANIFEST_VERSION:
+            return cls()
+
+        return cls(data["files"])
+
+    def save(self, path: Path) -> None:
+        data = {"version": MANIFEST_VERSION, "files": self.files}
+        write_atomic(path, (json.dumps(data, indent=2, sort_keys=True) + "\n").encode())
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+
+class ExportWriter:
+    """Writes the files of one export, skipping those the old manifest matches."""
+
+    def __init__(self, root: Path, full: bool = False):
+        self.root = root
+        self.old = Manifest() if full else Manifest.load(root / MANIFEST)
+        self.new = Manifest()
+        self.summary = ExportSummary()
+
+    def write(self, path: str, content: bytes) -> None:
+        digest = self.new.files[path] = content_hash(content)
+        if self.old.files.get(path) == digest and (self.root / path).exists():
+            self.summary.unchanged += 1
+            return
+
+        write_atomic(self.root / path, content)
+        self.summary.written.append(path)
+
+    def keep(self, directory: str) -> None:
+        """Carries the previous export of a directory over unchanged."""
+        prefix = f"{directory}/"
+        self.new.files.update(
+            (path, digest)
+            for path, digest in self.old.files.items()
+            if path.startswith(prefix)
+        )
+
+    def finish(self) -> ExportSummary:
+        """Removes files of deleted objects and saves the new manifest."""
+        for path in sorted(set(self.old.files) - set(self.new.files)):
+            (self.root / path).unlink(missing_ok=True)
+            self.summary.removed.append(path)
+            for parent in (self.root / path).parents:
+                if parent == self.root or any(parent.iterdir()):
+                    break
+                parent.rmdir()
+        self.new.save(self.root / MANIFEST)
+
+        return self.summary
+
+
+class WorkspaceExport:
+    """Writes every space, report and query of a workspace under root.
+
+    The layout is keyed by token so renames do not move files::
+
+        spaces/<space>/space.json
+        spaces/<space>/reports/<report>/report.json
+        spaces/<space>/reports/<report>/queries/<query>.sql
+        spaces/<space>/reports/<report>/queries/<query>.json
+
+    The queries of every report are listed on each run, since query edits do
+    not move the report's updated_at, but files whose content hash matches
+    the manifest are not rewritten unless full is set. Files of deleted
+    objects are removed.
+    """
+
+    def __init__(
+        self,
+        client: ModeClient,
+        root: Union[str, PathLike[str]],
+        spaces: Optional[Sequence[str]] = None,
+        max_workers: int = DEFAULT_BULK_WORKERS,
+    ):
+        self.client = client
+        self.root = Path(root)
+        self.spaces = spaces
+        self.max_workers = max_workers
+
+    def run(self, full: bool = False) -> ExportSummary:
+        start = time.perf_counter()
+        writer = ExportWriter(self.root, full)
+        spaces = {
+            space.token: space
+            for space in self.client.space.iter_spaces("all", prefetch=True)
+        }
+        if self.spaces is not None:
+            for token in set(spaces) - set(self.spaces):
+                writer.keep(f"spaces/{token}")
+                del spaces[token]
+
+        reports: Dict[str, Tuple[Report, str]] = {}
+        for token, listed in self.list_reports(spaces, writer):
+            directory = f"spaces/{token}"
+            writer.write(f"{directory}/space.json", dump(spaces[token], SPACE_VOLATILE))
+            for report in listed:
+                reports[report.token] = (report, f"{directory}/reports/{report.token}")
+
+        for result in run_bulk(self.client.query.list, reports, self.max_workers):
+            report, directory = reports[result.operation]
+            if is_not_found(result.error):
+                continue
+            if result.error is not None:
+                writer.summary.errors[report.token] = result.error
+                writer.keep(directory)
+                continue
+
+            writer.summary.reports_fetched += 1
+            writer.write(f"{directory}/report.json", dump(report, REPORT_VOLATILE))
+            for query in result.value or []:
+                path = f"{directory}/queries/{query.token}"
+                writer.write(f"{path}.sql", (query.raw_query or "").encode())
+                writer.write(f"{path}.json", dump(query, QUERY_VOLATILE))
+
+        summary = writer.finish()
+        summary.elapsed = time.perf_counter() - start
+
+        return summary
+
+    def list_reports(
+        self, spaces: Dict[str, Space], writer: ExportWriter
+    ) -> Iterator[Tuple[str, List[Report]]]:
+        results = run_bulk(
+            lambda space: list(self.client.report.iter_reports(space, prefetch=True)),
+            spaces,
+            self.max_workers,
+        )
+        for result in results:
+            if result.error is not None:
+                # Keep the previous export of a space that could not be listed
+                writer.summary.errors[result.operation] = result.error
+                writer.keep(f"spaces/{result.operation}")
+                continue
+
+            yield result.operation, result.value or []
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m mode_client.export",
+        description="Exports workspace SQL and metadata to a directory tree.",
+    )
+    parser.add_argument("directory")
+    parser.add_argument(
+        "--space", action="append", dest="spaces", metavar="TOKEN", help="repeatable"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rewrite files whose content is unchanged",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_BULK_WORKERS)
+    args = parser.parse_args(argv)
+
+    with ModeClient(
+        os.environ["MODE_WORKSPACE"],
+        os.environ["MODE_TOKEN"],
+        os.environ["MODE_PASSWORD"],
+        validation="lazy",
+    ) as client:
+        export = WorkspaceExport(client, args.directory, args.spaces, args.workers)
+        summary = export.run(args.full)
+
+    print(
+        f"{len(summary.written)} written, {summary.unchanged} unchanged, "
+        f"{len(summary.removed)} removed, {summary.reports_fetched} reports "
+        f"fetched in {summary.elapsed:.1f}s"
+    )
+    for token, error in summary.errors.items():
+        print(f"{token}: {error}")
+    if summary.errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
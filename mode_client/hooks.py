@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from mode_client.resources import resource_template
+
+
+@dataclass
+class RequestInfo:
+    """A single client call, shared by the start and end events of its hooks.
+
+    Hooks may keep per-request state in context.
+    """
+
+    method: str
+    resource: str
+    started_at: float = field(default_factory=time.perf_counter)
+    status_code: Optional[int] = None
+    size: Optional[int] = None
+    elapsed: Optional[float] = None
+    attempts: int = 0
+    cached: bool = False
+    error: Optional[BaseException] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    @cached_property
+    def template(self) -> str:
+        return resource_template(self.resource)
+
+
+class Hooks:
+    """Receives request lifecycle events; override any subset.
+
+    Hooks run synchronously on the calling thread or event loop, so they
+    must be cheap and thread-safe.
+    """
+
+    def request_start(self, info: RequestInfo) -> None:
+        pass
+
+    def request_end(self, info: RequestInfo) -> None:
+        pass
+
+    def retry(self, info: RequestInfo, reason: str, delay: float) -> None:
+        pass
+
+    def cache_hit(self, info: RequestInfo) -> None:
+        pass
+
+    def parse(self, model: Type[BaseModel], count: int, elapsed: float) -> None:
+        pass
+
+
+def emit(hooks: Sequence[Hooks], event: str, *args: Any) -> None:
+    for hook in hooks:
+        getattr(hook, event)(*args)
+
+
+class OpenTelemetryHooks(Hooks):
+    """Records a client span per call and per parse, named by resource template."""
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry export requires opentelemetry-api: "
+                "pip install opentelemetry-api"
+            ) from e
+
+        self.trace = trace
+        self.tracer = tracer or trace.get_tracer("mode_client")
+
+    def request_start(self, info: RequestInfo) -> None:
+        info.context["span"] = self.tracer.start_span(
+            f"{info.method} {info.template}",
+            kind=self.trace.SpanKind.CLIENT,
+            attributes={
+                "http.method": info.method,
+                "mode.resource_template": info.template,
+            },
+        )
+
+    def request_end(self, info: RequestInfo) -> None:
+        span = info.context.pop("span", None)
+        if span is None:
+            return
+
+        span.set_attribute("mode.attempts", info.attempts)
+        span.set_attribute("mode.cached", info.cached)
+        if info.status_code is not None:
+            span.set_attribute("http.status_code", info.status_code)
+        if info.size is not None:
+            span.set_attribute("http.response_content_length", info.size)
+        if info.error is not None:
+            span.record_exception(info.error)
+        if info.error is not None or (info.status_code or 0) >= 400:
+            span.set_status(self.trace.Status(self.trace.StatusCode.ERROR))
+        span.end()
+
+    def retry(self, info: RequestInfo, reason: str, delay: float) -> None:
+        span = info.context.get("span")
+        if span is not None:
+            span.add_event("retry", {"reason": reason, "delay": delay})
+
+    def parse(self, model: Type[BaseModel], count: int, elapsed: float) -> None:
+        end = time.time_ns()
+        span = self.tracer.start_span(
+            f"parse {model.__name__}",
+            start_time=end - int(elapsed * 1e9),
+            attributes={"mode.model": model.__name__, "mode.count": count},
+        )
+        span.end(end_time=end)
+
+
+class PrometheusHooks(Hooks):
+    """Exports request, retry, cache and parse metrics keyed by resource template.
+
+    Metrics are registered on construction, so create one instance per
+    registry.
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "mode_client"):
+        try:
+            import prometheus_client  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "Prometheus export requires prometheus-client: "
+                "pip install prometheus-client"
+            ) from e
+
+        kwargs: Dict[str, Any] = {"namespace": namespace}
+        if registry is not None:
+            kwargs["registry"] = registry
+
+        self.request_duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Duration of Mode API calls, including retries.",
+            ["method", "template", "status"],
+            **kwargs,
+        )
+        self.response_size = prometheus_client.Histogram(
+            "response_size_bytes",
+            "Size of Mode API response bodies.",
+            ["method", "template"],
+            buckets=[2**i for i in range(8, 28, 2)],
+            **kwargs,
+        )
+        self.retries = prometheus_client.Counter(
+            "retries",
+            "Retried Mode API requests.",
+            ["template", "reason"],
+            **kwargs,
+        )
+        self.cache_hits = prometheus_client.Counter(
+            "cache_hits",
+            "Mode API calls served from the response cache.",
+            ["template"],
+            **kwargs,
+        )
+        self.parse_duration = prometheus_client.Histogram(
+            "parse_duration_seconds",
+            "Time spent parsing responses into models.",
+            ["model"],
+            **kwargs,
+        )
+
+    def request_end(self, info: RequestInfo) -> None:
+        status = "error" if info.status_code is None else str(info.status_code)
+        self.request_duration.labels(info.method, info.template, status).observe(
+            info.elapsed or 0.0
+        )
+        if info.size is not None:
+            self.response_size.labels(info.method, info.template).observe(info.size)
+
+    def retry(self, info: RequestInfo, reason: str, delay: float) -> None:
+        self.retries.labels(info.template, reason).inc()
+
+    def cache_hit(self, info: RequestInfo) -> None:
+        self.cache_hits.labels(info.template).inc()
+
+    def parse(self, model: Type[BaseModel], count: int, elapsed: float) -> None:
+        self.parse_duration.labels(model.__name__).observe(elapsed)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple, Type
+
+from mode_client.models import ModelT
+
+
+class IdentityMap:
+    """Per-session map resolving each (model, token) to a single instance.
+
+    A model parsed again updates the existing instance in place, so every
+    holder sees the latest state. The least recently resolved instances are
+    forgotten beyond max_size.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self.instances: OrderedDict[Tuple[type, str], Any] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def resolve(self, model: Type[ModelT], instance: ModelT) -> ModelT:
+        token = getattr(instance, "token", None)
+        if not isinstance(token, str):
+            return instance
+
+        key = (model, token)
+        with self.lock:
+            existing = self.instances.get(key)
+            if existing is None:
+                self.instances[key] = instance
+                while len(self.instances) > self.max_size:
+                    self.instances.popitem(last=False)
+                return instance
+
+            self.instances.move_to_end(key)
+            # Swapped without comparing, which would validate lazy _links
+            object.__setattr__(existing, "__dict__", instance.__dict__)
+            object.__setattr__(existing, "__fields_set__", instance.__fields_set__)
+
+        return existing  # type: ignore[no-any-return]
+
+    def get(self, model: Type[ModelT], token: str) -> Any:
+        with self.lock:
+            return self.instances.get((model, token))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.instances.clear()
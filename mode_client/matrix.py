@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from mode_client.models import QueryRun, ReportRun
+
+ParamGrid = Union[Mapping[str, Sequence[Any]], Iterable[Dict[str, Any]]]
+
+SUCCEEDED_STATES = frozenset({"succeeded", "completed"})
+
+
+def param_combinations(param_grid: ParamGrid) -> List[Dict[str, Any]]:
+    """Expands {"region": ["eu", "us"], "tier": [1, 2]} to its 4 combinations.
+
+    An iterable of parameter dicts is used as is.
+    """
+    if isinstance(param_grid, Mapping):
+        names = list(param_grid)
+        return [
+            dict(zip(names, values))
+            for values in product(*(param_grid[name] for name in names))
+        ]
+
+    return [dict(parameters) for parameters in param_grid]
+
+
+@dataclass
+class MatrixRun:
+    parameters: Dict[str, Any]
+    run: Optional[ReportRun] = None
+    error: Optional[BaseException] = None
+    query_runs: List[QueryRun] = field(default_factory=list)
+    submitted_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.run is None:
+            return "not_created"
+
+        return self.run.state or "unknown"
+
+    @property
+    def succeeded(self) -> bool:
+        return self.state in SUCCEEDED_STATES
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.submitted_at is None or self.finished_at is None:
+            return None
+
+        return self.finished_at - self.submitted_at
+
+    @property
+    def result_links(self) -> List[str]:
+        return [query_run.links.result.href for query_run in self.query_runs]
+
+
+@dataclass
+class RunMatrix:
+    """Outcome of a report run per parameter combination, with phase timings."""
+
+    report: str
+    runs: List[MatrixRun]
+    submit_time: float = 0.0
+    wait_time: float = 0.0
+    collect_time: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.submit_time + self.wait_time + self.collect_time
+
+    @property
+    def states(self) -> Counter[str]:
+        return Counter(run.state for run in self.runs)
+
+    @property
+    def succeeded(self) -> List[MatrixRun]:
+        return [run for run in self.runs if run.succeeded]
+
+    @property
+    def failed(self) -> List[MatrixRun]:
+        return [run for run in self.runs if not run.succeeded]
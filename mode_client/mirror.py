@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from os import PathLike
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from mode_client.clients import ModeClient
+from mode_client.models import (
+    ModelT,
+    Query,
+    Report,
+    ReportRun,
+    Space,
+    Validation,
+    parse_models,
+)
+from mode_client.sync import Change, WorkspaceSync
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spaces (
+    token TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    space_type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    token TEXT PRIMARY KEY,
+    space_token TEXT,
+    name TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    last_run_at TEXT,
+    last_successfully_run_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_space_token ON reports (space_token);
+CREATE TABLE IF NOT EXISTS queries (
+    token TEXT PRIMARY KEY,
+    report_token TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data_source_id TEXT,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queries_report_token ON queries (report_token);
+CREATE INDEX IF NOT EXISTS queries_data_source_id ON queries (data_source_id);
+CREATE TABLE IF NOT EXISTS runs (
+    token TEXT PRIMARY KEY,
+    report_token TEXT NOT NULL,
+    state TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    completed_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_report_token ON runs (report_token, created_at);
+CREATE INDEX IF NOT EXISTS runs_state ON runs (state);
+"""
+
+
+def dump(model: BaseModel) -> str:
+    return model.json(by_alias=True)
+
+
+class WorkspaceMirror:
+    """Normalized SQLite mirror of spaces, reports, queries and runs.
+
+    Models are stored with their indexed columns alongside their full JSON,
+    and read back without validation by default since they were validated
+    on the way in.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, PathLike[str]] = ":memory:",
+        validation: Validation = "none",
+    ):
+        self.validation = validation
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def refresh(self, client: ModeClient, sync: Optional[WorkspaceSync] = None) -> int:
+        """Mirrors every space, then applies the changes of a workspace sync.
+
+        Pass a WorkspaceSync with a persistent SyncState to only fetch what
+        changed since the last refresh. Returns the number of changes applied.
+        """
+        spaces = list(client.space.iter_spaces("all"))
+        self.add_spaces(spaces)
+        if sync is None:
+            sync = WorkspaceSync(client, spaces=[space.token for space in spaces])
+
+        return self.apply(sync.changes())
+
+    def apply(self, changes: Iterable[Change]) -> int:
+        count = 0
+        for change in changes:
+            item = change.item
+            if isinstance(item, Report):
+                self.add_reports([item])
+            elif isinstance(item, Query):
+                self.add_queries(change.parent, [item])
+            else:
+                self.add_runs(change.parent, [item])
+            count += 1
+
+        return count
+
+    def write(self, sql: str, rows: Sequence[Tuple[Any, ...]]) -> None:
+        with self.lock, self.connection:
+            self.connection.executemany(sql, rows)
+
+    def add_spaces(self, spaces: Iterable[Space]) -> None:
+        self.write(
+            "INSERT OR REPLACE INTO spaces VALUES (?, ?, ?, ?)",
+            [(s.token, s.name, s.space_type, dump(s)) for s in spaces],
+        )
+
+    def add_reports(self, reports: Iterable[Report]) -> None:
+        self.write(
+            "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    r.token,
+                    r.space_token,
+                    r.name,
+                    int(r.archived),
+                    r.updated_at,
+                    r.last_run_at,
+                    r.last_successfully_run_at,
+                    dump(r),
+                )
+                for r in reports
+            ],
+        )
+
+    def add_queries(self, report: str, queries: Iterable[Query]) -> None:
+        self.write(
+            "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (q.token, report, q.name, q.data_source_id, q.updated_at, dump(q))
+                for q in queries
+            ],
+        )
+
+    def add_runs(self, report: str, runs: Iterable[ReportRun]) -> None:
+        self.write(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    r.token,
+                    report,
+                    r.state,
+                    r.created_at,
+                    r.updated_at,
+                    r.completed_at,
+                    dump(r),
+                )
+                for r in runs
+            ],
+        )
+
+    def sql(self, sql: str, *params: Any) -> List[Tuple[Any, ...]]:
+        """Runs a read-only query against the mirror tables."""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def models(
+        self, model: Type[ModelT], table: str, clause: str = "", *params: Any
+    ) -> List[ModelT]:
+        rows = self.sql(f"SELECT data FROM {table} {clause}", *params)
+
+        return parse_models(
+            model, [json.loads(data) for (data,) in rows], self.validation
+        )
+
+    def spaces(self) -> List[Space]:
+        return self.models(Space, "spaces", "ORDER BY name")
+
+    def reports(
+        self, space: Optional[str] = None, archived: Optional[bool] = None
+    ) -> List[Report]:
+        conditions, params = where(space_token=space, archived=archived)
+
+        return self.models(Report, "reports", f"{conditions} ORDER BY name", *params)
+
+    def queries(
+        self, report: Optional[str] = None, data_source_id: Optional[str] = None
+    ) -> List[Query]:
+        conditions, params = where(report_token=report, data_source_id=data_source_id)
+
+        return self.models(Query, "queries", conditions, *params)
+
+    def runs(
+        self, report: Optional[str] = None, state: Optional[str] = None
+    ) -> List[ReportRun]:
+        conditions, params = where(report_token=report, state=state)
+
+        return self.models(
+            ReportRun, "runs", f"{conditions} ORDER BY created_at DESC", *params
+        )
+
+    def failing_reports(self) -> List[Report]:
+        """Unarchived reports with a failed run since their last successful one.
+
+        Cancelled and unfinished runs are not failures.
+        """
+        return self.models(
+            Report,
+            "reports",
+            "WHERE NOT archived AND EXISTS ("
+            "SELECT 1 FROM runs WHERE runs.report_token = reports.token "
+            "AND runs.state = 'failed' AND runs.created_at > COALESCE(("
+            "SELECT MAX(created_at) FROM runs AS succeeded "
+            "WHERE succeeded.report_token = reports.token "
+            "AND succeeded.state IN ('succeeded', 'completed')), '')"
+            ") ORDER BY last_run_at DESC",
+        )
+
+    def queries_per_data_source(self) -> Dict[str, int]:
+        rows = self.sql(
+            "SELECT data_source_id, COUNT(*) FROM queries "
+            "GROUP BY data_source_id ORDER BY COUNT(*) DESC"
+        )
+
+        return {data_source_id: count for data_source_id, count in rows}
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def where(**filters: Any) -> Tuple[str, List[Any]]:
+    """Builds a WHERE clause matching every filter that is not None."""
+    columns = [column for column, value in filters.items() if value is not None]
+    params = [filters[column] for column in columns]
+    if not columns:
+        return "", params
+
+    return "WHERE " + " AND ".join(f"{column} = ?" for column in columns), params
@@ -1,6 +1,25 @@
-from typing import Any, Dict, List, Literal, Optional, Union
-
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from pydantic import BaseModel, Field, validator
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Validation = Literal["full", "lazy", "none"]
 
 
 class Link(BaseModel):
@@ -350,3 +369,167 @@ class Account(BaseModel):
     created_at: str
     settings: Optional[Dict[str, Any]]
     links: AccountLinks = Field(alias="_links")
+
+
+class LazyLinks:
+    """Proxy for a _links block that is only validated on first access."""
+
+    __slots__ = ("model", "raw", "parsed")
+
+    def __init__(self, model: Type[BaseModel], raw: Dict[str, Any]):
+        self.model = model
+        self.raw = raw
+        self.parsed: Optional[BaseModel] = None
+
+    def resolve(self) -> BaseModel:
+        if self.parsed is None:
+            self.parsed = self.model.parse_obj(self.raw)
+
+        return self.parsed
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyLinks):
+            other = other.resolve()
+
+        return bool(self.resolve() == other)
+
+    def __repr__(self) -> str:
+        return f"LazyLinks({self.model.__name__})"
+
+
+@lru_cache(maxsize=None)
+def lazy_model(model: Type[ModelT]) -> Type[ModelT]:
+    """Subclass of model that keeps its _links block raw until accessed."""
+    field = model.__fields__["links"]
+    links_model = field.type_
+
+    def wrap(cls: Type[ModelT], value: Any) -> Any:
+        if value is None or isinstance(value, LazyLinks):
+            return value
+
+        return LazyLinks(links_model, value)
+
+    class Config:
+        json_encoders = {LazyLinks: lambda links: links.resolve().dict(by_alias=True)}
+
+    namespace = {
+        "__module__": model.__module__,
+        "__qualname__": model.__qualname__,
+        "__annotations__": {"links": Any},
+        "links": Field(... if field.required else None, alias="_links"),
+        "lazy_links": validator("links", pre=True, allow_reuse=True)(wrap),
+        "Config": Config,
+    }
+
+    metaclass: Any = type(model)
+
+    return cast(Type[ModelT], metaclass(model.__name__, (model,), namespace))
+
+
+@lru_cache(maxsize=None)
+def model_fields(
+    model: Type[BaseModel],
+) -> List[Tuple[str, str, Optional[Type[BaseModel]], int, bool]]:
+    fields = []
+    for name, field in model.__fields__.items():
+        nested = field.type_ if isinstance(field.type_, type) else None
+        if nested is not None and not issubclass(nested, BaseModel):
+            nested = None
+        fields.append((name, field.alias, nested, field.shape, bool(field.required)))
+
+    return fields
+
+
+def construct_model(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """Builds model and its nested models from trusted data without validation.
+
+    Equivalent to model.construct() applied recursively, but skips its
+    per-field default copying, which dominates on the wide *Links models.
+    """
+    values = {}
+    fields_set = set()
+    for name, alias, nested, shape, required in model_fields(model):
+        if alias in data:
+            value = data[alias]
+        elif name in data:
+            value = data[name]
+        else:
+            if not required:
+                field = model.__fields__[name]
+                values[name] = None if field.default is None else field.get_default()
+            continue
+
+        if nested is not None and value is not None:
+            if shape == SHAPE_SINGLETON:
+                value = construct_model(nested, value)
+            elif shape == SHAPE_LIST:
+                value = [construct_model(nested, v) for v in value]
+        values[name] = value
+        fields_set.add(name)
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+
+    return instance
+
+
+@lru_cache(maxsize=None)
+def projected_model(model: Type[ModelT], fields: FrozenSet[str]) -> Type[ModelT]:
+    """Subclass of model that only extracts and validates the given fields.
+
+    Instances lack the other attributes entirely, so reading one raises
+    AttributeError rather than returning a misleading default.
+    """
+    unknown = fields - set(model.__fields__)
+    if unknown:
+        raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+
+    namespace = {"__module__": model.__module__, "__qualname__": model.__qualname__}
+    metaclass: Any = type(model)
+    projected = metaclass(model.__name__, (model,), namespace)
+    projected.__fields__ = {
+        name: field for name, field in model.__fields__.items() if name in fields
+    }
+
+    return cast(Type[ModelT], projected)
+
+
+def model_parser(
+    model: Type[ModelT],
+    validation: Validation = "full",
+    fields: Optional[Sequence[str]] = None,
+) -> Callable[[Dict[str, Any]], ModelT]:
+    if fields is not None:
+        model = projected_model(model, frozenset(fields))
+
+    if validation == "none":
+        return lambda data: construct_model(model, data)
+
+    if validation == "lazy" and "links" in model.__fields__:
+        return lazy_model(model).parse_obj
+
+    return model.parse_obj
+
+
+def parse_model(
+    model: Type[ModelT],
+    data: Dict[str, Any],
+    validation: Validation = "full",
+    fields: Optional[Sequence[str]] = None,
+) -> ModelT:
+    return model_parser(model, validation, fields)(data)
+
+
+def parse_models(
+    model: Type[ModelT],
+    items: List[Dict[str, Any]],
+    validation: Validation = "full",
+    fields: Optional[Sequence[str]] = None,
+) -> List[ModelT]:
+    parser = model_parser(model, validation, fields)
+
+    return [parser(item) for item in items]
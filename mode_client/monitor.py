@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple
+
+import httpx
+
+from mode_client.clients import ModeClient, is_not_found
+from mode_client.models import Report, ReportRun
+from mode_client.resilience import CircuitOpenError
+from mode_client.retry import TokenBucket
+from mode_client.tables import parse_timestamp
+
+MonitorEventKind = Literal["failed", "recovered", "removed"]
+
+
+@dataclass
+class MonitorEvent:
+    kind: MonitorEventKind
+    report: str
+    item: Optional[Report] = None
+    detected_at: float = field(default_factory=time.time)
+
+
+def is_failing(report: Report) -> bool:
+    """Whether the report's last run came after its last successful one.
+
+    So do cancelled and pending runs, which last_run_failed tells apart.
+    """
+    if not report.last_run_at:
+        return False
+
+    return (
+        not report.last_successfully_run_at
+        or report.last_run_at > report.last_successfully_run_at
+    )
+
+
+def last_run_failed(run: ReportRun) -> bool:
+    return run.state == "failed" or bool(run.report_has_failures_since_last_success)
+
+
+class FailureMonitor:
+    """Watches many reports for failures under a global request budget.
+
+    Checks are kept in a priority queue by due time. Failing and recently
+    recovered reports are checked every min_interval; others about twice per
+    average gap between their runs, and at least four times per max_interval
+    when they have schedules. Checks never exceed budget requests per second,
+    so a fleet larger than the budget allows is checked less often, not faster.
+    Reports whose timestamps suggest a failure take one more request, for the
+    last run, so that cancelled and pending runs are not reported as failures.
+    """
+
+    def __init__(
+        self,
+        client: ModeClient,
+        reports: Iterable[str] = (),
+        budget: float = 0.5,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+    ):
+        self.client = client
+        self.bucket = TokenBucket(rate=budget, burst=1, adaptive=False)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.heap: List[Tuple[float, int, str]] = []
+        self.counter = 0
+        self.watched: Set[str] = set()
+        self.scheduled: Dict[str, int] = {}
+        self.failing: Dict[str, bool] = {}
+        self.failed_at: Dict[str, float] = {}
+        self.intervals: Dict[str, float] = {}
+        self.checks = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+        for report in reports:
+            self.add(report)
+
+    def __len__(self) -> int:
+        return len(self.watched)
+
+    def push(self, report: str, delay: float) -> None:
+        with self.lock:
+            if report not in self.watched:
+                return
+            self.counter += 1
+            self.scheduled[report] = self.counter
+            heapq.heappush(self.heap, (time.monotonic() + delay, self.counter, report))
+
+    def add(self, report: str, delay: float = 0.0) -> None:
+        """Starts watching a report, checking it first after delay seconds."""
+        with self.lock:
+            if report in self.watched:
+                return
+            self.watched.add(report)
+        self.push(report, delay)
+
+    def remove(self, report: str) -> None:
+        with self.lock:
+            self.watched.discard(report)
+            self.scheduled.pop(report, None)
+            self.failing.pop(report, None)
+            self.failed_at.pop(report, None)
+
+    def interval(self, report: Report, failing: bool) -> float:
+        failed_at = self.failed_at.get(report.token)
+        if failing or (
+            failed_at is not None and time.monotonic() - failed_at < self.max_interval
+        ):
+            return self.min_interval
+
+        interval = self.max_interval
+        if report.runs_count:
+            age = time.time() - parse_timestamp(report.created_at) / 1000
+            interval = age / report.runs_count / 2
+        if report.schedules_count:
+            interval = min(interval, self.max_interval / 4)
+
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def check(self, report: str) -> Optional[MonitorEvent]:
+        """Checks a report now, schedules its next check and returns any change."""
+        self.checks += 1
+        try:
+            item = self.client.report.get(report)
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            if is_not_found(e):
+                self.remove(report)
+                return MonitorEvent("removed", report)
+            self.errors += 1
+            self.push(report, self.intervals.get(report, self.min_interval))
+            return None
+
+        failing = is_failing(item) and self.confirm(item)
+        was_failing = self.failing.get(report, False)
+        self.failing[report] = failing
+        if failing:
+            self.failed_at[report] = time.monotonic()
+        interval = self.intervals[report] = self.interval(item, failing)
+        self.push(report, interval)
+
+        if failing and not was_failing:
+            return MonitorEvent("failed", report, item)
+        if was_failing and not failing:
+            return MonitorEvent("recovered", report, item)
+
+        return None
+
+    def confirm(self, report: Report) -> bool:
+        """Whether the report's last run failed, or earlier runs since a success.
+
+        Falls back to the timestamps if the last run cannot be fetched.
+        """
+        time.sleep(self.bucket.reserve())
+        try:
+            run = self.client.links.follow(report.links.last_run, ReportRun)
+        except (httpx.HTTPError, CircuitOpenError):
+            self.errors += 1
+            return True
+
+        return last_run_failed(run)
+
+    def events(self, stop: Optional[threading.Event] = None) -> Iterator[MonitorEvent]:
+        """Runs due checks until stop is set, yielding state changes as they happen."""
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            with self.lock:
+                if not self.heap:
+                    return
+                due, counter, report = self.heap[0]
+                delay = due - time.monotonic()
+                if delay <= 0:
+                    heapq.heappop(self.heap)
+            if delay > 0:
+                # Re-read the queue every second; add() may queue earlier checks
+                stop.wait(min(delay, 1.0))
+                continue
+            if self.scheduled.get(report) != counter:
+                continue
+            if stop.wait(self.bucket.reserve()):
+                return
+
+            event = self.check(report)
+            if event is not None:
+                yield event
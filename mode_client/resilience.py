@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+import httpx
+
+CircuitState = Literal["closed", "open", "half_open"]
+Timeouts = Mapping[str, Union[float, httpx.Timeout]]
+
+
+class LatencyTracker:
+    """Keeps the latest latencies of each resource template."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self.samples: Dict[str, Deque[float]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, template: str, elapsed: float) -> None:
+        with self.lock:
+            samples = self.samples.get(template)
+            if samples is None:
+                samples = self.samples[template] = deque(maxlen=self.window)
+            samples.append(elapsed)
+
+    def quantile(self, template: str, q: float) -> Optional[float]:
+        """The q-quantile latency, or None until min_samples were recorded."""
+        with self.lock:
+            samples = self.samples.get(template)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgePolicy:
+    """Sends a duplicate GET once a request outlives its endpoint's usual latency.
+
+    The hedge is sent after the quantile latency observed for the resource
+    template, never sooner than min_delay, and the first response wins.
+    Sync clients race the two requests on a small shared thread pool; when
+    it has no room for both, the request is sent on the calling thread
+    without a hedge, so hedging never queues requests or piles on load.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_delay: float = 0.01,
+        window: int = 200,
+        min_samples: int = 20,
+        max_workers: int = 8,
+    ):
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window, min_samples)
+        self.max_workers = max_workers
+        self.hedges = 0
+        self.wins = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.executor_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self.executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="mode-hedge"
+                )
+
+            return self._executor
+
+    def delay(self, template: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None while latencies are unknown."""
+        latency = self.latencies.quantile(template, self.quantile)
+        if latency is None:
+            return None
+
+        return max(self.min_delay, latency)
+
+    def record(self, template: str, elapsed: float) -> None:
+        self.latencies.record(template, elapsed)
+
+    def record_hedge(self, won: bool) -> None:
+        with self.lock:
+            self.hedges += 1
+            self.wins += won
+
+    def reserve(self) -> bool:
+        """Reserves pool workers for a request and its hedge, if both are idle."""
+        with self.lock:
+            if self.in_flight + 2 > self.max_workers:
+                return False
+            self.in_flight += 2
+
+            return True
+
+    def release(self, *_: Any) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    def send(self, template: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """Calls send, and calls it again if the first call is too slow."""
+        started = threading.Event()
+
+        def timed() -> httpx.Response:
+            started.set()
+            start = time.perf_counter()
+            response = send()
+            self.record(template, time.perf_counter() - start)
+            return response
+
+        delay = self.delay(template)
+        if delay is None or not self.reserve():
+            return timed()
+
+        primary = self.executor.submit(timed)
+        primary.add_done_callback(self.release)
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            self.release()
+            return primary.result()
+
+        hedge = self.executor.submit(timed)
+        hedge.add_done_callback(self.release)
+        pending: Set[Future[httpx.Response]] = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f is hedge):
+                if future.exception() is None:
+                    self.record_hedge(future is hedge)
+                    return future.result()
+                error = error or future.exception()
+
+        assert error is not None
+        raise error
+
+    async def asend(
+        self, template: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        async def timed() -> httpx.Response:
+            start = time.perf_counter()
+            response = await send()
+            self.record(template, time.perf_counter() - start)
+            return response
+
+        delay = self.delay(template)
+        if delay is None:
+            return await timed()
+
+        primary = asyncio.ensure_future(timed())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        hedge = asyncio.ensure_future(timed())
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda t: t is hedge):
+                    if task.exception() is None:
+                        self.record_hedge(task is hedge)
+                        return task.result()
+                    error = error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert error is not None
+        raise error
+
+    def close(self) -> None:
+        with self.executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint that keeps failing."""
+
+    def __init__(self, template: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for {template} after repeated failures; "
+            f"retry in {retry_in:.1f}s"
+        )
+        self.template = template
+        self.retry_in = retry_in
+
+
+class Circuit:
+    def __init__(self, window: int):
+        self.state: CircuitState = "closed"
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """Fails fast on resource templates whose recent error rate is too high.
+
+    A circuit opens once at least failure_rate of its last window requests
+    (and at least min_requests) failed with a 5xx or a transport error. After
+    reset_timeout, one trial request is let through: success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        reset_timeout: float = 30.0,
+    ):
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.circuits: Dict[str, Circuit] = {}
+        self.lock = threading.Lock()
+
+    def circuit(self, template: str) -> Circuit:
+        circuit = self.circuits.get(template)
+        if circuit is None:
+            circuit = self.circuits[template] = Circuit(self.window)
+
+        return circuit
+
+    def state(self, template: str) -> CircuitState:
+        with self.lock:
+            return self.circuit(template).state
+
+    def check(self, template: str) -> None:
+        """Raises CircuitOpenError unless a request to template may be sent."""
+        with self.lock:
+            circuit = self.circuit(template)
+            if circuit.state == "closed":
+                return
+
+            now = time.monotonic()
+            retry_in = circuit.opened_at + self.reset_timeout - now
+            if retry_in <= 0:
+                # Let one trial through; another follows if it never reports back
+                circuit.state = "half_open"
+                circuit.opened_at = now
+                return
+
+        raise CircuitOpenError(template, max(0.0, retry_in))
+
+    def record(self, template: str, success: bool) -> None:
+        with self.lock:
+            circuit = self.circuit(template)
+            if circuit.state == "half_open":
+                circuit.outcomes.clear()
+                if success:
+                    circuit.state = "closed"
+                else:
+                    self.trip(circuit)
+                return
+
+            circuit.outcomes.append(success)
+            failures = circuit.outcomes.count(False)
+            if (
+                circuit.state == "closed"
+                and len(circuit.outcomes) >= self.min_requests
+                and failures >= self.failure_rate * len(circuit.outcomes)
+            ):
+                self.trip(circuit)
+
+    def trip(self, circuit: Circuit) -> None:
+        circuit.state = "open"
+        circuit.opened_at = time.monotonic()
+        circuit.outcomes.clear()
+
+    def record_response(self, template: str, response: httpx.Response) -> None:
+        self.record(template, response.status_code < 500)
@@ -0,0 +1,33 @@
+from typing import Dict
+
+COLLECTIONS: Dict[str, str] = {
+    "reports": "report",
+    "spaces": "space",
+    "queries": "query",
+    "runs": "run",
+    "query_runs": "query_run",
+}
+
+
+def resource_template(resource: str) -> str:
+    """Replaces tokens in a resource path with placeholders.
+
+    >>> resource_template("/reports/8772ad79bc3f/runs")
+    '/reports/{report}/runs'
+
+    A leading workspace segment, as in followed links, is dropped.
+    """
+    parts = resource.split("?", 1)[0].strip("/").split("/")
+    if len(parts) == 1 and parts[0] not in COLLECTIONS:
+        return "/{account}"
+    if parts[0] not in COLLECTIONS:
+        parts = parts[1:]
+
+    template = []
+    for i, part in enumerate(parts):
+        previous = parts[i - 1] if i else None
+        if previous in COLLECTIONS and part not in COLLECTIONS:
+            part = f"{{{COLLECTIONS[previous]}}}"
+        template.append(part)
+
+    return "/" + "/".join(template)
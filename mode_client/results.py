@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import csv
+import io
+from os import PathLike
+from typing import Any, Dict, Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+class ChunkReader(io.RawIOBase):
+    """Exposes an iterator of byte chunks as a readable file object."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.chunks = chunks
+        self.chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self.chunk:
+            try:
+                self.chunk = memoryview(next(self.chunks))
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self.chunk))
+        buffer[:size] = self.chunk[:size]
+        self.chunk = self.chunk[size:]
+
+        return size
+
+
+def import_pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.csv  # type: ignore # noqa: F401
+        import pyarrow.parquet  # type: ignore # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Arrow and Parquet results require pyarrow: pip install pyarrow"
+        ) from e
+
+    return pyarrow
+
+
+def iter_csv_rows(chunks: Iterator[bytes]) -> Iterator[Dict[str, str]]:
+    text = io.TextIOWrapper(
+        io.BufferedReader(ChunkReader(chunks)), encoding="utf-8", newline=""
+    )
+
+    yield from csv.DictReader(text)
+
+
+def open_arrow_reader(
+    chunks: Iterator[bytes], block_size: int = DEFAULT_BLOCK_SIZE
+) -> Any:
+    pyarrow = import_pyarrow()
+    read_options = pyarrow.csv.ReadOptions(block_size=block_size)
+
+    return pyarrow.csv.open_csv(
+        io.BufferedReader(ChunkReader(chunks)), read_options=read_options
+    )
+
+
+def iter_arrow_batches(
+    chunks: Iterator[bytes], block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[Any]:
+    yield from open_arrow_reader(chunks, block_size)
+
+
+def write_parquet(
+    chunks: Iterator[bytes],
+    path: Union[str, PathLike[str]],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> None:
+    pyarrow = import_pyarrow()
+    reader = open_arrow_reader(chunks, block_size)
+
+    # Opened from the header so results without rows still get a file
+    with pyarrow.parquet.ParquetWriter(path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every sub-client of a ModeClient.
+
+    reserve() takes a token and returns how long the caller must wait before
+    using it, so the same bucket can throttle threads and asyncio tasks alike.
+    When adaptive, a 429 halves the rate and each success recovers it slowly.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 1,
+        adaptive: bool = True,
+        min_rate: Optional[float] = None,
+    ):
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.rate = rate
+        self.burst = burst
+        self.adaptive = adaptive
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        if not self.adaptive:
+            return
+
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self.tokens = min(self.tokens, -retry_after * self.rate)
+
+    def reward(self) -> None:
+        if not self.adaptive or self.rate >= self.max_rate:
+            return
+
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Idempotent methods are retried on any retryable status or transport error.
+    Other methods are only retried when the request was provably not processed:
+    a 429, or a failure to connect.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        max_retry_after: float = 300.0,
+        statuses: FrozenSet[int] = RETRY_STATUSES,
+        methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = statuses
+        self.methods = methods
+        self.retries: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def should_retry(self, method: str, response: httpx.Response, attempt: int) -> bool:
+        if attempt >= self.max_retries or response.status_code not in self.statuses:
+            return False
+
+        return response.status_code == 429 or method.upper() in self.methods
+
+    def should_retry_error(
+        self, method: str, error: httpx.TransportError, attempt: int
+    ) -> bool:
+        if attempt >= self.max_retries:
+            return False
+
+        not_sent = isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+        return not_sent or method.upper() in self.methods
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+
+        return random.uniform(0, ceiling)
+
+    def retry_after(self, response: httpx.Response) -> Optional[float]:
+        header = response.headers.get("Retry-After")
+        if header is None:
+            return None
+
+        try:
+            seconds = float(header)
+        except ValueError:
+            try:
+                date = parsedate_to_datetime(header)
+            except (TypeError, ValueError):
+                return None
+            seconds = (date - datetime.now(timezone.utc)).total_seconds()
+
+        return min(self.max_retry_after, max(0.0, seconds))
+
+    def delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = self.retry_after(response)
+        backoff = self.backoff(attempt)
+
+        return max(backoff, retry_after) if retry_after is not None else backoff
+
+    def record(self, reason: str) -> None:
+        with self.lock:
+            self.retries[reason] += 1
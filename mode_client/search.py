@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from os import PathLike
+from typing import Iterable, List, Optional, Set, Union
+
+from mode_client.models import Query
+
+TABLE_REFERENCE = re.compile(
+    r"\b(?:from|join)\s+((?:[`\"\[]?[\w$]+[`\"\]]?\.){0,2}[`\"\[]?[\w$]+[`\"\]]?)",
+    re.IGNORECASE,
+)
+
+
+def table_references(raw_query: Optional[str]) -> Set[str]:
+    """Extracts lowercased table names following FROM and JOIN."""
+    if not raw_query:
+        return set()
+
+    return {
+        re.sub(r"[`\"\[\]]", "", match).lower()
+        for match in TABLE_REFERENCE.findall(raw_query)
+    }
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def regexp(pattern: str, value: Optional[str]) -> bool:
+    return value is not None and compile_pattern(pattern).search(value) is not None
+
+
+@dataclass
+class QueryHit:
+    report: str
+    query: str
+    name: str
+    updated_at: str
+
+
+class QueryIndex:
+    """SQLite FTS5 index of query SQL, keyed by report and query token.
+
+    update() only rewrites queries whose updated_at changed, so refreshing an
+    index from fresh listings is cheap.
+    """
+
+    def __init__(self, path: Union[str, PathLike[str]] = ":memory:"):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.create_function("regexp", 2, regexp, deterministic=True)
+        with self.connection:
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS queries (
+                    token TEXT PRIMARY KEY,
+                    report TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    raw_query TEXT,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS queries_report ON queries (report);
+                CREATE TABLE IF NOT EXISTS tables (
+                    token TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (name, token)
+                );
+                CREATE INDEX IF NOT EXISTS tables_token ON tables (token);
+                CREATE VIRTUAL TABLE IF NOT EXISTS queries_fts USING fts5(
+                    token UNINDEXED,
+                    name,
+                    raw_query,
+                    tokenize="unicode61 tokenchars '_'"
+                );
+                """
+            )
+
+    def __len__(self) -> int:
+        with self.lock:
+            (count,) = self.connection.execute(
+                "SELECT COUNT(*) FROM queries"
+            ).fetchone()
+
+        return int(count)
+
+    def update(self, report: str, queries: Iterable[Query]) -> int:
+        """Syncs the queries of a report, returning how many were rewritten."""
+        queries = list(queries)
+        with self.lock, self.connection:
+            known = dict(
+                self.connection.execute(
+                    "SELECT token, updated_at FROM queries WHERE report = ?", (report,)
+                ).fetchall()
+            )
+            changed = [q for q in queries if known.get(q.token) != q.updated_at]
+            removed = set(known) - {q.token for q in queries}
+
+            self.delete(removed | {q.token for q in changed})
+            self.connection.executemany(
+                "INSERT INTO queries VALUES (?, ?, ?, ?, ?)",
+                [(q.token, report, q.name, q.raw_query, q.updated_at) for q in changed],
+            )
+            self.connection.executemany(
+                "INSERT INTO queries_fts VALUES (?, ?, ?)",
+                [(q.token, q.name, q.raw_query or "") for q in changed],
+            )
+            self.connection.executemany(
+                "INSERT INTO tables VALUES (?, ?)",
+                [
+                    (q.token, table)
+                    for q in changed
+                    for table in table_references(q.raw_query)
+                ],
+            )
+
+        return len(changed) + len(removed)
+
+    def remove(self, report: str) -> None:
+        with self.lock, self.connection:
+            tokens = self.connection.execute(
+                "SELECT token FROM queries WHERE report = ?", (report,)
+            ).fetchall()
+            self.delete({token for (token,) in tokens})
+
+    def delete(self, tokens: Set[str]) -> None:
+        rows = [(token,) for token in tokens]
+        for table in ("queries", "queries_fts", "tables"):
+            self.connection.executemany(f"DELETE FROM {table} WHERE token = ?", rows)
+
+    def hits(self, sql: str, *params: str) -> List[QueryHit]:
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+
+        return [QueryHit(*row) for row in rows]
+
+    def search(self, text: str) -> List[QueryHit]:
+        """Full-text search of names and SQL using FTS5 query syntax, best first."""
+        return self.hits(
+            "SELECT q.report, q.token, q.name, q.updated_at "
+            "FROM queries_fts JOIN queries q USING (token) "
+            "WHERE queries_fts MATCH ? ORDER BY rank",
+            text,
+        )
+
+    def regex(self, pattern: str) -> List[QueryHit]:
+        """Case-insensitive regular expression search of the SQL."""
+        return self.hits(
+            "SELECT report, token, name, updated_at FROM queries "
+            "WHERE raw_query REGEXP ?",
+            pattern,
+        )
+
+    def referencing(self, table: str) -> List[QueryHit]:
+        """Queries reading a table, matching with or without schema qualifiers."""
+        table = table.lower()
+        return self.hits(
+            "SELECT DISTINCT q.report, q.token, q.name, q.updated_at "
+            "FROM tables t JOIN queries q USING (token) "
+            "WHERE t.name = ? OR substr(t.name, -length(?) - 1) = '.' || ?",
+            table,
+            table,
+            table,
+        )
+
+    def close(self) -> None:
+        self.connection.close()
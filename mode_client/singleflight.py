@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Collapses concurrent calls with the same key into one.
+
+    The first caller runs the call; callers arriving while it is in flight
+    wait for and share its result or exception.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, Future[T]] = {}
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+    def do(self, key: str, call: Callable[[], T]) -> T:
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self.calls[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Collapses concurrent calls with the same key into one task.
+
+    Every caller awaits the task through a shield, so cancelling any one of
+    them, the first included, does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, asyncio.Future[T]] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        task = self.calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self.calls[key] = asyncio.ensure_future(call())
+            task.add_done_callback(partial(self.done, key))
+
+        return await asyncio.shield(task)
+
+    def done(self, key: str, task: asyncio.Future[T]) -> None:
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if not task.cancelled():
+            # Retrieved even when every caller was cancelled; avoids
+            # "exception never retrieved"
+            task.exception()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from os import PathLike
+from typing import Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
+
+from mode_client.clients import DEFAULT_PER_PAGE, ModeClient
+from mode_client.models import Query, Report, ReportRun
+from mode_client.waiters import TERMINAL_STATES
+
+ChangeKind = Literal["added", "updated", "archived"]
+ResourceKind = Literal["report", "query", "run"]
+
+
+@dataclass
+class Change:
+    kind: ChangeKind
+    resource: ResourceKind
+    token: str
+    parent: str
+    item: Union[Report, Query, ReportRun]
+
+
+def version(item: Union[Report, Query, ReportRun]) -> str:
+    """updated_at, or for reports the latest of it and their run timestamps.
+
+    Running a report moves last_run_at but not updated_at.
+    """
+    if isinstance(item, Report):
+        return max(
+            item.updated_at,
+            item.last_run_at or "",
+            item.last_successfully_run_at or "",
+        )
+
+    return item.updated_at
+
+
+class SyncState:
+    """SQLite store of sync watermarks and the last seen version of each item."""
+
+    def __init__(self, path: Union[str, PathLike[str]] = ":memory:"):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    scope TEXT PRIMARY KEY,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    resource TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    archived INTEGER NOT NULL,
+                    PRIMARY KEY (resource, token)
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS open_runs (
+                    token TEXT PRIMARY KEY,
+                    report TEXT NOT NULL
+                )
+                """
+            )
+
+    def watermark(self, scope: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT updated_at FROM watermarks WHERE scope = ?", (scope,)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def seen(self, resource: str, token: str) -> Optional[Tuple[str, bool]]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT updated_at, archived FROM items "
+                "WHERE resource = ? AND token = ?",
+                (resource, token),
+            ).fetchone()
+
+        return (row[0], bool(row[1])) if row else None
+
+    def has_open_runs(self, report: str) -> bool:
+        """Whether a run of the report was last seen before it finished."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM open_runs WHERE report = ? LIMIT 1", (report,)
+            ).fetchone()
+
+        return row is not None
+
+    def commit(self, watermarks: Dict[str, str], changes: Sequence[Change]) -> None:
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?)", watermarks.items()
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        change.resource,
+                        change.token,
+                        version(change.item),
+                        int(getattr(change.item, "archived", False)),
+                    )
+                    for change in changes
+                ],
+            )
+            runs = [
+                (change.token, change.parent, change.item.state)
+                for change in changes
+                if isinstance(change.item, ReportRun)
+            ]
+            self.connection.executemany(
+                "DELETE FROM open_runs WHERE token = ?",
+                [(token,) for token, _, state in runs if state in TERMINAL_STATES],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO open_runs VALUES (?, ?)",
+                [
+                    (token, report)
+                    for token, report, state in runs
+                    if state not in TERMINAL_STATES
+                ],
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class WorkspaceSync:
+    """Incrementally syncs reports, queries and runs using updated_at watermarks.
+
+    Each space keeps a watermark at the most recent report updated_at it has
+    seen. Runs do not move a report's updated_at, so reports are only listed
+    up to that watermark when runs are not synced; otherwise every report is
+    listed, a page at a time, and its run timestamps compared with the ones
+    last seen. Runs are only listed for reports whose run timestamps moved or
+    that had unfinished runs, and stop at the report's own watermark.
+
+    Queries are only listed for reports edited since the last sync. Query
+    edits do not always move the report's updated_at; deep lists the queries
+    and runs of every report, at two requests per report, to catch those and
+    any other change that leaves the report untouched.
+
+    Watermarks are committed once every change of a space has been consumed,
+    so an interrupted sync replays rather than loses changes.
+    """
+
+    def __init__(
+        self,
+        client: ModeClient,
+        state: Optional[SyncState] = None,
+        spaces: Optional[Sequence[str]] = None,
+        queries: bool = True,
+        runs: bool = True,
+        per_page: int = DEFAULT_PER_PAGE,
+        prefetch: bool = True,
+        deep: bool = False,
+    ):
+        self.client = client
+        self.state = state if state is not None else SyncState()
+        self.spaces = spaces
+        self.queries = queries
+        self.runs = runs
+        self.per_page = per_page
+        self.prefetch = prefetch
+        self.deep = deep
+
+    def run(self) -> List[Change]:
+        return list(self.changes())
+
+    def changes(self) -> Iterator[Change]:
+        spaces = self.spaces
+        if spaces is None:
+            spaces = [
+                space.token
+                for space in self.client.space.iter_spaces(
+                    "all", self.per_page, prefetch=self.prefetch
+                )
+            ]
+
+        for space in spaces:
+            watermarks: Dict[str, str] = {}
+            changes = list(self.sync_space(space, watermarks))
+            yield from changes
+            self.state.commit(watermarks, changes)
+
+    def sync_space(self, space: str, watermarks: Dict[str, str]) -> Iterator[Change]:
+        scope = f"space:{space}"
+        since = None
+        if not self.runs and not self.deep:
+            since = self.state.watermark(scope)
+        reports = self.client.report.iter_reports(
+            space, self.per_page, since=since, prefetch=self.prefetch
+        )
+        for report in reports:
+            watermarks.setdefault(scope, report.updated_at)
+            seen = self.state.seen("report", report.token)
+            change = self.diff("report", space, report, report.archived)
+            if change is not None:
+                yield change
+
+            seen_version = seen[0] if seen is not None else None
+            edited = seen_version is None or report.updated_at > seen_version
+            if self.queries and (edited or self.deep):
+                for query in self.client.query.list(report.token):
+                    yield from self.changed("query", report.token, query)
+            if self.runs and (
+                self.deep
+                or seen_version != version(report)
+                or self.state.has_open_runs(report.token)
+            ):
+                yield from self.sync_runs(report.token, watermarks)
+
+    def sync_runs(self, report: str, watermarks: Dict[str, str]) -> Iterator[Change]:
+        scope = f"report:{report}"
+        runs = self.client.report_run.iter_runs(
+            report,
+            self.per_page,
+            since=self.state.watermark(scope),
+            prefetch=self.prefetch,
+        )
+        for run in runs:
+            watermarks.setdefault(scope, run.updated_at)
+            yield from self.changed("run", report, run)
+
+    def changed(
+        self, resource: ResourceKind, parent: str, item: Union[Query, ReportRun]
+    ) -> Iterator[Change]:
+        change = self.diff(resource, parent, item)
+        if change is not None:
+            yield change
+
+    def diff(
+        self,
+        resource: ResourceKind,
+        parent: str,
+        item: Union[Report, Query, ReportRun],
+        archived: bool = False,
+    ) -> Optional[Change]:
+        seen = self.state.seen(resource, item.token)
+        if seen == (version(item), archived):
+            return None
+
+        kind: ChangeKind = "updated"
+        if archived and (seen is None or not seen[1]):
+            kind = "archived"
+        elif seen is None:
+            kind = "added"
+
+        return Change(kind, resource, item.token, parent, item)
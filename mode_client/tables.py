@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from mode_client.models import QueryRun, Report
+
+Kind = Literal["str", "int", "float", "bool", "datetime"]
+TableT = TypeVar("TableT", bound="ModelTable")
+
+NULL_INT = -(2**63)
+TYPECODES: Dict[Kind, str] = {"int": "q", "datetime": "q", "float": "d", "bool": "b"}
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """Converts a Mode ISO 8601 timestamp to epoch milliseconds."""
+    if not value:
+        return NULL_INT
+
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return (parsed - EPOCH) // timedelta(milliseconds=1)
+
+
+def format_timestamp(value: int) -> Optional[datetime]:
+    if value == NULL_INT:
+        return None
+
+    return datetime.fromtimestamp(value / 1000, timezone.utc)
+
+
+def encode(kind: Kind, value: Any) -> Any:
+    if kind == "str":
+        return sys.intern(str(value)) if value is not None else None
+    if kind == "datetime":
+        return parse_timestamp(value)
+    if kind == "int":
+        return NULL_INT if value is None else int(value)
+    if kind == "float":
+        return float("nan") if value is None else float(value)
+
+    return -1 if value is None else int(bool(value))
+
+
+def is_null(kind: Kind, value: Any) -> bool:
+    if kind in ("int", "datetime"):
+        return bool(value == NULL_INT)
+    if kind == "float":
+        return bool(value != value)
+    if kind == "bool":
+        return bool(value == -1)
+
+    return value is None
+
+
+def decode(kind: Kind, value: Any) -> Any:
+    if is_null(kind, value):
+        return None
+    if kind == "datetime":
+        return format_timestamp(value)
+    if kind == "bool":
+        return bool(value)
+
+    return value
+
+
+def new_column(kind: Kind) -> MutableSequence[Any]:
+    if kind == "str":
+        return []
+
+    return array(TYPECODES[kind])
+
+
+@lru_cache(maxsize=None)
+def row_type(name: str, fields: Tuple[str, ...]) -> Any:
+    return namedtuple(name, fields)
+
+
+class ModelTable:
+    """Column-wise store for bulk listings of a model.
+
+    Numbers and booleans are kept in typed arrays, timestamps as int64 epoch
+    milliseconds and strings interned, so large inventories take a fraction
+    of the memory of the equivalent models.
+    """
+
+    model: ClassVar[Type[BaseModel]]
+    schema: ClassVar[Dict[str, Kind]]
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields or self.schema)
+        unknown = set(self.fields) - set(self.schema)
+        if unknown:
+            raise ValueError(f"Unknown {type(self).__name__} fields: {unknown}")
+
+        self.kinds = [self.schema[field] for field in self.fields]
+        self.columns = [new_column(kind) for kind in self.kinds]
+        self.row = row_type(f"{self.model.__name__}Row", self.fields)
+
+    @classmethod
+    def from_items(
+        cls: Type[TableT],
+        items: Iterable[Union[Dict[str, Any], BaseModel]],
+        fields: Optional[Sequence[str]] = None,
+    ) -> TableT:
+        table = cls(fields)
+        table.extend(items)
+
+        return table
+
+    @classmethod
+    def concat(cls: Type[TableT], tables: Iterable[TableT]) -> TableT:
+        tables = list(tables)
+        table = cls(tables[0].fields if tables else None)
+        for other in tables:
+            if other.fields != table.fields:
+                raise ValueError("Cannot concatenate tables with different fields")
+            for column, values in zip(table.columns, other.columns):
+                column.extend(values)
+
+        return table
+
+    def append(self, item: Union[Dict[str, Any], BaseModel]) -> None:
+        values = item.dict() if isinstance(item, BaseModel) else item
+        for field, kind, column in zip(self.fields, self.kinds, self.columns):
+            column.append(encode(kind, values.get(field)))
+
+    def extend(self, items: Iterable[Union[Dict[str, Any], BaseModel]]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index: int) -> Any:
+        return self.row(
+            *(
+                decode(kind, column[index])
+                for kind, column in zip(self.kinds, self.columns)
+            )
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, field: str) -> List[Any]:
+        index = self.fields.index(field)
+        kind = self.kinds[index]
+
+        return [decode(kind, value) for value in self.columns[index]]
+
+    def take(self: TableT, indices: Iterable[int]) -> TableT:
+        table = type(self)(self.fields)
+        indices = list(indices)
+        for source, target in zip(self.columns, table.columns):
+            target.extend(source[i] for i in indices)
+
+        return table
+
+    def filter(self: TableT, predicate: Callable[[Any], bool]) -> TableT:
+        return self.take(i for i, row in enumerate(self) if predicate(row))
+
+    def sort(self: TableT, field: str, reverse: bool = False) -> TableT:
+        """Sorts by a column; missing values sort first."""
+        values = self.columns[self.fields.index(field)]
+
+        def key(index: int) -> Any:
+            value = values[index]
+            if self.schema[field] == "str":
+                return (value is not None, value or "")
+            return value
+
+        return self.take(sorted(range(len(self)), key=key, reverse=reverse))
+
+    def to_arrow(self) -> Any:
+        """Exports to a pyarrow Table sharing the buffers of non-string columns."""
+        try:
+            import pyarrow  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "Arrow export requires pyarrow: pip install pyarrow"
+            ) from e
+
+        arrays = []
+        for kind, column in zip(self.kinds, self.columns):
+            if kind == "str":
+                arrays.append(pyarrow.array(column, pyarrow.string()))
+                continue
+
+            type_ = {
+                "int": pyarrow.int64(),
+                "datetime": pyarrow.timestamp("ms", tz="UTC"),
+                "float": pyarrow.float64(),
+                "bool": pyarrow.int8(),
+            }[kind]
+            buffers = [None, pyarrow.py_buffer(column)]
+            nulls = [is_null(kind, value) for value in column]
+            if any(nulls):
+                valid = pyarrow.array([not null for null in nulls], pyarrow.bool_())
+                buffers[0] = valid.buffers()[1]
+            values = pyarrow.Array.from_buffers(type_, len(column), buffers)
+            if kind == "bool":
+                values = values.cast(pyarrow.bool_())
+            arrays.append(values)
+
+        return pyarrow.Table.from_arrays(arrays, names=list(self.fields))
+
+    def to_pandas(self) -> Any:
+        """Exports to a pandas DataFrame via Arrow."""
+        return self.to_arrow().to_pandas()
+
+
+class ReportTable(ModelTable):
+    model = Report
+
+    schema = {
+        "token": "str",
+        "name": "str",
+        "type": "str",
+        "space_token": "str",
+        "account_username": "str",
+        "archived": "bool",
+        "public": "bool",
+        "created_at": "datetime",
+        "updated_at": "datetime",
+        "edited_at": "datetime",
+        "last_run_at": "datetime",
+        "last_successfully_run_at": "datetime",
+        "expected_runtime": "float",
+        "query_count": "int",
+        "runs_count": "int",
+        "schedules_count": "int",
+        "view_count": "int",
+    }
+
+
+class QueryRunTable(ModelTable):
+    model = QueryRun
+
+    schema = {
+        "token": "str",
+        "state": "str",
+        "query_token": "str",
+        "query_name": "str",
+        "data_source_id": "str",
+        "created_at": "datetime",
+        "completed_at": "datetime",
+        "error_code": "str",
+        "error_type": "str",
+        "error_message": "str",
+    }
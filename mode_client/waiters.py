@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+TERMINAL_STATES = frozenset({"succeeded", "completed", "failed", "cancelled"})
+
+
+class PollSchedule:
+    """Schedules status checks for many pending report runs in one loop.
+
+    Each run is first checked after its report's expected runtime, then at
+    intervals growing geometrically from there up to max_interval.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        timeout: Optional[float] = None,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.heap: List[Tuple[float, int, str, str]] = []
+        self.intervals: Dict[str, float] = {}
+        self.counter = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def push(self, report: str, run: str, interval: float) -> None:
+        self.intervals[run] = interval
+        self.counter += 1
+        heapq.heappush(
+            self.heap, (time.monotonic() + interval, self.counter, report, run)
+        )
+
+    def add(self, report: str, run: str, expected_runtime: float) -> None:
+        self.push(report, run, self.clamp(expected_runtime))
+
+    def reschedule(self, report: str, run: str) -> None:
+        self.push(report, run, self.clamp(self.intervals[run] * self.backoff))
+
+    def delay(self) -> float:
+        """Seconds until the next check is due, never sleeping past the deadline."""
+        delay = max(0.0, self.heap[0][0] - time.monotonic())
+        if self.deadline is not None:
+            delay = min(delay, max(0.0, self.deadline - time.monotonic()))
+
+        return delay
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def due(self) -> List[Tuple[str, str]]:
+        """Pops every due check, or all of them once the deadline has passed."""
+        now = time.monotonic()
+        expired = self.expired()
+        runs = []
+        while self.heap and (expired or self.heap[0][0] <= now):
+            _, _, report, run = heapq.heappop(self.heap)
+            runs.append((report, run))
+
+        return runs
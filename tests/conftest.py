@@ -0,0 +1,28 @@
+import httpx
+import pytest
+
+from mode_client import ModeClient
+
+
+@pytest.fixture
+def mock_client():
+    clients = []
+
+    def factory(handler, **kwargs):
+        transport = httpx.MockTransport(handler)
+        client = ModeClient(
+            "workspace", "token", "password", transport=transport, **kwargs
+        )
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def emulator_client(server, mock_client):
+    """A client served by the FakeModeServer of the module's server fixture."""
+    return mock_client(server)
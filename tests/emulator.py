@@ -0,0 +1,440 @@
+"""In-process fake of the Mode API built from the recorded fixtures.
+
+The server can be plugged into a client through httpx.MockTransport
+(``transport=httpx.MockTransport(server)``, or ``server.handle_async`` for
+AsyncModeClient), or served over real sockets with ``server.serve()`` for
+benchmarks that need connection setup costs.
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PLACEHOLDERS = (
+    "QUERY_RUN_TOKEN",
+    "ACCOUNT_TOKEN",
+    "REPORT_TOKEN",
+    "SPACE_TOKEN",
+    "QUERY_TOKEN",
+    "RUN_TOKEN",
+    "WORKSPACE",
+    "ACCOUNT",
+)
+EPOCH = datetime(2022, 8, 1, tzinfo=timezone.utc)
+RESULT_CSV = "order_id,customer,quantity\n1,Dunder Mifflin,100\n2,Sabre,42\n"
+
+
+@lru_cache(maxsize=None)
+def fixture(name):
+    return (FIXTURES / f"{name}.json").read_text()
+
+
+def render(name, **tokens):
+    text = fixture(name)
+    for placeholder in PLACEHOLDERS:
+        if placeholder.lower() in tokens:
+            text = text.replace(placeholder, tokens[placeholder.lower()])
+
+    return json.loads(text)
+
+
+def timestamp(seconds):
+    value = EPOCH + timedelta(seconds=seconds)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+class FakeModeServer:
+    def __init__(
+        self,
+        workspace="workspace",
+        account="mode_client",
+        latency=0.0,
+        fault_rate=0.0,
+        fault_statuses=(429, 502, 503),
+        polls_until_complete=1,
+        seed=0,
+    ):
+        self.workspace = workspace
+        self.account = account
+        self.latency = latency
+        self.fault_rate = fault_rate
+        self.fault_statuses = fault_statuses
+        self.polls_until_complete = polls_until_complete
+        self.random = random.Random(seed)
+        self.clock = 0
+        self.lock = threading.RLock()
+
+        self.spaces = {}
+        self.reports = {}
+        self.queries = {}
+        self.runs = {}
+        self.query_runs = {}
+        self.pending = {}
+        self.faults = []
+        self.requests = []
+
+    # Fixture builders
+
+    def token(self):
+        return "%012x" % self.random.getrandbits(48)
+
+    def tick(self):
+        self.clock += 1
+        return timestamp(self.clock)
+
+    def tokens(self, **tokens):
+        return {"workspace": self.workspace, "account": self.account, **tokens}
+
+    def add_space(self, token=None, **fields):
+        token = token or self.token()
+        space = render("space", **self.tokens(space_token=token))
+        space.update(fields)
+        self.spaces[token] = space
+        return space
+
+    def add_report(self, space, token=None, **fields):
+        token = token or self.token()
+        updated_at = self.tick()
+        report = render(
+            "report",
+            **self.tokens(report_token=token, space_token=space, run_token="none"),
+        )
+        report.update(updated_at=updated_at, edited_at=updated_at, **fields)
+        self.reports[token] = report
+        self.queries[token] = {}
+        self.runs[token] = {}
+        return report
+
+    def add_query(self, report, token=None, **fields):
+        token = token or self.token()
+        query = render("query", **self.tokens(report_token=report, query_token=token))
+        query.update(updated_at=self.tick(), **fields)
+        self.queries[report][token] = query
+        return query
+
+    def add_run(self, report, token=None, state="succeeded", parameters=None, **fields):
+        token = token or self.token()
+        updated_at = self.tick()
+        run = render("report_run", **self.tokens(report_token=report, run_token=token))
+        run.update(
+            state=state,
+            created_at=updated_at,
+            updated_at=updated_at,
+            report_has_failures_since_last_success=state == "failed",
+            **fields,
+        )
+        if state != "succeeded":
+            run["completed_at"] = None
+        self.runs[report][token] = run
+        self.query_runs[token] = {}
+
+        for query in self.queries[report].values():
+            query_run_token = self.token()
+            query_run = render(
+                "query_run",
+                **self.tokens(
+                    report_token=report,
+                    run_token=token,
+                    query_token=query["token"],
+                    query_run_token=query_run_token,
+                ),
+            )
+            query_run.update(
+                raw_source=query["raw_query"],
+                query_name=query["name"],
+                parameters=parameters or {},
+                state=state,
+            )
+            self.query_runs[token][query_run_token] = query_run
+
+        self.reports[report]["last_run_at"] = updated_at
+        self.reports[report]["_links"]["last_run"] = {
+            "href": f"/api/{self.workspace}/reports/{report}/runs/{token}"
+        }
+        if state == "succeeded":
+            self.reports[report].update(
+                last_successfully_run_at=updated_at,
+                last_successful_run_token=token,
+                runs_count=len(self.runs[report]),
+            )
+        return run
+
+    def populate(
+        self, spaces=1, reports_per_space=3, queries_per_report=2, runs_per_report=2
+    ):
+        for _ in range(spaces):
+            space = self.add_space()["token"]
+            for _ in range(reports_per_space):
+                report = self.add_report(space)["token"]
+                for i in range(queries_per_report):
+                    self.add_query(report, name=f"Query {i + 1}")
+                for _ in range(runs_per_report):
+                    self.add_run(report)
+        return self
+
+    # Request handling
+
+    def __call__(self, request):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.handle(request)
+
+    async def handle_async(self, request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.handle(request)
+
+    def handle(self, request):
+        with self.lock:
+            self.requests.append((request.method, request.url.path))
+            fault = self.fault()
+            if fault is not None:
+                return httpx.Response(fault, headers={"Retry-After": "0"})
+
+            try:
+                status, body = self.route(request)
+            except KeyError:
+                return httpx.Response(404, json={"message": "Not found"})
+
+            if isinstance(body, bytes):
+                return httpx.Response(status, content=body)
+            if body is None:
+                return httpx.Response(status)
+
+            content = json.dumps(body).encode()
+
+        etag = '"%s"' % hashlib.md5(content).hexdigest()
+        if request.method == "GET" and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+
+        headers = {"ETag": etag, "Content-Type": "application/json"}
+        return httpx.Response(status, content=content, headers=headers)
+
+    def fault(self):
+        if self.faults:
+            return self.faults.pop(0)
+        if self.fault_rate and self.random.random() < self.fault_rate:
+            return self.random.choice(self.fault_statuses)
+        return None
+
+    def listing(self, request, name, items, paginate=False):
+        items = list(items)
+        params = request.url.params
+        per_page = int(params.get("per_page", 30 if paginate else len(items) or 1))
+        page = int(params.get("page", 1))
+        body = {
+            "_links": {"self": {"href": str(request.url.path)}},
+            "_embedded": {name: items[(page - 1) * per_page : page * per_page]},
+        }
+        if paginate:
+            body["pagination"] = {
+                "page": page,
+                "per_page": per_page,
+                "count": len(body["_embedded"][name]),
+                "total_pages": max(1, -(-len(items) // per_page)),
+                "total_count": len(items),
+            }
+        return body
+
+    def route(self, request):
+        method = request.method
+        parts = request.url.path.strip("/").split("/")[1:]
+        body = json.loads(request.content) if request.content else {}
+
+        if parts[0] != self.workspace or len(parts) == 1:
+            if method == "GET" and len(parts) == 1:
+                return 200, render("account", **self.tokens(account=parts[0]))
+            raise KeyError(parts)
+
+        resource, rest = parts[1], parts[2:]
+        if resource == "spaces":
+            return self.route_spaces(request, method, rest, body)
+        if resource == "reports":
+            return self.route_reports(request, method, rest, body)
+        raise KeyError(resource)
+
+    def route_spaces(self, request, method, rest, body):
+        if not rest:
+            if method == "POST":
+                return 200, self.add_space(**body["space"])
+            filter_ = request.url.params.get("filter", "custom")
+            spaces = [
+                s
+                for s in self.spaces.values()
+                if filter_ == "all" or s["space_type"] == "custom"
+            ]
+            return 200, self.listing(request, "spaces", spaces)
+
+        space = self.spaces[rest[0]]
+        if len(rest) == 2 and rest[1] == "reports" and method == "GET":
+            reports = [r for r in self.reports.values() if r["space_token"] == rest[0]]
+            reports.sort(key=lambda r: r["updated_at"], reverse=True)
+            return 200, self.listing(request, "reports", reports)
+        if method == "GET":
+            return 200, space
+        if method == "POST":
+            space.update(body["space"])
+            return 200, space
+        if method == "DELETE":
+            del self.spaces[rest[0]]
+            return 204, None
+        raise KeyError(rest)
+
+    def route_reports(self, request, method, rest, body):
+        token = rest[0]
+        report = self.reports[token]
+
+        if len(rest) == 1:
+            if method == "GET":
+                return 200, report
+            if method == "PATCH":
+                report.update(body["report"], updated_at=self.tick())
+                return 200, report
+            if method == "DELETE":
+                del self.reports[token]
+                return 204, None
+        elif rest[1] in ("archive", "unarchive") and method == "PATCH":
+            report.update(archived=rest[1] == "archive", updated_at=self.tick())
+            return 200, report
+        elif rest[1] == "sync_to_github" and method == "PATCH":
+            return 200, report
+        elif rest[1] == "queries":
+            return self.route_queries(request, method, token, rest[2:], body)
+        elif rest[1] == "runs":
+            return self.route_runs(request, method, token, rest[2:], body)
+        raise KeyError(rest)
+
+    def route_queries(self, request, method, report, rest, body):
+        queries = self.queries[report]
+        if not rest:
+            if method == "POST":
+                return 200, self.add_query(report, **body["query"])
+            return 200, self.listing(request, "queries", queries.values())
+
+        query = queries[rest[0]]
+        if method == "GET":
+            return 200, query
+        if method == "PATCH":
+            query.update(body["query"], updated_at=self.tick())
+            return 200, query
+        if method == "DELETE":
+            del queries[rest[0]]
+            return 204, None
+        raise KeyError(rest)
+
+    def route_runs(self, request, method, report, rest, body):
+        runs = self.runs[report]
+        if not rest:
+            if method == "POST":
+                run = self.create_run(report, body.get("parameters"))
+                return 200, run
+            ordered = sorted(runs.values(), key=lambda r: r["updated_at"], reverse=True)
+            return 200, self.listing(request, "report_runs", ordered, paginate=True)
+
+        run = runs[rest[0]]
+        if len(rest) == 1 and method == "GET":
+            self.progress(report, run)
+            return 200, run
+        if rest[1:] == ["clone"] and method == "POST":
+            return 200, self.create_run(report, None)
+        if rest[1] == "query_runs":
+            query_runs = self.query_runs[rest[0]]
+            if len(rest) == 2:
+                return 200, self.listing(request, "query_runs", query_runs.values())
+            query_run = query_runs[rest[2]]
+            if len(rest) == 3:
+                return 200, query_run
+            if rest[3:] == ["results", "content.csv"]:
+                return 200, RESULT_CSV.encode()
+            if rest[3:] == ["results", "content.json"]:
+                return 200, self.result_json()
+        raise KeyError(rest)
+
+    def create_run(self, report, parameters):
+        run = self.add_run(report, state="pending", parameters=parameters)
+        self.pending[run["token"]] = self.polls_until_complete
+        return run
+
+    def progress(self, report, run):
+        remaining = self.pending.get(run["token"])
+        if remaining is None:
+            return
+        if remaining > 0:
+            self.pending[run["token"]] = remaining - 1
+            run["state"] = "enqueued"
+            return
+
+        del self.pending[run["token"]]
+        completed_at = self.tick()
+        run.update(
+            state="succeeded", updated_at=completed_at, completed_at=completed_at
+        )
+        for query_run in self.query_runs[run["token"]].values():
+            query_run["state"] = "succeeded"
+        self.reports[report].update(
+            last_run_at=completed_at,
+            last_successfully_run_at=completed_at,
+            last_successful_run_token=run["token"],
+        )
+
+    def result_json(self):
+        header, *rows = RESULT_CSV.strip().split("\n")
+        keys = header.split(",")
+        return json.dumps([dict(zip(keys, row.split(","))) for row in rows]).encode()
+
+    # Real sockets
+
+    @contextlib.contextmanager
+    def serve(self):
+        """Serves the fake API on localhost, yielding its base URL."""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), self.request_handler())
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}/api"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def request_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def handle_one(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = httpx.Request(
+                    self.command,
+                    f"http://127.0.0.1{self.path}",
+                    headers=dict(self.headers),
+                    content=self.rfile.read(length),
+                )
+                response = fake(request)
+                content = response.read()
+                self.send_response(response.status_code)
+                for key, value in response.headers.items():
+                    if key.lower() not in ("content-length", "connection"):
+                        self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = handle_one
+
+        return Handler
@@ -0,0 +1,171 @@
+"""Minimal Mode API payloads used by the offline tests."""
+
+
+def link(href):
+    return {"href": href}
+
+
+def space_payload(token="space1", name="Mode Client", space_type="custom"):
+    base = f"/api/workspace/spaces/{token}"
+    return {
+        "token": token,
+        "id": 1,
+        "space_type": space_type,
+        "name": name,
+        "description": None,
+        "state": "active",
+        "restricted": False,
+        "free_default": "false",
+        "viewable?": "true",
+        "_links": {
+            "self": link(base),
+            "detail": link(base),
+            "reports": link(f"{base}/reports"),
+            "creator": link("/api/someone"),
+            "search_space_permissions": link(f"{base}/search_space_permissions"),
+        },
+    }
+
+
+def report_payload(
+    token="report1",
+    name="Dunder Mifflin",
+    space_token="space1",
+    updated_at="2022-08-01T00:00:00.000Z",
+    last_run_token="run1",
+    **fields,
+):
+    base = f"/api/workspace/reports/{token}"
+    payload = {
+        "token": token,
+        "id": 1,
+        "name": name,
+        "description": None,
+        "created_at": "2022-01-01T00:00:00.000Z",
+        "updated_at": updated_at,
+        "edited_at": updated_at,
+        "type": "Report",
+        "last_saved_at": updated_at,
+        "archived": False,
+        "space_token": space_token,
+        "account_id": 1,
+        "account_username": "mode_client",
+        "public": False,
+        "manual_run_disabled": False,
+        "run_privately": False,
+        "drilldowns_enabled": False,
+        "expected_runtime": 1.5,
+        "last_successfully_run_at": updated_at,
+        "last_run_at": updated_at,
+        "last_successful_run_token": last_run_token,
+        "query_count": 1,
+        "max_query_count": 160,
+        "runs_count": 1,
+        "schedules_count": 0,
+        "query_preview": "select 1",
+        "view_count": 0,
+        "_links": {
+            "self": link(base),
+            "web": link(f"https://app.mode.com/workspace/reports/{token}"),
+            "account": link("/api/workspace"),
+            "report_run": link(f"{base}/runs/{{id}}"),
+            "queries": link(f"{base}/queries"),
+            "report_runs": link(f"{base}/runs"),
+            "report_pins": link(f"{base}/pins"),
+            "last_run": link(f"{base}/runs/{last_run_token}"),
+            "last_successful_run": link(f"{base}/runs/{last_run_token}"),
+        },
+    }
+    payload.update(fields)
+    return payload
+
+
+def report_run_payload(
+    token="run1",
+    report="report1",
+    state="succeeded",
+    updated_at="2022-08-01T00:00:00.000Z",
+    **fields,
+):
+    base = f"/api/workspace/reports/{report}/runs/{token}"
+    payload = {
+        "token": token,
+        "state": state,
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "completed_at": updated_at if state == "succeeded" else None,
+        "_links": {
+            "self": link(base),
+            "account": link("/api/workspace"),
+            "report": link(f"/api/workspace/reports/{report}"),
+            "query_runs": link(f"{base}/query_runs"),
+        },
+    }
+    payload.update(fields)
+    return payload
+
+
+def query_payload(
+    token="query1",
+    report="report1",
+    raw_query="select * from orders",
+    updated_at="2022-08-01T00:00:00.000Z",
+    **fields,
+):
+    base = f"/api/workspace/reports/{report}/queries/{token}"
+    payload = {
+        "id": "1",
+        "token": token,
+        "raw_query": raw_query,
+        "created_at": "2022-01-01T00:00:00.000Z",
+        "updated_at": updated_at,
+        "name": "Query 1",
+        "data_source_id": "1",
+        "explorations_count": 0,
+        "report_imports_count": 0,
+        "_links": {
+            "self": link(base),
+            "report": link(f"/api/workspace/reports/{report}"),
+            "report_runs": link(f"/api/workspace/reports/{report}/runs"),
+            "query_runs": link(f"{base}/query_runs"),
+            "creator": link("/api/someone"),
+        },
+    }
+    payload.update(fields)
+    return payload
+
+
+def query_run_payload(token="qrun1", report="report1", run="run1", **fields):
+    base = f"/api/workspace/reports/{report}/runs/{run}/query_runs/{token}"
+    payload = {
+        "id": "1",
+        "token": token,
+        "state": "succeeded",
+        "created_at": "2022-08-01T00:00:00.000Z",
+        "data_source_id": "1",
+        "limit": "true",
+        "query_token": "query1",
+        "query_name": "Query 1",
+        "query_created_at": "2022-01-01T00:00:00.000Z",
+        "parameters": {},
+        "max_result_bytes": "1000000",
+        "_links": {
+            "self": link(base),
+            "query": link(f"/api/workspace/reports/{report}/queries/query1"),
+            "result": link(f"{base}/results"),
+            "result_web": link(f"https://app.mode.com/{base}/results"),
+            "query_web": link("https://app.mode.com/query"),
+            "report_run": link(f"/api/workspace/reports/{report}/runs/{run}"),
+            "report_run_web": link("https://app.mode.com/report_run"),
+            "executed_by": link("/api/someone"),
+        },
+    }
+    payload.update(fields)
+    return payload
+
+
+def embedded(name, items, pagination=None):
+    payload = {"_embedded": {name: items}}
+    if pagination is not None:
+        payload["pagination"] = pagination
+    return payload
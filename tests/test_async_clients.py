@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+from payloads import embedded, query_payload, report_payload
+
+from mode_client import AsyncModeClient
+
+
+def make_client(handler, **kwargs):
+    transport = httpx.MockTransport(handler)
+    return AsyncModeClient(
+        "workspace", "token", "password", transport=transport, **kwargs
+    )
+
+
+def test_gather_reports_respects_max_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        token = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json=report_payload(token))
+
+    async def main():
+        async with make_client(handler, max_concurrency=3) as client:
+            return await client.gather_reports([f"r{i}" for i in range(12)])
+
+    reports = asyncio.run(main())
+
+    assert [r.token for r in reports] == [f"r{i}" for i in range(12)]
+    assert peak == 3
+
+
+def test_gather_queries():
+    def handler(request):
+        report = request.url.path.split("/")[-2]
+        return httpx.Response(
+            200, json=embedded("queries", [query_payload(report=report)])
+        )
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.gather_queries(["a", "b"])
+
+    queries = asyncio.run(main())
+
+    assert set(queries) == {"a", "b"}
+    assert queries["a"][0].token == "query1"
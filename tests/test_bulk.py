@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+from emulator import FakeModeServer
+
+from mode_client import AsyncModeClient
+from mode_client.bulk import BulkAbortedError, run_bulk
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=2, reports_per_space=10, queries_per_report=1, runs_per_report=0
+    )
+
+
+def test_bulk_archive(server, emulator_client):
+    results = list(emulator_client.report.bulk_archive(server.reports, max_workers=4))
+
+    assert all(result.ok for result in results)
+    assert {result.operation for result in results} == set(server.reports)
+    assert all(report["archived"] for report in server.reports.values())
+
+
+def test_bulk_move_reports_errors_per_item(server, emulator_client):
+    first, second = server.spaces
+    reports = [t for t, r in server.reports.items() if r["space_token"] == first]
+    moves = [(report, second) for report in reports] + [("missing", second)]
+
+    results = {r.operation: r for r in emulator_client.report.bulk_move(moves)}
+
+    assert isinstance(results[("missing", second)].error, httpx.HTTPStatusError)
+    assert all(results[(report, second)].value.space_token for report in reports)
+    assert all(server.reports[report]["space_token"] == second for report in reports)
+
+
+def test_bulk_update_queries(server, emulator_client):
+    updates = [
+        (report, query, "SELECT 2")
+        for report, queries in server.queries.items()
+        for query in queries
+    ]
+
+    results = list(emulator_client.query.bulk_update(updates))
+
+    assert len(results) == 20
+    assert all(r.value.raw_query == "SELECT 2" for r in results)
+
+
+def test_dry_run_does_not_send(server, emulator_client):
+    server.requests.clear()
+
+    results = list(emulator_client.space.bulk_delete(server.spaces, dry_run=True))
+
+    assert [r.executed for r in results] == [False, False]
+    assert server.requests == []
+
+
+def test_stops_at_error_rate():
+    started = []
+
+    def fail(operation):
+        started.append(operation)
+        raise ValueError(operation)
+
+    results = []
+    with pytest.raises(BulkAbortedError):
+        for result in run_bulk(
+            fail, range(1000), max_workers=2, max_error_rate=0.5, min_operations=10
+        ):
+            results.append(result)
+
+    assert 10 <= len(results) == len(started) < 20
+
+
+def test_async_bulk_archive(server):
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(server.handle_async),
+        ) as client:
+            return [r async for r in client.report.bulk_archive(server.reports)]
+
+    results = asyncio.run(main())
+
+    assert len(results) == 20 and all(result.ok for result in results)
+    assert all(report["archived"] for report in server.reports.values())
@@ -0,0 +1,115 @@
+import json
+
+import httpx
+import pytest
+from payloads import report_payload
+
+from mode_client.cache import (
+    CacheBackend,
+    CacheEntry,
+    MemoryCache,
+    ResponseCache,
+    SQLiteCache,
+)
+
+
+def etag_handler(requests):
+    def handler(request):
+        requests.append((request.method, request.headers.get("If-None-Match")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=report_payload(), headers={"ETag": '"v1"'})
+
+    return handler
+
+
+def entry(size, expires_at=0.0):
+    return CacheEntry(b"x" * size, None, None, None, expires_at)
+
+
+def test_revalidates_with_etag(mock_client):
+    requests = []
+    cache = ResponseCache()
+    client = mock_client(etag_handler(requests), cache=cache)
+
+    first = client.report.get("report1")
+    second = client.report.get("report1")
+
+    assert first == second
+    assert requests == [("GET", None), ("GET", '"v1"')]
+    assert cache.stats == {"hits": 0, "revalidations": 1, "misses": 1}
+
+
+def test_fresh_responses_skip_the_network(mock_client):
+    requests = []
+    cache = ResponseCache(ttls={"/reports/{report}": 60})
+    client = mock_client(etag_handler(requests), cache=cache)
+
+    client.report.get("report1")
+    client.report.get("report1")
+
+    assert len(requests) == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_mutations_invalidate(mock_client):
+    requests = []
+    cache = ResponseCache(default_ttl=60)
+    client = mock_client(etag_handler(requests), cache=cache)
+
+    client.report.get("report1")
+    client.report.archive("report1")
+    client.report.get("report1")
+
+    assert [method for method, _ in requests] == ["GET", "PATCH", "GET"]
+
+
+def test_backends_must_implement_every_method():
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = MemoryCache(max_size=10)
+    backend.set("a", entry(4))
+    backend.set("b", entry(4))
+    backend.get("a")
+    backend.set("c", entry(4))
+
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.size == 8
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    backend = SQLiteCache(tmp_path / "cache.db")
+    yield backend
+    backend.close()
+
+
+def test_sqlite_cache_round_trip(sqlite_cache):
+    content = json.dumps({"token": "a"}).encode()
+    sqlite_cache.set("a", CacheEntry(content, "application/json", '"v1"', None, 1.0))
+
+    assert sqlite_cache.get("a") == CacheEntry(
+        content, "application/json", '"v1"', None, 1.0
+    )
+
+    sqlite_cache.delete("a")
+    assert sqlite_cache.get("a") is None
+
+
+def test_sqlite_cache_evicts_least_recently_used(sqlite_cache):
+    sqlite_cache.max_size = 10
+    sqlite_cache.set("a", entry(4))
+    sqlite_cache.set("b", entry(4))
+    sqlite_cache.get("a")
+    sqlite_cache.set("c", entry(4))
+
+    assert sqlite_cache.get("b") is None
+    assert sqlite_cache.get("a") is not None
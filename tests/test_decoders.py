@@ -0,0 +1,61 @@
+import json
+
+import httpx
+import pytest
+from payloads import embedded, report_payload
+
+from mode_client.decoders import get_decoder
+
+
+def test_get_decoder():
+    assert get_decoder("json") is json.loads
+    assert get_decoder(len) is len
+    assert get_decoder("auto")(b'{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec"])
+def test_optional_decoders(name):
+    pytest.importorskip(name)
+
+    assert get_decoder(name)(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_client_uses_decoder(mock_client):
+    decoded = []
+
+    def decode(content):
+        decoded.append(content)
+        return json.loads(content)
+
+    payload = embedded("reports", [report_payload()])
+    client = mock_client(
+        lambda request: httpx.Response(200, json=payload), decoder=decode
+    )
+
+    reports = client.report.list("space1")
+
+    assert [report.token for report in reports] == ["report1"]
+    assert len(decoded) == 1
+
+
+def test_raw_returns_bytes(mock_client):
+    client = mock_client(lambda request: httpx.Response(200, content=b'{"a": 1}'))
+
+    assert client.report.request("GET", "/spaces/space1/reports", raw=True) == (
+        b'{"a": 1}'
+    )
+
+
+def test_raw_raises_for_status(mock_client):
+    client = mock_client(lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.report.request("GET", "/reports/missing", raw=True)
+
+
+def test_non_json_bodies_are_returned_as_text(mock_client):
+    client = mock_client(
+        lambda request: httpx.Response(200, content=b"a,b\n1,2"), decoder="auto"
+    )
+
+    assert client.report.request("GET", "/reports/report1") == "a,b\n1,2"
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from emulator import EPOCH, FakeModeServer
+
+from mode_client import AsyncModeClient
+from mode_client.dedup import RunDedup, parameter_hash
+
+
+@pytest.fixture
+def server():
+    server = FakeModeServer(polls_until_complete=0)
+    space = server.add_space()["token"]
+    server.add_report(space, token="report1")
+    server.add_query("report1", token="query1")
+    return server
+
+
+def created(server):
+    return [path for method, path in server.requests if method == "POST"]
+
+
+def test_parameter_hash_is_canonical():
+    assert parameter_hash({"a": 1, "b": [1, 2]}) == parameter_hash(
+        {"b": [1, 2], "a": 1}
+    )
+    assert parameter_hash(None) == parameter_hash({})
+    assert parameter_hash({"a": 1}) != parameter_hash({"a": "1"})
+
+
+def test_identical_runs_are_reused(server, mock_client):
+    dedup = RunDedup()
+    client = mock_client(server, run_dedup=dedup)
+
+    first = client.report_run.create("report1", {"region": "eu", "tier": 1})
+    second = client.report_run.create("report1", {"tier": 1, "region": "eu"})
+    other = client.report_run.create("report1", {"region": "us", "tier": 1})
+
+    assert second.token == first.token
+    assert other.token != first.token
+    assert len(created(server)) == 2
+    assert dedup.reused == 1
+
+
+def test_concurrent_identical_runs_share_one_run(server, mock_client):
+    release = threading.Event()
+
+    def handler(request):
+        if request.method == "POST":
+            release.wait(5)
+        return server(request)
+
+    dedup = RunDedup()
+    client = mock_client(handler, run_dedup=dedup)
+    with ThreadPoolExecutor(4) as executor:
+        futures = [
+            executor.submit(client.report_run.create, "report1", {"a": 1})
+            for _ in range(4)
+        ]
+        while dedup.flight.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        runs = [future.result() for future in futures]
+
+    assert len({run.token for run in runs}) == 1
+    assert len(created(server)) == 1
+
+
+def test_failed_and_stale_runs_are_not_reused(server, mock_client):
+    client = mock_client(server, run_dedup=RunDedup())
+    run = client.report_run.create("report1", {"a": 1})
+    server.runs["report1"][run.token]["state"] = "failed"
+    server.pending.clear()
+
+    assert client.report_run.create("report1", {"a": 1}).token != run.token
+
+    client = mock_client(server, run_dedup=RunDedup(ttl=0))
+    first = client.report_run.create("report1", {"a": 1})
+    assert client.report_run.create("report1", {"a": 1}).token != first.token
+
+
+def test_scan_finds_runs_from_other_clients(server, mock_client):
+    server.clock = int(time.time() - EPOCH.timestamp())
+    run = mock_client(server).report_run.create("report1", {"a": 1})
+    server.add_run("report1", parameters={"a": 2})
+
+    client = mock_client(server, run_dedup=RunDedup(scan=5))
+
+    assert client.report_run.create("report1", {"a": 1}).token == run.token
+    assert client.report_run.create("report1", {"a": 3}).token != run.token
+    assert client.run_dedup.reused == 1
+
+
+def test_async_identical_runs_share_one_run(server):
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(server.handle_async),
+            run_dedup=RunDedup(),
+        ) as client:
+            return await asyncio.gather(
+                *(client.report_run.create("report1", {"a": 1}) for _ in range(5))
+            )
+
+    runs = asyncio.run(main())
+
+    assert len({run.token for run in runs}) == 1
+    assert len(created(server)) == 1
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+from emulator import FakeModeServer
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.cache import ResponseCache
+from mode_client.retry import RetryPolicy
+
+
+@pytest.fixture
+def server():
+    server = FakeModeServer()
+    space = server.add_space("9764afb6d669")["token"]
+    server.add_space("personal", space_type="private", name="Personal")
+    report = server.add_report(space, "8772ad79bc3f")["token"]
+    server.add_query(report, "f864867b8c7c")
+    server.add_query(report, name="Query 2")
+    server.add_run(report)
+    return server
+
+
+@pytest.fixture
+def client(server, mock_client):
+    return mock_client(server)
+
+
+def test_account(client):
+    assert client.account.get("mode_client").username == "mode_client"
+
+
+def test_spaces(client):
+    assert {s.name for s in client.space.list()} == {"Mode Client"}
+    assert {s.space_type for s in client.space.list("all")} == {"private", "custom"}
+
+    space = client.space.create("Scranton", "Branch reports")
+    assert client.space.update(space.token, name="Stamford").name == "Stamford"
+    client.space.delete(space.token)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.space.get(space.token)
+
+
+def test_reports(client):
+    reports = client.report.list("9764afb6d669")
+    assert [r.token for r in reports] == ["8772ad79bc3f"]
+
+    report = client.report.get("8772ad79bc3f")
+    assert report.name == "Dunder Mifflin"
+    assert report.links.creator.href == "/api/kshitij_aranke"
+
+    assert client.report.archive("8772ad79bc3f").archived is True
+    assert client.report.unarchive("8772ad79bc3f").archived is False
+    assert (
+        client.report.update("8772ad79bc3f", name="Jaffle Shop").name == "Jaffle Shop"
+    )
+
+
+def test_queries(client):
+    queries = client.query.list("8772ad79bc3f")
+    assert {q.name for q in queries} == {"Query 1", "Query 2"}
+
+    query = client.query.get("8772ad79bc3f", "f864867b8c7c")
+    assert query.raw_query.startswith("-- Returns first 100 rows")
+
+    client.query.create("8772ad79bc3f", "select 1", 4, "Query 3")
+    updated = client.query.update("8772ad79bc3f", "f864867b8c7c", raw_query="select 2")
+    assert updated.raw_query == "select 2"
+    client.query.delete("8772ad79bc3f", "f864867b8c7c")
+    assert len(client.query.list("8772ad79bc3f")) == 2
+
+
+def test_report_runs(client):
+    report_runs = client.report_run.list("8772ad79bc3f")
+    assert report_runs.pagination.total_count == 1
+
+    created = client.report_run.create("8772ad79bc3f", {"region": "east"})
+    assert created.state == "pending"
+    finished = client.report_run.wait(
+        "8772ad79bc3f", created.token, expected_runtime=0, min_interval=0
+    )
+    assert finished.state == "succeeded"
+
+    latest = client.report_run.list("8772ad79bc3f").report_runs[0]
+    assert latest.token == created.token
+
+    query_runs = client.query_run.list("8772ad79bc3f", latest.token)
+    assert query_runs[0].parameters == {"region": "east"}
+    rows = client.query_run.iter_result_rows(
+        "8772ad79bc3f", latest.token, query_runs[0].token
+    )
+    assert [row["customer"] for row in rows] == ["Dunder Mifflin", "Sabre"]
+
+
+def test_pagination(mock_client):
+    server = FakeModeServer().populate(reports_per_space=1, runs_per_report=45)
+    report = next(iter(server.reports))
+    client = mock_client(server)
+
+    runs = list(client.report_run.iter_runs(report, per_page=10))
+
+    assert len(runs) == 45
+    assert len(server.requests) == 5
+
+
+def test_fault_injection(server, mock_client):
+    retry = RetryPolicy(max_retries=2, backoff_factor=0)
+    client = mock_client(server, retry=retry)
+
+    server.faults = [429, 503]
+    assert client.report.get("8772ad79bc3f").token == "8772ad79bc3f"
+
+    server.faults = [502] * 3
+    with pytest.raises(httpx.HTTPStatusError):
+        client.report.get("8772ad79bc3f")
+
+
+def test_etags(server, mock_client):
+    cache = ResponseCache()
+    client = mock_client(server, cache=cache)
+
+    client.report.get("8772ad79bc3f")
+    client.report.get("8772ad79bc3f")
+
+    assert cache.stats["revalidations"] == 1
+
+
+def test_async(server):
+    server.latency = 0.001
+    transport = httpx.MockTransport(server.handle_async)
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace", "t", "p", transport=transport
+        ) as client:
+            return await client.gather_reports(["8772ad79bc3f"] * 5)
+
+    assert len(asyncio.run(main())) == 5
+
+
+def test_serve_over_sockets(server):
+    with server.serve() as base_url:
+        with ModeClient("workspace", "t", "p", base_url=base_url) as client:
+            assert client.report.get("8772ad79bc3f").name == "Dunder Mifflin"
+            assert client.space.list()[0].token == "9764afb6d669"
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from emulator import FakeModeServer
+
+from mode_client.export import MANIFEST, WorkspaceExport
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=2, reports_per_space=3, queries_per_report=2, runs_per_report=1
+    )
+
+
+def query_lists(server):
+    return [path for _, path in server.requests if path.endswith("/queries")]
+
+
+def test_export_layout(server, emulator_client, tmp_path):
+    summary = WorkspaceExport(emulator_client, tmp_path).run()
+
+    assert len(summary.written) == 2 + 6 + 6 * 2 * 2
+    report = next(iter(server.reports.values()))
+    directory = tmp_path / "spaces" / report["space_token"] / "reports"
+    directory /= report["token"]
+    assert json.loads((directory / "report.json").read_text())["name"]
+    for query in server.queries[report["token"]].values():
+        sql = (directory / "queries" / f"{query['token']}.sql").read_text()
+        assert sql == query["raw_query"]
+    manifest = json.loads((tmp_path / MANIFEST).read_text())
+    assert len(manifest["files"]) == len(summary.written)
+
+
+def test_unchanged_export_touches_nothing(server, emulator_client, tmp_path):
+    first = WorkspaceExport(emulator_client, tmp_path).run()
+    server.requests.clear()
+
+    summary = WorkspaceExport(emulator_client, tmp_path, max_workers=2).run()
+
+    assert summary.written == summary.removed == []
+    assert summary.unchanged == len(first.written)
+    assert len(query_lists(server)) == summary.reports_fetched == 6
+
+    summary = WorkspaceExport(emulator_client, tmp_path).run(full=True)
+    assert len(summary.written) == len(first.written)
+
+
+def test_export_picks_up_query_edits(server, emulator_client, tmp_path):
+    WorkspaceExport(emulator_client, tmp_path).run()
+    report = next(iter(server.reports.values()))
+    updated_at = report["updated_at"]
+    query = next(iter(server.queries[report["token"]].values()))
+
+    emulator_client.query.update(report["token"], query["token"], raw_query="SELECT 2")
+    assert report["updated_at"] == updated_at
+
+    summary = WorkspaceExport(emulator_client, tmp_path).run()
+
+    path = f"spaces/{report['space_token']}/reports/{report['token']}/queries"
+    path += f"/{query['token']}"
+    assert sorted(summary.written) == [f"{path}.json", f"{path}.sql"]
+    assert (tmp_path / f"{path}.sql").read_text() == "SELECT 2"
+
+
+def test_export_writes_changes_and_removes_deleted(server, emulator_client, tmp_path):
+    WorkspaceExport(emulator_client, tmp_path).run()
+    reports = list(server.reports.values())
+    edited, deleted = reports[0]["token"], reports[1]["token"]
+    query = next(iter(server.queries[edited].values()))
+    query.update(raw_query="SELECT 2", updated_at=server.tick())
+    reports[0].update(updated_at=server.tick())
+    del server.reports[deleted]
+
+    summary = WorkspaceExport(emulator_client, tmp_path).run()
+
+    assert {path.rsplit("/", 1)[-1] for path in summary.written} == {
+        "report.json",
+        f"{query['token']}.sql",
+        f"{query['token']}.json",
+    }
+    assert len(summary.removed) == 5
+    assert not list(tmp_path.glob(f"spaces/*/reports/{deleted}"))
+    assert summary.reports_fetched == 5
+
+
+def test_export_selected_spaces_keeps_others(server, emulator_client, tmp_path):
+    WorkspaceExport(emulator_client, tmp_path).run()
+    space = next(iter(server.spaces))
+
+    summary = WorkspaceExport(emulator_client, tmp_path, spaces=[space]).run()
+
+    assert summary.removed == []
+    assert summary.reports_fetched == 3
+    manifest = json.loads((tmp_path / MANIFEST).read_text())
+    assert len(manifest["files"]) == 2 + 6 + 6 * 2 * 2
@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+from payloads import embedded, report_payload
+
+from mode_client import AsyncModeClient
+from mode_client.cache import ResponseCache
+from mode_client.hooks import Hooks
+from mode_client.retry import RetryPolicy
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def request_start(self, info):
+        self.events.append(("start", info.template))
+
+    def request_end(self, info):
+        self.events.append(("end", info.template, info.status_code, info.attempts))
+        self.info = info
+
+    def retry(self, info, reason, delay):
+        self.events.append(("retry", info.template, reason))
+
+    def cache_hit(self, info):
+        self.events.append(("cache_hit", info.template))
+
+    def parse(self, model, count, elapsed):
+        self.events.append(("parse", model.__name__, count))
+
+
+def test_request_and_parse_events(mock_client):
+    hooks = RecordingHooks()
+    client = mock_client(
+        lambda request: httpx.Response(200, json=report_payload()), hooks=[hooks]
+    )
+
+    client.report.get("report1")
+
+    assert hooks.events == [
+        ("start", "/reports/{report}"),
+        ("end", "/reports/{report}", 200, 1),
+        ("parse", "Report", 1),
+    ]
+    assert hooks.info.size > 0
+    assert hooks.info.elapsed >= 0
+
+
+def test_retry_events(mock_client):
+    responses = iter([httpx.Response(503), httpx.Response(200, json=report_payload())])
+    hooks = RecordingHooks()
+    client = mock_client(
+        lambda request: next(responses),
+        hooks=[hooks],
+        retry=RetryPolicy(backoff_factor=0),
+    )
+
+    client.report.get("report1")
+
+    assert hooks.events[:3] == [
+        ("start", "/reports/{report}"),
+        ("retry", "/reports/{report}", "503"),
+        ("end", "/reports/{report}", 200, 2),
+    ]
+
+
+def test_cache_hit_events(mock_client):
+    hooks = RecordingHooks()
+    client = mock_client(
+        lambda request: httpx.Response(200, json=report_payload()),
+        hooks=[hooks],
+        cache=ResponseCache(default_ttl=60),
+    )
+
+    client.report.get("report1")
+    client.report.get("report1")
+
+    assert ("cache_hit", "/reports/{report}") in hooks.events
+    assert hooks.info.cached
+
+
+def test_errors_end_the_request(mock_client):
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    hooks = RecordingHooks()
+    client = mock_client(
+        handler, hooks=[hooks], retry=RetryPolicy(max_retries=0, backoff_factor=0)
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        client.space.list()
+
+    assert hooks.events == [("start", "/spaces"), ("end", "/spaces", None, 1)]
+    assert isinstance(hooks.info.error, httpx.ConnectError)
+
+
+def test_async_events():
+    hooks = RecordingHooks()
+    payload = embedded("reports", [report_payload("report1")])
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=payload)
+            ),
+            hooks=[hooks],
+        ) as client:
+            await client.report.list("space1")
+
+    asyncio.run(main())
+
+    assert hooks.events == [
+        ("start", "/spaces/{space}/reports"),
+        ("end", "/spaces/{space}/reports", 200, 1),
+        ("parse", "Report", 1),
+    ]
+
+
+def test_prometheus_metrics(mock_client):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from mode_client.hooks import PrometheusHooks
+
+    registry = prometheus_client.CollectorRegistry()
+    client = mock_client(
+        lambda request: httpx.Response(200, json=report_payload()),
+        hooks=[PrometheusHooks(registry)],
+    )
+
+    client.report.get("report1")
+
+    labels = {"method": "GET", "template": "/reports/{report}", "status": "200"}
+    assert (
+        registry.get_sample_value("mode_client_request_duration_seconds_count", labels)
+        == 1
+    )
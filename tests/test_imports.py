@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import pytest
+
+import mode_client
+
+
+def loaded_after(statement):
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return set(output.stdout.split())
+
+
+def test_import_does_not_load_clients():
+    modules = loaded_after("import mode_client")
+
+    assert not {"httpx", "pydantic", "mode_client.models"} & modules
+
+
+def test_clients_load_on_access():
+    modules = loaded_after("from mode_client import ModeClient")
+
+    assert "mode_client.clients" in modules
+    assert not {"sqlite3", "mode_client.async_clients"} & modules
+
+
+def test_lazy_attributes():
+    from mode_client.clients import ModeClient
+
+    assert mode_client.ModeClient is ModeClient
+    assert "AsyncModeClient" in dir(mode_client)
+    assert dir(mode_client).count("ModeClient") == 1
+    with pytest.raises(AttributeError):
+        mode_client.Missing
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+from emulator import FakeModeServer
+
+from mode_client import AsyncModeClient
+from mode_client.models import Account, Query, Report, ReportRun, Space
+from mode_client.resources import resource_template
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=1, reports_per_space=4, queries_per_report=2, runs_per_report=1
+    )
+
+
+def test_resource_template_drops_workspace():
+    assert resource_template("/workspace/reports/abc/runs") == "/reports/{report}/runs"
+    assert resource_template("/workspace") == "/{account}"
+
+
+def test_follow_infers_models(server, emulator_client):
+    report = emulator_client.report.get(next(iter(server.reports)))
+
+    assert isinstance(emulator_client.links.follow(report.links.space), Space)
+    assert isinstance(emulator_client.links.follow(report.links.account), Account)
+    runs = emulator_client.links.follow(report.links.report_runs)
+    assert [type(run) for run in runs] == [ReportRun]
+    assert emulator_client.links.follow(runs[0].links.report) == report
+    assert isinstance(emulator_client.links.follow(report.links.self, Report), Report)
+    assert len(emulator_client.links.follow_all(report.links.queries, Query)) == 2
+
+
+def test_follow_rejects_non_api_links(server, emulator_client):
+    report = emulator_client.report.get(next(iter(server.reports)))
+
+    with pytest.raises(ValueError):
+        emulator_client.links.follow(report.links.web)
+    with pytest.raises(ValueError):
+        emulator_client.links.follow(report.links.report_run)
+    with pytest.raises(TypeError):
+        emulator_client.links.follow(report.links.queries, Query)
+
+
+def test_resolve_dedupes_hrefs(server, emulator_client):
+    reports = emulator_client.report.list(next(iter(server.spaces)))
+    server.requests.clear()
+
+    spaces = emulator_client.links.resolve(reports, "space")
+    queries = emulator_client.links.resolve(reports, "queries", max_workers=2)
+
+    assert len(server.requests) == 1 + len(reports)
+    assert len({id(space) for space in spaces.values()}) == 1
+    assert set(queries) == {report.token for report in reports}
+    assert all(len(items) == 2 for items in queries.values())
+
+
+def test_resolve_missing_targets(server, emulator_client):
+    reports = emulator_client.report.list(next(iter(server.spaces)))
+    del server.runs[reports[0].token]
+
+    runs = emulator_client.links.resolve(reports, "report_runs")
+
+    assert runs[reports[0].token] is None
+    assert all(runs[report.token] for report in reports[1:])
+
+
+def test_async_resolve(server):
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(server.handle_async),
+        ) as client:
+            reports = await client.report.list(next(iter(server.spaces)))
+            return reports, await client.links.resolve(reports, "space")
+
+    reports, spaces = asyncio.run(main())
+
+    assert {space.token for space in spaces.values()} == set(server.spaces)
+    assert len(spaces) == len(reports)
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+from emulator import FakeModeServer
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.matrix import param_combinations
+
+GRID = {"region": ["eu", "us"], "tier": [1, 2, 3]}
+
+
+@pytest.fixture
+def server():
+    server = FakeModeServer(polls_until_complete=2)
+    space = server.add_space()["token"]
+    server.add_report(space, token="report1")
+    server.add_query("report1", token="query1")
+    return server
+
+
+def test_param_combinations():
+    combinations = param_combinations(GRID)
+
+    assert len(combinations) == 6
+    assert combinations[0] == {"region": "eu", "tier": 1}
+    assert param_combinations([{"a": 1}]) == [{"a": 1}]
+
+
+def test_run_matrix(server):
+    with ModeClient(
+        "workspace", "token", "password", transport=httpx.MockTransport(server)
+    ) as client:
+        matrix = client.report_run.run_matrix(
+            "report1", GRID, max_concurrency=3, min_interval=0, max_interval=0.01
+        )
+
+    assert matrix.states == {"succeeded": 6}
+    tiers = sorted(run.parameters["tier"] for run in matrix.succeeded)
+    assert tiers == [1, 1, 2, 2, 3, 3]
+    for entry in matrix.runs:
+        assert entry.elapsed is not None
+        assert len(entry.result_links) == 1
+        assert entry.query_runs[0].parameters == entry.parameters
+    assert matrix.elapsed >= matrix.wait_time > 0
+
+
+def test_run_matrix_reports_failed_submissions(server):
+    server.faults = [500]
+
+    with ModeClient(
+        "workspace", "token", "password", transport=httpx.MockTransport(server)
+    ) as client:
+        matrix = client.report_run.run_matrix(
+            "report1", [{"a": 1}, {"a": 2}], max_concurrency=1, max_interval=0.01
+        )
+
+    assert matrix.states == {"not_created": 1, "succeeded": 1}
+    assert isinstance(matrix.failed[0].error, httpx.HTTPStatusError)
+
+
+def test_async_run_matrix(server):
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(server.handle_async),
+        ) as client:
+            return await client.report_run.run_matrix(
+                "report1", GRID, min_interval=0, max_interval=0.01
+            )
+
+    matrix = asyncio.run(main())
+
+    assert matrix.states == {"succeeded": 6}
+    assert all(len(entry.result_links) == 1 for entry in matrix.runs)
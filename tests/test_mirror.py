@@ -0,0 +1,61 @@
+import pytest
+from emulator import FakeModeServer
+
+from mode_client.mirror import WorkspaceMirror
+from mode_client.models import Report
+from mode_client.sync import SyncState, WorkspaceSync
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=2, reports_per_space=3, queries_per_report=2, runs_per_report=2
+    )
+
+
+def test_refresh_mirrors_the_workspace(server, emulator_client, tmp_path):
+    mirror = WorkspaceMirror(tmp_path / "mirror.db")
+
+    assert mirror.refresh(emulator_client) == 6 + 12 + 12
+    assert {space.token for space in mirror.spaces()} == set(server.spaces)
+    assert len(mirror.reports()) == 6
+    space = next(iter(server.spaces))
+    assert {r.space_token for r in mirror.reports(space=space)} == {space}
+    assert mirror.queries_per_data_source() == {"4": 12}
+    assert len(mirror.runs(state="succeeded")) == 12
+    report = next(iter(server.reports))
+    assert mirror.reports()[0] == emulator_client.report.get(mirror.reports()[0].token)
+    assert len(mirror.queries(report=report)) == 2
+    mirror.close()
+
+
+def test_failing_reports(server, emulator_client):
+    mirror = WorkspaceMirror()
+    mirror.refresh(emulator_client)
+    failed, cancelled, pending, recovered = list(server.reports)[:4]
+    server.add_run(failed, state="failed")
+    server.add_run(cancelled, state="cancelled")
+    server.add_run(pending, state="pending")
+    server.add_run(recovered, state="failed")
+    server.add_run(recovered)
+
+    mirror.refresh(emulator_client)
+
+    assert [r.token for r in mirror.failing_reports()] == [failed]
+    assert isinstance(mirror.failing_reports()[0], Report)
+    assert [r.state for r in mirror.runs(report=cancelled)][0] == "cancelled"
+
+    server.add_run(failed, state="cancelled")
+    mirror.refresh(emulator_client)
+    assert [r.token for r in mirror.failing_reports()] == [failed]
+
+
+def test_incremental_refresh(server, emulator_client):
+    mirror = WorkspaceMirror()
+    sync = WorkspaceSync(emulator_client, SyncState())
+    mirror.refresh(emulator_client, sync)
+    server.add_report(next(iter(server.spaces)), name="New")
+
+    assert mirror.refresh(emulator_client, sync) == 1
+    assert len(mirror.reports()) == 7
+    assert mirror.sql("SELECT COUNT(*) FROM reports WHERE name = ?", "New") == [(1,)]
@@ -0,0 +1,134 @@
+import json
+
+import httpx
+import pydantic
+import pytest
+from payloads import embedded, report_payload, report_run_payload
+
+from mode_client.identity import IdentityMap
+from mode_client.models import (
+    LazyLinks,
+    Link,
+    Report,
+    ReportLinks,
+    ReportRun,
+    parse_model,
+    parse_models,
+)
+
+
+def test_lazy_links_are_parsed_on_first_access():
+    report = parse_model(Report, report_payload(), "lazy")
+
+    assert isinstance(report, Report)
+    assert isinstance(report.links, LazyLinks)
+    assert report.links.parsed is None
+
+    assert report.links.last_run.href.endswith("/runs/run1")
+    assert isinstance(report.links.parsed, ReportLinks)
+
+
+def test_lazy_links_match_full_validation():
+    lazy = parse_model(Report, report_payload(), "lazy")
+    full = parse_model(Report, report_payload(), "full")
+
+    assert lazy == full
+    assert json.loads(lazy.json(by_alias=True)) == json.loads(full.json(by_alias=True))
+
+
+def test_lazy_links_defer_validation_errors():
+    payload = report_payload()
+    del payload["_links"]["self"]
+
+    report = parse_model(Report, payload, "lazy")
+
+    with pytest.raises(ValueError):
+        report.links.web
+
+
+def test_optional_lazy_links():
+    payload = report_run_payload()
+    del payload["_links"]
+
+    assert parse_model(ReportRun, payload, "lazy").links is None
+
+
+def test_construct_builds_nested_models_without_validation():
+    payload = report_payload(view_count="many")
+
+    report = parse_model(Report, payload, "none")
+
+    assert report.view_count == "many"
+    assert isinstance(report.links, ReportLinks)
+    assert isinstance(report.links.queries, Link)
+    assert report.links.web_edit is None
+
+
+def test_parse_models():
+    reports = parse_models(Report, [report_payload("a"), report_payload("b")], "none")
+
+    assert [r.token for r in reports] == ["a", "b"]
+
+
+def test_client_validation_mode(mock_client):
+    runs = [report_run_payload("a"), report_run_payload("b")]
+    pagination = {
+        "page": 1,
+        "per_page": 30,
+        "count": 2,
+        "total_pages": 1,
+        "total_count": 2,
+    }
+    payload = embedded("report_runs", runs, pagination)
+    client = mock_client(
+        lambda request: httpx.Response(200, json=payload), validation="lazy"
+    )
+
+    report_runs = client.report_run.list("report1")
+
+    assert report_runs.pagination.total_count == 2
+    assert isinstance(report_runs.report_runs[0].links, LazyLinks)
+
+
+@pytest.mark.parametrize("validation", ["full", "lazy", "none"])
+def test_projection_keeps_only_selected_fields(validation):
+    fields = ["token", "name", "links"]
+
+    report = parse_model(Report, report_payload("a"), validation, fields)
+
+    assert isinstance(report, Report)
+    assert set(report.__dict__) == {"token", "name", "links"}
+    assert report.links.self.href.endswith("/reports/a")
+    with pytest.raises(AttributeError):
+        report.runs_count
+
+
+def test_projection_validates_selected_fields_only():
+    payload = report_payload(view_count="many")
+
+    assert parse_model(Report, payload, "full", ["token"]).token == "report1"
+    with pytest.raises(pydantic.ValidationError):
+        parse_model(Report, payload, "full", ["view_count"])
+    with pytest.raises(ValueError, match="no fields"):
+        parse_model(Report, payload, "full", ["missing"])
+
+
+def test_projected_models_are_cached():
+    first = parse_models(Report, [report_payload("a")], "full", ["name", "token"])
+    second = parse_model(Report, report_payload("b"), "full", ("token", "name"))
+
+    assert type(first[0]) is type(second)
+
+
+def test_client_projection_bypasses_identity_map(mock_client):
+    client = mock_client(
+        lambda request: httpx.Response(200, json=report_payload("a")),
+        identity_map=IdentityMap(),
+    )
+    report = client.report.get("a")
+
+    slim = client.report.get("a", fields=["token", "updated_at"])
+
+    assert slim is not report
+    assert slim.updated_at == report.updated_at
+    assert report.runs_count is not None
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+from emulator import FakeModeServer
+
+from mode_client.models import Report
+from mode_client.monitor import FailureMonitor, is_failing
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=1, reports_per_space=3, queries_per_report=1, runs_per_report=1
+    )
+
+
+def test_check_intervals(server, emulator_client):
+    report = emulator_client.report.get(next(iter(server.reports)))
+    monitor = FailureMonitor(emulator_client, min_interval=60, max_interval=3600)
+
+    assert not is_failing(report)
+    assert monitor.interval(report, failing=True) == 60
+    assert monitor.interval(report, failing=False) == 3600
+    scheduled = Report.construct(**{**report.__dict__, "schedules_count": 2})
+    assert monitor.interval(scheduled, failing=False) == 900
+
+
+def test_events_on_failure_recovery_and_removal(server, emulator_client):
+    reports = list(server.reports.values())
+    monitor = FailureMonitor(
+        emulator_client,
+        server.reports,
+        budget=1000,
+        min_interval=0.001,
+        max_interval=0.01,
+    )
+    events = monitor.events()
+
+    server.add_run(reports[0]["token"], state="failed")
+    event = next(events)
+    assert (event.kind, event.report) == ("failed", reports[0]["token"])
+    assert is_failing(event.item)
+
+    server.add_run(reports[0]["token"])
+    assert next(events).kind == "recovered"
+
+    del server.reports[reports[1]["token"]]
+    assert (next(events).kind, len(monitor)) == ("removed", 2)
+
+
+def test_checks_respect_budget(server, emulator_client):
+    monitor = FailureMonitor(
+        emulator_client, server.reports, budget=20, min_interval=0, max_interval=0
+    )
+    stop = threading.Event()
+    threading.Timer(0.25, stop.set).start()
+
+    start = time.perf_counter()
+    assert list(monitor.events(stop)) == []
+
+    assert time.perf_counter() - start < 1
+    assert 3 <= monitor.checks <= 20 * 0.25 + 2
+
+
+@pytest.mark.parametrize("state", ["cancelled", "pending"])
+def test_unfinished_runs_are_not_failures(server, emulator_client, state):
+    report = next(iter(server.reports))
+    server.add_run(report, state=state)
+    monitor = FailureMonitor(emulator_client, [report], budget=1000)
+    server.requests.clear()
+
+    assert monitor.check(report) is None
+    assert not monitor.failing[report]
+    assert len(server.requests) == 2
+
+    server.add_run(report, state="failed")
+    assert monitor.check(report).kind == "failed"
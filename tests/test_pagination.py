@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+from payloads import embedded, report_payload, report_run_payload, space_payload
+
+from mode_client import AsyncModeClient
+
+
+def runs_handler(total, pages_fetched):
+    def handler(request):
+        page = int(request.url.params["page"])
+        per_page = int(request.url.params["per_page"])
+        pages_fetched.append(page)
+        start = (page - 1) * per_page
+        runs = [
+            report_run_payload(
+                f"run{i}", updated_at=f"2022-08-01T00:00:{59 - i:02d}.000Z"
+            )
+            for i in range(start, min(start + per_page, total))
+        ]
+        pagination = {
+            "page": page,
+            "per_page": per_page,
+            "count": len(runs),
+            "total_pages": -(-total // per_page),
+            "total_count": total,
+        }
+        return httpx.Response(200, json=embedded("report_runs", runs, pagination))
+
+    return handler
+
+
+def test_iter_runs_fetches_every_page(mock_client):
+    pages = []
+    client = mock_client(runs_handler(25, pages))
+
+    runs = list(client.report_run.iter_runs("report1", per_page=10))
+
+    assert [r.token for r in runs] == [f"run{i}" for i in range(25)]
+    assert pages == [1, 2, 3]
+
+
+def test_iter_runs_is_lazy_with_max_items(mock_client):
+    pages = []
+    client = mock_client(runs_handler(50, pages))
+
+    runs = list(client.report_run.iter_runs("report1", per_page=10, max_items=15))
+
+    assert len(runs) == 15
+    assert pages == [1, 2]
+
+
+def test_iter_runs_stops_at_since(mock_client):
+    pages = []
+    client = mock_client(runs_handler(50, pages))
+
+    since = "2022-08-01T00:00:45.000Z"
+    runs = list(client.report_run.iter_runs("report1", per_page=10, since=since))
+
+    assert [r.token for r in runs] == [f"run{i}" for i in range(15)]
+    assert pages == [1, 2]
+
+
+def test_iter_runs_prefetch(mock_client):
+    pages = []
+    client = mock_client(runs_handler(25, pages))
+
+    runs = list(client.report_run.iter_runs("report1", per_page=10, prefetch=True))
+
+    assert len(runs) == 25
+    assert sorted(pages) == [1, 2, 3]
+
+
+def test_iter_reports_without_pagination_metadata(mock_client):
+    def handler(request):
+        page = int(request.url.params["page"])
+        tokens = {1: ["a", "b"], 2: ["c"]}.get(page, [])
+        reports = [report_payload(t) for t in tokens]
+        return httpx.Response(200, json=embedded("reports", reports))
+
+    client = mock_client(handler)
+
+    reports = client.report.iter_reports("space1", per_page=2)
+
+    assert [r.token for r in reports] == ["a", "b", "c"]
+
+
+def test_iter_spaces_ignoring_page_parameter(mock_client):
+    spaces = [space_payload("a"), space_payload("b")]
+    client = mock_client(
+        lambda request: httpx.Response(200, json=embedded("spaces", spaces))
+    )
+
+    assert [s.token for s in client.space.iter_spaces(per_page=2)] == ["a", "b"]
+
+
+def test_async_iter_runs():
+    pages = []
+    transport = httpx.MockTransport(runs_handler(25, pages))
+
+    async def main():
+        async with AsyncModeClient("w", "t", "p", transport=transport) as client:
+            runs = client.report_run.iter_runs("report1", per_page=10, prefetch=True)
+            return [run.token async for run in runs]
+
+    assert asyncio.run(main()) == [f"run{i}" for i in range(25)]
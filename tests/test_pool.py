@@ -0,0 +1,34 @@
+import httpx
+
+from mode_client import ModeClient
+
+
+def test_sub_clients_share_connection_pool(mock_client):
+    client = mock_client(lambda request: httpx.Response(200, json={}))
+
+    assert client.report is client.report
+    assert client.report.client is client.space.client is client.client
+    assert client.account.client is client.client
+
+
+def test_request_paths(mock_client):
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"_embedded": {"queries": []}})
+
+    client = mock_client(handler)
+    client.query.list("abc")
+    client.account.request("GET", "/someone")
+
+    assert paths == ["/api/workspace/reports/abc/queries", "/api/someone"]
+
+
+def test_context_manager_closes_pool():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    with ModeClient("workspace", "token", "password", transport=transport) as client:
+        client.space.request("GET", "/spaces")
+
+    assert client.client.is_closed
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from payloads import report_payload, space_payload
+
+from mode_client import AsyncModeClient
+from mode_client.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    LatencyTracker,
+)
+from mode_client.retry import RetryPolicy
+
+
+def test_latency_quantiles():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for i in range(9):
+        tracker.record("/reports/{report}", i / 100)
+
+    assert tracker.quantile("/reports/{report}", 0.95) is None
+    for i in range(9, 100):
+        tracker.record("/reports/{report}", i / 100)
+    assert tracker.quantile("/reports/{report}", 0.95) == 0.95
+    assert tracker.quantile("/spaces/{space}", 0.95) is None
+
+
+def stalling(calls, slow):
+    """A handler that stalls the given call numbers."""
+    count = 0
+
+    def handler(request):
+        nonlocal count
+        count += 1
+        calls.append(count)
+        if count in slow:
+            time.sleep(1)
+        return httpx.Response(200, json=report_payload("report1"))
+
+    return handler
+
+
+def test_slow_gets_are_hedged(mock_client):
+    calls = []
+    hedging = HedgePolicy(min_samples=5)
+    client = mock_client(stalling(calls, {6}), hedging=hedging, coalesce=False)
+    for _ in range(5):
+        client.report.get("report1")
+
+    start = time.perf_counter()
+    report = client.report.get("report1")
+
+    assert time.perf_counter() - start < 0.5
+    assert report.token == "report1"
+    assert (hedging.hedges, hedging.wins) == (1, 1)
+    assert len(calls) == 7
+    hedging.close()
+
+
+def test_concurrent_callers_do_not_trigger_hedges(mock_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        time.sleep(0.02)
+        return httpx.Response(200, json=space_payload("space1"))
+
+    hedging = HedgePolicy()
+    client = mock_client(handler, hedging=hedging, coalesce=False)
+    with ThreadPoolExecutor(32) as executor:
+        list(executor.map(lambda _: client.space.get("space1"), range(320)))
+
+    assert hedging.hedges <= 32
+    assert len(calls) <= 320 + hedging.hedges
+
+    client.close()
+    assert hedging._executor is None
+
+
+def test_circuit_opens_and_recovers(mock_client):
+    statuses = [503] * 4 + [200]
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(statuses.pop(0), json=space_payload("space1"))
+
+    breaker = CircuitBreaker(min_requests=4, reset_timeout=0.05)
+    client = mock_client(handler, breaker=breaker, retry=RetryPolicy(max_retries=0))
+    for _ in range(4):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.space.get("space1")
+
+    with pytest.raises(CircuitOpenError) as error:
+        client.space.get("space1")
+    assert error.value.template == "/spaces/{space}"
+    assert len(calls) == 4
+    assert breaker.state("/reports/{report}") == "closed"
+
+    time.sleep(0.05)
+    assert client.space.get("space1").token == "space1"
+    assert breaker.state("/spaces/{space}") == "closed"
+
+
+def test_per_resource_timeouts(mock_client):
+    timeouts = {}
+
+    def handler(request):
+        timeouts[request.url.path.split("/")[-2]] = request.extensions["timeout"]
+        if "reports" in request.url.path:
+            return httpx.Response(200, json=report_payload("report1"))
+        return httpx.Response(200, json=space_payload("space1"))
+
+    client = mock_client(handler, timeouts={"/reports/{report}": 2.5})
+    client.report.get("report1")
+    client.space.get("space1")
+
+    assert timeouts["reports"]["read"] == 2.5
+    assert timeouts["spaces"]["read"] == 10.0
+
+
+def test_result_downloads_use_timeouts_and_breaker(mock_client, tmp_path):
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(503)
+
+    results = "/reports/{report}/runs/{run}/query_runs/{query_run}/results/content"
+    template = f"{results}.csv"
+    breaker = CircuitBreaker(min_requests=2)
+    client = mock_client(handler, breaker=breaker, timeouts={template: 60.0})
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.query_run.download_result("r", "run", "qr", tmp_path / "a.csv")
+
+    assert timeouts == [60.0, 60.0]
+    assert breaker.state(template) == "open"
+    with pytest.raises(CircuitOpenError):
+        list(client.query_run.iter_result("r", "run", "qr"))
+    assert len(timeouts) == 2
+
+
+def test_async_slow_gets_are_hedged():
+    count = 0
+
+    async def handler(request):
+        nonlocal count
+        count += 1
+        if count == 6:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=report_payload("report1"))
+
+    hedging = HedgePolicy(min_samples=5)
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace",
+            "token",
+            "password",
+            transport=httpx.MockTransport(handler),
+            hedging=hedging,
+        ) as client:
+            for _ in range(5):
+                await client.report.get("report1")
+            start = time.perf_counter()
+            await client.report.get("report1")
+            return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 0.5
+    assert (hedging.hedges, hedging.wins) == (1, 1)
@@ -0,0 +1,71 @@
+import httpx
+import pytest
+
+from mode_client.results import write_parquet
+
+CSV = 'id,name\n1,"Dunder\nMifflin"\n2,Sabre\n'
+RESULTS = "/api/workspace/reports/r/runs/run/query_runs/qr/results/content"
+
+
+@pytest.fixture
+def client(mock_client):
+    def handler(request):
+        if request.url.path == f"{RESULTS}.csv":
+            return httpx.Response(200, content=CSV.encode())
+        if request.url.path == f"{RESULTS}.json":
+            return httpx.Response(200, content=b'[{"id":1}]')
+        return httpx.Response(404)
+
+    return mock_client(handler)
+
+
+def test_iter_result_rows(client):
+    rows = list(client.query_run.iter_result_rows("r", "run", "qr"))
+
+    assert rows == [
+        {"id": "1", "name": "Dunder\nMifflin"},
+        {"id": "2", "name": "Sabre"},
+    ]
+
+
+def test_iter_result_chunks(client):
+    chunks = list(client.query_run.iter_result("r", "run", "qr", chunk_size=4))
+
+    assert b"".join(chunks) == CSV.encode()
+    assert max(len(c) for c in chunks) == 4
+
+
+def test_download_result(client, tmp_path):
+    path = tmp_path / "result.json"
+    client.query_run.download_result("r", "run", "qr", path, "json")
+
+    assert path.read_bytes() == b'[{"id":1}]'
+
+
+def test_download_result_not_found(mock_client, tmp_path):
+    client = mock_client(lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.query_run.download_result("r", "run", "qr", tmp_path / "result.csv")
+
+    assert not (tmp_path / "result.csv").exists()
+
+
+def test_download_result_parquet(client, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "result.parquet"
+    client.query_run.download_result("r", "run", "qr", path, "parquet")
+
+    assert parquet.read_table(path).num_rows == 2
+
+
+def test_write_parquet_without_rows(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "result.parquet"
+    write_parquet(iter([b"a,b\n"]), path)
+
+    table = parquet.read_table(path)
+    assert table.num_rows == 0
+    assert table.column_names == ["a", "b"]
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+from payloads import space_payload
+
+from mode_client.retry import RetryPolicy, TokenBucket
+
+
+def flaky(statuses, calls):
+    def handler(request):
+        calls.append(request.method)
+        status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=space_payload())
+
+    return handler
+
+
+@pytest.fixture
+def retry():
+    return RetryPolicy(max_retries=3, backoff_factor=0)
+
+
+def test_get_retried_on_rate_limit_and_server_error(mock_client, retry):
+    calls = []
+    client = mock_client(flaky([429, 502], calls), retry=retry)
+
+    assert client.space.get("space1").token == "space1"
+    assert len(calls) == 3
+    assert retry.retries == {"429": 1, "502": 1}
+
+
+def test_retries_exhausted(mock_client, retry):
+    calls = []
+    client = mock_client(flaky([503] * 10, calls), retry=retry)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.space.get("space1")
+    assert len(calls) == 4
+
+
+def test_non_idempotent_only_retried_on_rate_limit(mock_client, retry):
+    calls = []
+    client = mock_client(flaky([429, 502], calls), retry=retry)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.space.create("Mode Client", "")
+    assert calls == ["POST", "POST"]
+
+
+def test_transport_errors(mock_client, retry):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.method)
+        if len(attempts) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json=space_payload())
+
+    client = mock_client(handler, retry=retry)
+
+    assert client.space.get("space1").token == "space1"
+    assert retry.retries == {"ReadTimeout": 1}
+
+    attempts.clear()
+    with pytest.raises(httpx.ReadTimeout):
+        client.space.create("Mode Client", "")
+
+
+def test_retry_after_header():
+    policy = RetryPolicy(backoff_factor=0)
+    response = httpx.Response(429, headers={"Retry-After": "7"})
+
+    assert policy.delay(response, 0) == 7
+    assert policy.retry_after(httpx.Response(429)) is None
+
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_token_bucket_adapts_to_rate_limits():
+    bucket = TokenBucket(rate=8, min_rate=1)
+
+    bucket.penalize()
+    bucket.penalize()
+    assert bucket.rate == 2
+
+    for _ in range(100):
+        bucket.reward()
+    assert bucket.rate == 8
@@ -0,0 +1,76 @@
+import pytest
+from emulator import FakeModeServer
+
+from mode_client.search import QueryIndex, table_references
+
+
+@pytest.fixture
+def server():
+    server = FakeModeServer()
+    space = server.add_space()["token"]
+    first = server.add_report(space, token="report1")["token"]
+    second = server.add_report(space, token="report2")["token"]
+    server.add_query(
+        first,
+        token="query1",
+        name="Orders",
+        raw_query="SELECT * FROM analytics.orders o JOIN users u ON o.user_id = u.id",
+    )
+    server.add_query(
+        first, token="query2", name="Users", raw_query="select id from `users`"
+    )
+    server.add_query(
+        second,
+        token="query3",
+        name="Order items",
+        raw_query="SELECT order_id FROM order_items WHERE sku LIKE 'A%'",
+    )
+    return server
+
+
+def tokens(hits):
+    return sorted(hit.query for hit in hits)
+
+
+def test_table_references():
+    assert table_references(
+        'SELECT 1 FROM "public"."orders" LEFT JOIN [db].dbo.[users] ON true'
+    ) == {"public.orders", "db.dbo.users"}
+
+
+def test_lookups(server, emulator_client):
+    index = emulator_client.query.index(server.reports)
+
+    assert len(index) == 3
+    assert tokens(index.search("orders")) == ["query1"]
+    assert tokens(index.search("order_id OR users")) == ["query1", "query2", "query3"]
+    assert tokens(index.regex(r"like\s+'a")) == ["query3"]
+    assert tokens(index.referencing("users")) == ["query1", "query2"]
+    assert tokens(index.referencing("ANALYTICS.orders")) == ["query1"]
+    assert index.referencing("rders") == []
+
+
+def test_refresh_rewrites_only_changed_queries(server, emulator_client, tmp_path):
+    index = emulator_client.query.index(
+        server.reports, QueryIndex(tmp_path / "index.db")
+    )
+    emulator_client.query.update(
+        "report1", "query2", raw_query="SELECT * FROM accounts"
+    )
+    del server.queries["report2"]["query3"]
+
+    assert index.update("report1", emulator_client.query.list("report1")) == 1
+    assert index.update("report2", emulator_client.query.list("report2")) == 1
+    assert tokens(index.referencing("accounts")) == ["query2"]
+    assert tokens(index.referencing("users")) == ["query1"]
+    assert len(index) == 2
+    index.close()
+
+
+def test_missing_reports_are_removed(server, emulator_client):
+    index = emulator_client.query.index(server.reports)
+    del server.reports["report2"]
+
+    emulator_client.query.index(["report2"], index)
+
+    assert tokens(index.search("order_id")) == []
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from payloads import report_payload, space_payload
+
+from mode_client import AsyncModeClient
+from mode_client.identity import IdentityMap
+from mode_client.singleflight import SingleFlight
+
+
+def test_concurrent_gets_share_one_request(mock_client):
+    requests = []
+    release = threading.Event()
+
+    def handler(request):
+        requests.append(request.url.path)
+        release.wait(5)
+        return httpx.Response(200, json=space_payload("space1"))
+
+    client = mock_client(handler)
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(client.space.get, "space1") for _ in range(8)]
+        while client.singleflight.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+        spaces = [future.result() for future in futures]
+
+    assert len(requests) == 1
+    assert {space.token for space in spaces} == {"space1"}
+
+
+def test_followers_share_errors():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", fail)
+        started.wait(5)
+        follower = executor.submit(flight.do, "key", fail)
+        while not flight.coalesced:
+            time.sleep(0.001)
+        release.set()
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flight.calls == {}
+
+
+def test_coalescing_can_be_disabled(mock_client):
+    client = mock_client(
+        lambda request: httpx.Response(200, json=space_payload()), coalesce=False
+    )
+
+    assert client.space.singleflight is None
+
+
+def test_async_gets_share_one_request():
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=report_payload("report1"))
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace", "token", "password", transport=httpx.MockTransport(handler)
+        ) as client:
+            return await asyncio.gather(
+                *(client.report.get("report1") for _ in range(10))
+            )
+
+    reports = asyncio.run(main())
+
+    assert len(requests) == 1
+    assert len(reports) == 10
+
+
+def test_cancelling_the_first_caller_does_not_fail_followers():
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=space_payload())
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace", "token", "password", transport=httpx.MockTransport(handler)
+        ) as client:
+            first = asyncio.ensure_future(client.space.get("space1"))
+            second = asyncio.ensure_future(client.space.get("space1"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+    space = asyncio.run(main())
+
+    assert space.token
+    assert len(requests) == 1
+
+
+def test_identity_map_returns_one_instance(mock_client):
+    names = iter(["First", "Second"])
+
+    def handler(request):
+        return httpx.Response(200, json=report_payload("report1", name=next(names)))
+
+    client = mock_client(handler, identity_map=IdentityMap())
+
+    first = client.report.get("report1")
+    second = client.report.get("report1")
+
+    assert first is second
+    assert first.name == "Second"
+
+
+def test_identity_map_keeps_lazy_links_unparsed(mock_client):
+    client = mock_client(
+        lambda request: httpx.Response(200, json=report_payload("report1")),
+        identity_map=IdentityMap(),
+        validation="lazy",
+    )
+
+    first = client.report.get("report1")
+    second = client.report.get("report1")
+
+    assert first is second
+    assert first.__dict__["links"].parsed is None
+
+
+def test_identity_map_is_bounded():
+    from mode_client.models import Space
+
+    identity = IdentityMap(max_size=2)
+    spaces = [Space.parse_obj(space_payload(f"space{i}")) for i in range(3)]
+    for space in spaces:
+        identity.resolve(Space, space)
+
+    assert len(identity) == 2
+    assert identity.get(Space, "space0") is None
+    assert identity.get(Space, "space2") is spaces[2]
@@ -0,0 +1,151 @@
+import pytest
+from emulator import FakeModeServer
+
+from mode_client.sync import SyncState, WorkspaceSync
+
+
+@pytest.fixture
+def server():
+    return FakeModeServer().populate(
+        spaces=2, reports_per_space=3, queries_per_report=1, runs_per_report=1
+    )
+
+
+def summary(changes):
+    return sorted((c.kind, c.resource, c.token) for c in changes)
+
+
+def test_first_sync_adds_everything(server, emulator_client):
+    changes = WorkspaceSync(emulator_client).run()
+
+    assert [c.kind for c in changes] == ["added"] * 18
+    assert {c.token for c in changes if c.resource == "report"} == set(server.reports)
+
+
+def per_report_requests(server):
+    return [path for _, path in server.requests if path.endswith(("/queries", "/runs"))]
+
+
+def test_resync_only_fetches_changes(server, emulator_client):
+    sync = WorkspaceSync(emulator_client, per_page=2, prefetch=False)
+    sync.run()
+    space = next(iter(server.spaces))
+
+    report = server.add_report(space)["token"]
+    server.add_query(report)
+    server.requests.clear()
+
+    changes = sync.run()
+
+    assert [(c.kind, c.resource) for c in changes] == [
+        ("added", "report"),
+        ("added", "query"),
+    ]
+    # Only the new report's queries and runs; the rest are report listings
+    assert per_report_requests(server) == [
+        f"/api/workspace/reports/{report}/queries",
+        f"/api/workspace/reports/{report}/runs",
+    ]
+    server.requests.clear()
+
+    assert sync.run() == []
+    assert per_report_requests(server) == []
+
+
+def test_resync_without_runs_stops_at_space_watermark(server, emulator_client):
+    sync = WorkspaceSync(emulator_client, runs=False, per_page=2, prefetch=False)
+    sync.run()
+    space = next(iter(server.spaces))
+
+    server.add_report(space)
+    server.requests.clear()
+
+    assert [(c.kind, c.resource) for c in sync.run()] == [("added", "report")]
+    report_listings = [
+        path for _, path in server.requests if path.endswith(f"{space}/reports")
+    ]
+    # The new report and the watermark fill page 1; page 2 crosses the watermark
+    assert len(report_listings) == 2
+
+
+def test_new_run_without_report_edit(server, emulator_client):
+    state = SyncState()
+    WorkspaceSync(emulator_client, state).run()
+    report = list(server.reports)[-1]
+    updated_at = server.reports[report]["updated_at"]
+
+    run = server.add_run(report)["token"]
+    assert server.reports[report]["updated_at"] == updated_at
+
+    changes = WorkspaceSync(emulator_client, state).run()
+
+    assert summary(changes) == [("added", "run", run), ("updated", "report", report)]
+    assert changes[0].item.last_run_at == server.reports[report]["last_run_at"]
+
+
+def test_unfinished_runs_are_listed_until_they_finish(server, emulator_client):
+    state = SyncState()
+    WorkspaceSync(emulator_client, state).run()
+    report = list(server.reports)[-1]
+    run = server.add_run(report, state="pending")
+
+    changes = WorkspaceSync(emulator_client, state).run()
+    assert summary(changes) == [
+        ("added", "run", run["token"]),
+        ("updated", "report", report),
+    ]
+
+    run.update(state="succeeded", updated_at=server.tick())
+    server.requests.clear()
+
+    changes = WorkspaceSync(emulator_client, state).run()
+    assert summary(changes) == [("updated", "run", run["token"])]
+
+    server.requests.clear()
+    assert WorkspaceSync(emulator_client, state).run() == []
+    assert per_report_requests(server) == []
+
+
+def test_deep_sync_finds_edits_without_report_edit(server, emulator_client):
+    state = SyncState()
+    WorkspaceSync(emulator_client, state).run()
+    first, second = list(server.reports)[-2:]
+    run = next(iter(server.runs[first]))
+    query = next(iter(server.queries[second]))
+
+    server.runs[first][run].update(updated_at=server.tick(), state="failed")
+    emulator_client.query.update(second, query, raw_query="SELECT 2")
+
+    assert WorkspaceSync(emulator_client, state).run() == []
+    changes = WorkspaceSync(emulator_client, state, deep=True).run()
+
+    assert summary(changes) == [("updated", "query", query), ("updated", "run", run)]
+    assert WorkspaceSync(emulator_client, state, deep=True).run() == []
+
+
+def test_updates_and_archives(server, emulator_client):
+    state = SyncState()
+    WorkspaceSync(emulator_client, state).run()
+    first, second = list(server.reports)[:2]
+
+    emulator_client.report.update(first, name="Renamed")
+    emulator_client.report.archive(second)
+
+    changes = WorkspaceSync(emulator_client, state).run()
+
+    assert summary(changes) == sorted(
+        [("updated", "report", first), ("archived", "report", second)]
+    )
+
+
+def test_interrupted_sync_replays(server, emulator_client, tmp_path):
+    path = tmp_path / "sync.db"
+    state = SyncState(path)
+    changes = WorkspaceSync(emulator_client, state).changes()
+    next(changes)
+    changes.close()
+    state.close()
+
+    state = SyncState(path)
+    assert len(WorkspaceSync(emulator_client, state).run()) == 18
+    state.close()
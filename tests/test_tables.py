@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from payloads import embedded, query_run_payload, report_payload
+
+from mode_client.models import Report
+from mode_client.tables import NULL_INT, QueryRunTable, ReportTable
+
+
+@pytest.fixture
+def table():
+    return ReportTable.from_items(
+        [
+            report_payload("b", updated_at="2022-08-02T00:00:00.000Z", runs_count=5),
+            report_payload("a", updated_at="2022-08-03T00:00:00.000Z", archived=True),
+            report_payload("c", last_run_at=None, schedules_count=None),
+        ]
+    )
+
+
+def test_rows(table):
+    row = table[0]
+
+    assert len(table) == 3
+    assert row.token == "b"
+    assert row.updated_at == datetime(2022, 8, 2, tzinfo=timezone.utc)
+    assert row.runs_count == 5
+    assert row.archived is False
+    assert table[2].last_run_at is None
+    assert table[2].schedules_count is None
+
+
+def test_columns_are_compact(table):
+    updated_at = table.columns[table.fields.index("updated_at")]
+    last_run_at = table.columns[table.fields.index("last_run_at")]
+
+    assert updated_at.typecode == "q"
+    assert updated_at[0] == 1659398400000
+    assert last_run_at[2] == NULL_INT
+
+
+def test_filter_and_sort(table):
+    archived = table.filter(lambda row: row.archived)
+    assert archived.column("token") == ["a"]
+
+    assert table.sort("updated_at", reverse=True).column("token") == ["a", "b", "c"]
+    assert table.sort("token").column("token") == ["a", "b", "c"]
+
+
+def test_selected_fields_and_models():
+    report = Report.parse_obj(report_payload("a"))
+    table = ReportTable.from_items([report], fields=["token", "query_count"])
+
+    assert table.fields == ("token", "query_count")
+    assert tuple(table[0]) == ("a", 1)
+
+    with pytest.raises(ValueError):
+        ReportTable(fields=["links"])
+
+
+def test_concat(table):
+    assert len(ReportTable.concat([table, table])) == 6
+
+
+def test_to_arrow(table):
+    pyarrow = pytest.importorskip("pyarrow")
+
+    arrow = table.to_arrow()
+
+    assert arrow.column("token").to_pylist() == ["b", "a", "c"]
+    assert arrow.column("archived").to_pylist() == [False, True, False]
+    assert arrow.column("last_run_at").null_count == 1
+    assert arrow.schema.field("updated_at").type == pyarrow.timestamp("ms", tz="UTC")
+
+
+def test_query_run_table(mock_client):
+    runs = [query_run_payload("q1"), query_run_payload("q2", error_code="timeout")]
+    client = mock_client(
+        lambda request: httpx.Response(200, json=embedded("query_runs", runs))
+    )
+
+    table = client.query_run.table("report1", "run1")
+
+    assert isinstance(table, QueryRunTable)
+    assert table.column("error_code") == [None, "timeout"]
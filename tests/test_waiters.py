@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+from payloads import report_payload, report_run_payload
+
+from mode_client import AsyncModeClient
+
+
+def runs_handler(polls_until_done, requests):
+    def handler(request):
+        requests.append(request.url.path)
+        parts = request.url.path.split("/")
+        if "runs" not in parts:
+            return httpx.Response(200, json=report_payload(parts[-1]))
+        report, run = parts[-3], parts[-1]
+        done = requests.count(request.url.path) > polls_until_done[run]
+        state = "succeeded" if done else "running_notebook"
+        return httpx.Response(200, json=report_run_payload(run, report, state))
+
+    return handler
+
+
+def test_wait(mock_client):
+    requests = []
+    client = mock_client(runs_handler({"run1": 2}, requests))
+
+    run = client.report_run.wait(
+        "report1", "run1", min_interval=0.001, max_interval=0.01
+    )
+
+    assert run.state == "succeeded"
+    assert requests[0] == "/api/workspace/reports/report1"
+    assert len(requests) == 4
+
+
+def test_wait_timeout(mock_client):
+    client = mock_client(runs_handler({"run1": 1000}, []))
+
+    with pytest.raises(TimeoutError):
+        client.report_run.wait("report1", "run1", timeout=0.05, expected_runtime=0.01)
+
+
+def test_wait_many_shares_one_loop(mock_client):
+    requests = []
+    client = mock_client(runs_handler({"a": 0, "b": 3, "c": 1000}, requests))
+    finished = []
+
+    results = client.report_run.wait_many(
+        [("report1", "a"), ("report1", "b"), ("report2", "c")],
+        timeout=0.2,
+        expected_runtime=0.001,
+        callback=lambda report, run: finished.append(run.token),
+        min_interval=0.001,
+        max_interval=0.01,
+    )
+
+    assert finished == ["a", "b"]
+    assert results["c"].state == "running_notebook"
+    assert requests.count("/api/workspace/reports/report1/runs/a") == 1
+
+
+def test_async_wait_many():
+    requests = []
+    transport = httpx.MockTransport(runs_handler({"a": 1, "b": 2}, requests))
+
+    async def main():
+        async with AsyncModeClient(
+            "workspace", "t", "p", transport=transport
+        ) as client:
+            return await client.report_run.wait_many(
+                [("report1", "a"), ("report1", "b")],
+                min_interval=0.001,
+                max_interval=0.01,
+            )
+
+    results = asyncio.run(main())
+
+    assert {run.state for run in results.values()} == {"succeeded"}
+    assert requests.count("/api/workspace/reports/report1") == 1